@@ -0,0 +1,81 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# Perkiraan ukuran hasil agregasi di memori (byte)
+def estimate_size(nilai):
+    if isinstance(nilai, pd.DataFrame):
+        return int(nilai.memory_usage(deep=True).sum())
+    if isinstance(nilai, pd.Series):
+        return int(nilai.memory_usage(deep=True))
+    if isinstance(nilai, (tuple, list)):
+        return sum(estimate_size(item) for item in nilai)
+    return sys.getsizeof(nilai)
+
+
+# Cache agregasi dengan kunci (view, dimensi, start_date, end_date, versi data).
+# Satu instance dipakai bersama oleh semua sesi (lihat load_agg_cache di dashboard.py),
+# sehingga dibatasi jumlah entri dan total ukuran, entri paling lama tidak dipakai dibuang lebih dulu (LRU).
+# Hasil yang dikembalikan dipakai bersama, jadi jangan diubah (mutasi) oleh pemanggil
+class AggregationCache:
+    def __init__(self, max_entries=256, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, kunci):
+        with self._lock:
+            if kunci not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(kunci)
+            self.hits += 1
+            return self._entries[kunci][0]
+
+    def put(self, kunci, nilai):
+        ukuran = estimate_size(nilai)
+        with self._lock:
+            if kunci in self._entries:
+                self._bytes -= self._entries.pop(kunci)[1]
+            # Hasil yang lebih besar dari seluruh kapasitas tidak disimpan
+            if ukuran > self.max_bytes:
+                return
+            self._entries[kunci] = (nilai, ukuran)
+            self._bytes += ukuran
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, ukuran_lama) = self._entries.popitem(last=False)
+                self._bytes -= ukuran_lama
+                self.evictions += 1
+
+    def get_or_compute(self, kunci, hitung):
+        nilai = self.get(kunci)
+        if nilai is None:
+            # Dihitung di luar lock, agar sesi lain tidak ikut menunggu
+            nilai = hitung()
+            self.put(kunci, nilai)
+        return nilai
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'evictions': self.evictions,
+            }
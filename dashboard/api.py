@@ -0,0 +1,153 @@
+import argparse
+import json
+import os
+
+import tornado.ioloop
+import tornado.web
+
+import agg_cache
+import date_index
+import engine
+import ingest
+import storage
+
+# Endpoint HTTP JSON untuk mesin agregasi (engine.py), memakai tornado yang sudah terpasang bersama Streamlit.
+# Contoh:
+#   python api.py --port 8600
+#   curl 'localhost:8600/api/aggregate?dimensi=Tahun&dimensi=Cuaca&start_date=2012-01-01&filter=Musim:Musim Panas'
+#   curl -X POST localhost:8600/api/aggregate -d '{"queries": [{"dimensi": ["Bulan"]}, {"dimensi": "Jam", "measure": ["Member"]}]}'
+
+# Batas jumlah query dalam satu batch
+MAKS_BATCH = 100
+
+
+def _result(query, df):
+    return {
+        'query': query.to_dict(),
+        'kolom': list(df.columns),
+        'data': json.loads(df.to_json(orient='records', date_format='iso')),
+    }
+
+
+class BaseHandler(tornado.web.RequestHandler):
+    def initialize(self, mesin):
+        self.mesin = mesin
+
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json; charset=utf-8')
+
+    def write_json(self, data):
+        self.write(json.dumps(data, default=str))
+
+    def write_error(self, status_code, **kwargs):
+        pesan = self._reason
+        if 'exc_info' in kwargs and isinstance(kwargs['exc_info'][1], tornado.web.HTTPError):
+            pesan = kwargs['exc_info'][1].log_message or pesan
+        self.write_json({'error': pesan})
+
+    def run_queries(self, queries):
+        try:
+            versi, hasil = self.mesin.run_many(queries)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, str(e))
+        return versi, [_result(query, df) for query, df in zip(queries, hasil)]
+
+
+# 1. GET /api/meta: dimensi, nilai yang tersedia, rentang tanggal dan daftar analisis
+class MetaHandler(BaseHandler):
+    def get(self):
+        self.write_json(self.mesin.metadata())
+
+
+# 2. GET /api/aggregate?dimensi=..&measure=..&start_date=..&end_date=..&filter=Kolom:nilai
+#    POST /api/aggregate dengan satu query JSON, atau {"queries": [...]} untuk batch
+class AggregateHandler(BaseHandler):
+    def get(self):
+        saring = {}
+        for item in self.get_arguments('filter'):
+            kolom, _, nilai = item.partition(':')
+            saring.setdefault(kolom, []).append(nilai)
+        data = {
+            'dimensi': self.get_arguments('dimensi'),
+            'measure': self.get_arguments('measure') or ['Total'],
+            'start_date': self.get_argument('start_date', None),
+            'end_date': self.get_argument('end_date', None),
+            'filter': saring,
+        }
+        try:
+            query = engine.Query.from_dict(data)
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, str(e))
+        versi, hasil = self.run_queries([query])
+        self.write_json({'versi': str(versi), **hasil[0]})
+
+    def post(self):
+        try:
+            data = json.loads(self.request.body or b'{}')
+            batch = isinstance(data, dict) and 'queries' in data
+            daftar = data['queries'] if batch else [data]
+            if not isinstance(daftar, list) or len(daftar) > MAKS_BATCH:
+                raise ValueError(f"'queries' harus berupa list berisi maksimal {MAKS_BATCH} query")
+            queries = [engine.Query.from_dict(item) for item in daftar]
+        except ValueError as e:
+            raise tornado.web.HTTPError(400, str(e))
+
+        versi, hasil = self.run_queries(queries)
+        if batch:
+            self.write_json({'versi': str(versi), 'hasil': hasil})
+        else:
+            self.write_json({'versi': str(versi), **hasil[0]})
+
+
+# 3. GET /api/analisis/<nama>?start_date=..&end_date=..: analisis dashboard berdasarkan nama
+class AnalysisHandler(BaseHandler):
+    def get(self, nama):
+        try:
+            query = engine.analysis(nama, self.get_argument('start_date', None), self.get_argument('end_date', None))
+        except ValueError as e:
+            raise tornado.web.HTTPError(404 if nama not in engine.ANALISIS else 400, str(e))
+        versi, hasil = self.run_queries([query])
+        self.write_json({'versi': str(versi), **hasil[0]})
+
+
+def make_app(mesin):
+    return tornado.web.Application([
+        (r'/api/meta', MetaHandler, {'mesin': mesin}),
+        (r'/api/aggregate', AggregateHandler, {'mesin': mesin}),
+        (r'/api/analisis/([a-z_]+)', AnalysisHandler, {'mesin': mesin}),
+    ])
+
+
+# 4. Sumber data: snapshot yang dipublikasikan dashboard (memory-map, ikut versi terbaru),
+# atau langsung dari CSV bersih jika snapshot belum ada
+def load_engine(folder_data, pakai_snapshot=True):
+    hour_path = os.path.join(folder_data, 'hour_df_cleaned.csv')
+    day_path = os.path.join(folder_data, 'day_df_cleaned.csv')
+    folder_snapshot = storage.snapshot_folder(hour_path)
+    cache = agg_cache.AggregationCache()
+
+    if pakai_snapshot and storage.current_snapshot(folder_snapshot) is not None:
+        return engine.Engine(engine.SnapshotSource(folder_snapshot), cache=cache)
+
+    day_df = date_index.ensure_sorted(storage.load_frame(day_path))
+    hour_df = date_index.ensure_sorted(storage.load_frame(hour_path))
+    versi_sumber = (storage.source_signature(day_path), storage.source_signature(hour_path))
+    return engine.Engine(ingest.LiveDataset(day_df, hour_df, versi_sumber), cache=cache)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Endpoint JSON untuk agregasi data penyewaan sepeda.')
+    parser.add_argument('--data-dir', default=os.path.dirname(os.path.abspath(__file__)), help='Folder day_df_cleaned.csv dan hour_df_cleaned.csv')
+    parser.add_argument('--address', default='127.0.0.1', help='Alamat yang didengarkan')
+    parser.add_argument('--port', type=int, default=8600, help='Port HTTP')
+    parser.add_argument('--no-snapshot', action='store_true', help='Selalu memuat dari CSV, bukan dari snapshot dashboard')
+    args = parser.parse_args(argv)
+
+    mesin = load_engine(args.data_dir, pakai_snapshot=not args.no_snapshot)
+    make_app(mesin).listen(args.port, address=args.address)
+    print(f'API agregasi berjalan di http://{args.address}:{args.port}/api/meta')
+    tornado.ioloop.IOLoop.current().start()
+
+
+if __name__ == '__main__':
+    main()
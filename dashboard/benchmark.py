@@ -0,0 +1,210 @@
+import argparse
+import json
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+# plotly.express diimpor di awal agar waktu impornya tidak masuk ke pengukuran figur pertama
+import plotly.express  # noqa: F401
+import plotly.io as pio
+
+import charts
+import cleaning
+import date_index
+import ingest
+import parallel
+import prerender
+import storage
+
+# Benchmark jalur data dashboard tanpa server Streamlit: memuat data, filter tanggal,
+# agregasi dan pembuatan figur setiap view, pada data per jam sintetis berskala besar.
+# Contoh: python benchmark.py --skala 10 100
+
+# Data sintetis disusun dari blok 2 tahun data asli yang digeser ke depan. Di atas batas ini
+# blok berikutnya ditumpuk pada tanggal yang sama (seperti stasiun tambahan), karena
+# pandas.Timestamp hanya sampai tahun 2262
+JUMLAH_BLOK_MAKS = 100
+
+
+# 1. Data per jam sintetis dengan skema hour_df_cleaned.csv, sebanyak skala x data asli
+def synthetic_hourly(hour_df, skala, seed=0):
+    rng = np.random.default_rng(seed)
+    n = len(hour_df)
+    df = hour_df.iloc[np.tile(np.arange(n), skala)].reset_index(drop=True)
+
+    # Geser tanggal per blok, lalu atribut tanggal dihitung ulang agar konsisten
+    lebar_blok = hour_df['Tanggal'].max() - hour_df['Tanggal'].min() + pd.Timedelta(days=1)
+    blok = np.repeat(np.arange(skala) % JUMLAH_BLOK_MAKS, n)
+    df['Tanggal'] = df['Tanggal'] + pd.to_timedelta(blok * lebar_blok.days, unit='D')
+    tanggal = df['Tanggal']
+    df['Tahun'] = tanggal.dt.year
+    df['Bulan'] = tanggal.dt.month.map(cleaning.BULAN)
+    df['Musim'] = tanggal.dt.month.map(cleaning.MUSIM_PER_BULAN)
+    df['Hari'] = ((tanggal.dt.dayofweek + 1) % 7).map(cleaning.HARI)
+
+    # Jumlah penyewaan diberi variasi acak agar setiap blok tidak identik
+    for kolom in ['Non_member', 'Member']:
+        df[kolom] = np.rint(df[kolom] * rng.uniform(0.8, 1.2, len(df))).astype('int32')
+    df['Total'] = df['Non_member'] + df['Member']
+    df['index'] = np.arange(1, len(df) + 1)
+
+    df = df.sort_values(['Tanggal', 'Jam'], kind='stable').reset_index(drop=True)
+    return df.reindex(columns=cleaning.KOLOM_PER_JAM)
+
+
+def write_synthetic(hour_df, skala, folder):
+    hour_sintetis = synthetic_hourly(hour_df, skala)
+    day_sintetis = cleaning.derive_daily(hour_sintetis)
+    day_path = os.path.join(folder, 'day_df_cleaned.csv')
+    hour_path = os.path.join(folder, 'hour_df_cleaned.csv')
+    day_sintetis.to_csv(day_path, index=False)
+    hour_sintetis.to_csv(hour_path, index=False)
+    return day_path, hour_path, len(hour_sintetis)
+
+
+# 2. Pengukuran: latensi setiap pengulangan, lalu satu kali lagi dengan tracemalloc untuk puncak memori.
+# Memori yang dialokasikan Arrow (membaca Parquet) tidak tercatat oleh tracemalloc
+def measure(fungsi, ulang):
+    waktu = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        waktu.append(time.perf_counter() - mulai)
+
+    tracemalloc.start()
+    hasil = fungsi()
+    _, puncak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return waktu, puncak, hasil
+
+
+def summarize(skala, baris, tahap, waktu, puncak):
+    p50, p95, p99 = np.percentile(np.asarray(waktu) * 1000, [50, 95, 99])
+    return {
+        'skala': skala,
+        'baris': baris,
+        'tahap': tahap,
+        'n': len(waktu),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'maks_ms': round(max(waktu) * 1000, 3),
+        'puncak_mb': round(puncak / 1024 / 1024, 2),
+    }
+
+
+# 3. Agregasi dan figur setiap view dan pilihan filternya, lewat kode yang sama dengan dashboard
+# (charts.chart_data dan charts.figure, rentang tanggal penuh seperti saat dashboard pertama kali dibuka).
+# Figur diserialisasi dengan tema Streamlit seperti di cache figur dashboard (figure_cache.figure_spec)
+def view_stages():
+    for judul, pilihan in charts.VIEW.items():
+        for nama_pilihan, nama_grafik in pilihan.items():
+            yield (judul if nama_pilihan is None else f"{judul}/{nama_pilihan}"), nama_grafik
+
+
+# Roll-up per jam yang dibandingkan antara serial dan process pool (parallel.rollup)
+ROLLUP_PER_JAM = {
+    'Tahun x Jam': ['Tahun', 'Jam'],
+    'Jam x Jenis_Hari': ['Jam', 'Jenis_Hari'],
+    'Kategori_Suhu_Terasa': ['Kategori_Suhu_Terasa'],
+}
+
+
+# 4. Menjalankan semua tahap untuk satu skala
+def run_scale(hour_df, skala, ulang, ulang_load, seed=0):
+    folder = tempfile.mkdtemp(prefix=f'benchmark_{skala}x_')
+    try:
+        day_path, hour_path, baris = write_synthetic(hour_df, skala, folder)
+        laporan = []
+
+        def catat(tahap, fungsi, n):
+            waktu, puncak, hasil = measure(fungsi, n)
+            laporan.append(summarize(skala, baris, tahap, waktu, puncak))
+            return hasil
+
+        # a. Memuat data: CSV -> Parquet (cache dihapus dulu), dari cache Parquet dan dari snapshot bersama
+        def load_dingin():
+            shutil.rmtree(os.path.join(folder, storage.FOLDER_CACHE), ignore_errors=True)
+            return storage.load_frame(hour_path)
+
+        catat('load (CSV -> Parquet)', load_dingin, ulang_load)
+        day_df = date_index.ensure_sorted(storage.load_frame(day_path))
+        hour_df_sintetis = catat('load (Parquet)', lambda: date_index.ensure_sorted(storage.load_frame(hour_path)), ulang_load)
+        folder_snapshot = storage.snapshot_folder(hour_path)
+        dataset = catat('dataset (kubus + snapshot)',
+                        lambda: ingest.LiveDataset(day_df, hour_df_sintetis, 'benchmark', folder_snapshot=folder_snapshot), ulang_load)
+        catat('load (snapshot memory-map)', lambda: storage.open_snapshot(folder_snapshot), ulang_load)
+        _, day_df, _, kubus_harian, kubus_per_jam = dataset.snapshot()
+
+        # b. Filter tanggal dengan rentang acak
+        rng = np.random.default_rng(seed)
+        tanggal_min, tanggal_max = date_index.date_bounds(kubus_per_jam)
+        jumlah_hari = (tanggal_max - tanggal_min).days
+
+        def filter_acak():
+            awal, akhir = np.sort(rng.integers(0, jumlah_hari + 1, 2))
+            start_date = tanggal_min + pd.Timedelta(days=int(awal))
+            end_date = tanggal_min + pd.Timedelta(days=int(akhir))
+            return (date_index.slice_range(kubus_harian, start_date, end_date),
+                    date_index.slice_range(kubus_per_jam, start_date, end_date))
+
+        catat('filter tanggal', filter_acak, ulang)
+
+        # c. Agregasi dan figur (termasuk serialisasi JSON seperti st.plotly_chart)
+        lokasi = dataset.snapshot_location(dataset.versi)
+        tanggal_awal, tanggal_akhir = date_index.date_bounds(kubus_harian)
+        pio.templates.default = prerender.figure_templates()[0]
+        for nama, nama_grafik in view_stages():
+            hasil = catat(f'agregasi: {nama}', lambda: charts.chart_data(nama_grafik, kubus_harian, kubus_per_jam, day_df,
+                                                                         tanggal_awal, tanggal_akhir, lokasi), ulang)
+            catat(f'figur: {nama}', lambda: pio.to_json(charts.figure(nama_grafik, hasil), validate=False), ulang)
+
+        # d. Roll-up per jam: serial dibandingkan dengan map-reduce di process pool
+        if parallel.JUMLAH_WORKER > 1:
+            parallel.rollup(kubus_per_jam, ['Jam'], nama='kubus_per_jam', lokasi_snapshot=lokasi, mode='paralel')
+        for nama, by in ROLLUP_PER_JAM.items():
+            for mode in ['serial', 'paralel'] if parallel.JUMLAH_WORKER > 1 else ['serial']:
+                catat(f'rollup {mode}: {nama}',
+                      lambda: parallel.rollup(kubus_per_jam, by, nama='kubus_per_jam', lokasi_snapshot=lokasi, mode=mode), ulang)
+
+        return laporan
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def print_report(laporan):
+    print(f"{'skala':>6} {'baris':>11}  {'tahap':<50} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'maks ms':>10} {'puncak MB':>10}")
+    for baris in laporan:
+        print(f"{baris['skala']:>5}x {baris['baris']:>11,}  {baris['tahap']:<50} {baris['p50_ms']:>10.2f} {baris['p95_ms']:>10.2f} "
+              f"{baris['p99_ms']:>10.2f} {baris['maks_ms']:>10.2f} {baris['puncak_mb']:>10.2f}")
+
+
+def main(argv=None):
+    folder_dashboard = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description='Benchmark jalur data dashboard pada data per jam sintetis.')
+    parser.add_argument('--hour', default=os.path.join(folder_dashboard, 'hour_df_cleaned.csv'), help='Data per jam bersih yang dijadikan dasar data sintetis')
+    parser.add_argument('--skala', type=int, nargs='+', default=[10, 100], help='Kelipatan jumlah baris data asli, mis. --skala 10 100 1000')
+    parser.add_argument('--ulang', type=int, default=20, help='Jumlah pengulangan untuk filter, agregasi dan figur')
+    parser.add_argument('--ulang-load', type=int, default=3, help='Jumlah pengulangan untuk memuat data dan membangun kubus')
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON (mis. untuk dibandingkan dengan baseline)')
+    args = parser.parse_args(argv)
+
+    hour_df = date_index.ensure_sorted(storage.load_frame(args.hour))
+    laporan = []
+    for skala in args.skala:
+        laporan += run_scale(hour_df, skala, args.ulang, args.ulang_load)
+
+    parallel.shutdown()
+    print_report(laporan)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(laporan, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
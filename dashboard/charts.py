@@ -0,0 +1,261 @@
+import engine
+import rendering
+import startup
+import tracing
+
+# Grafik view dashboard: data agregat dan figur Plotly setiap grafik. Dipakai bersama oleh
+# dashboard.py (hitung live) dan prerender.py (snapshot batch), sehingga hasil keduanya identik
+
+# Plotly baru diimpor saat figur pertama dibangun (cache figur miss), setiap pembuatan figur dicatat sebagai span 'figur'
+px = tracing.InstrumentedModule(startup.LazyModule('plotly.express'), 'figur')
+go = tracing.InstrumentedModule(startup.LazyModule('plotly.graph_objects'), 'figur')
+
+# Pilihan 'Filter Berdasarkan' setiap view -> nama grafik yang ditampilkan (None: view tanpa pilihan)
+VIEW = {
+    'Perbandingan Penyewaan Sepeda': {
+        'Tahun': 'perbandingan_tahun',
+        'Bulan': 'perbandingan_bulan',
+        'Hari': 'perbandingan_hari',
+        'Jam': 'perbandingan_jam',
+        'Musim': 'perbandingan_musim',
+    },
+    'Pengaruh Cuaca': {'Cuaca': 'pengaruh_cuaca', 'Suhu': 'pengaruh_suhu'},
+    'Pola Pengguna': {'Membership': 'membership', 'Jenis Hari': 'jenis_hari_per_jam'},
+    'Tren Musiman': {None: 'tren_musiman'},
+}
+
+URUTAN_BULAN = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
+URUTAN_HARI = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
+URUTAN_MUSIM = ['Musim Dingin', 'Musim Semi', 'Musim Panas', 'Musim Gugur']
+
+
+# 1. Data agregat grafik untuk rentang tanggal, dari kubus snapshot data (lihat engine.ANALISIS).
+# lokasi_snapshot (folder, token): agar roll-up data besar bisa dijalankan paralel (parallel.rollup)
+def user_patterns(kubus_harian, kubus_per_jam, start_date, end_date, lokasi_snapshot=None):
+    # Kedua seri (harian per jenis hari dan per jam per jenis hari) dihitung sekaligus dari flag
+    # Jenis_Hari di kubus, sehingga berpindah kondisi tidak menghitung ulang
+    kategori_totals = engine.aggregate(kubus_harian, kubus_per_jam, engine.analysis('membership', start_date, end_date), lokasi_snapshot)
+    per_jam = engine.aggregate(kubus_harian, kubus_per_jam, engine.analysis('jenis_hari_per_jam', start_date, end_date), lokasi_snapshot)
+    per_jam = per_jam.pivot(index='Jam', columns='Jenis_Hari', values='Total')
+    return kategori_totals, per_jam.reindex(columns=['Kerja', 'Libur'], fill_value=0).fillna(0).reset_index()
+
+
+def chart_data(nama_grafik, kubus_harian, kubus_per_jam, day_df, start_date, end_date, lokasi_snapshot=None):
+    def analisis(nama):
+        return engine.aggregate(kubus_harian, kubus_per_jam, engine.analysis(nama, start_date, end_date), lokasi_snapshot)
+
+    if nama_grafik == 'perbandingan_jam':
+        return analisis('perbandingan_jam'), analisis('perbandingan_musim')
+    if nama_grafik == 'pengaruh_suhu':
+        # Scatter memakai seluruh data harian. Titik di atas batas di-downsample (LTTB per kategori) dan digambar dengan WebGL
+        return rendering.downsample_scatter(day_df, x='Suhu_Terasa', y='Total', color='Kategori_Suhu_Terasa')
+    if nama_grafik == 'membership':
+        return user_patterns(kubus_harian, kubus_per_jam, start_date, end_date, lokasi_snapshot)[0]
+    if nama_grafik == 'jenis_hari_per_jam':
+        return user_patterns(kubus_harian, kubus_per_jam, start_date, end_date, lokasi_snapshot)[1]
+    return analisis(nama_grafik)
+
+
+# 2. Figur setiap grafik dari data agregatnya
+_FIGUR = {}
+
+
+def register_figure(nama_grafik):
+    def decorator(fungsi):
+        _FIGUR[nama_grafik] = fungsi
+        return fungsi
+    return decorator
+
+
+def figure(nama_grafik, data):
+    return _FIGUR[nama_grafik](data)
+
+
+@register_figure('perbandingan_tahun')
+def _figur_perbandingan_tahun(perbandingan_tahun):
+    fig = px.bar(perbandingan_tahun, x=perbandingan_tahun["Tahun"], y='Total', category_orders={"Tahun": ["2011", "2012"]}, title='Perbandingan Total Penyewaan Sepeda (2011 - 2012)')
+    fig.update_layout(
+        xaxis_title="Tahun",
+        xaxis_type="category",
+        yaxis_title="Total Penyewaan Sepeda"
+    )
+    return fig
+
+
+@register_figure('perbandingan_bulan')
+def _figur_perbandingan_bulan(perbandingan_bulan):
+    fig = px.bar(perbandingan_bulan,
+                 x='Bulan',
+                 y='Total',
+                 title='Perbandingan Total Penyewaan Sepeda Bulanan (2011 - 2012)',
+                 category_orders={"Bulan": URUTAN_BULAN})
+
+    fig.update_layout(
+        xaxis_title="Bulan",
+        xaxis_type="category",
+        yaxis_title="Total Penyewaan Sepeda"
+    )
+    return fig
+
+
+@register_figure('perbandingan_hari')
+def _figur_perbandingan_hari(perbandingan_hari):
+    fig = px.bar(perbandingan_hari,
+                 x='Hari',
+                 y='Total',
+                 title='Perbandingan Total Penyewaan Sepeda Harian (2011 - 2012)',
+                 category_orders={"Hari": URUTAN_HARI})
+
+    fig.update_layout(
+        xaxis_title="Hari",
+        xaxis_type="category",
+        yaxis_title="Total Penyewaan Sepeda"
+    )
+    return fig
+
+
+@register_figure('perbandingan_jam')
+def _figur_perbandingan_jam(data):
+    perbandingan_jam, perbandingan_musim = data
+    fig = px.histogram(perbandingan_jam,
+                       x='Jam',
+                       y='Total',
+                       color='Tahun',
+                       barmode='group',
+                       title='Perbandingan Total Penyewaan Sepeda per Jam (2011 - 2012)')
+
+    fig.update_xaxes(type='category', categoryorder='array', categoryarray=sorted(perbandingan_musim['Musim'].unique()))
+
+    fig.update_layout(
+        xaxis_title="Jam",
+        yaxis_title="Total Penyewaan Sepeda"
+    )
+    return fig
+
+
+@register_figure('perbandingan_musim')
+def _figur_perbandingan_musim(perbandingan_musim):
+    fig = px.histogram(perbandingan_musim,
+                       x='Musim',
+                       y='Total',
+                       color='Tahun',
+                       barmode='group',
+                       title='Perbandingan Total Penyewaan Sepeda Musiman (2011 - 2012)')
+
+    fig.update_layout(
+        xaxis_title="Musim",
+        yaxis_title="Total Penyewaan Sepeda"
+    )
+    return fig
+
+
+@register_figure('pengaruh_cuaca')
+def _figur_pengaruh_cuaca(impact_cuaca):
+    fig = px.histogram(impact_cuaca,
+             x='Cuaca',
+             y='Total',
+             color='Tahun',
+             barmode='group',
+             title='Pengaruh Cuaca terhadap Total Penyewaan Sepeda (2011 - 2012)')
+
+    fig.update_layout(
+        yaxis_title="Total Penyewaan Sepeda",
+        xaxis_title="Jenis Cuaca"
+    )
+    return fig
+
+
+@register_figure('pengaruh_suhu')
+def _figur_pengaruh_suhu(data_scatter):
+    fig = px.scatter(
+        data_scatter,
+        x='Suhu_Terasa',
+        y='Total',
+        color='Kategori_Suhu_Terasa',
+        color_continuous_scale='coolwarm',
+        title='Pengaruh Kategori Suhu Terasa terhadap Penyewaan Sepeda Per Jam',
+        labels={
+            'Suhu_Terasa': 'Suhu Terasa (°C)',
+            'Total': 'Jumlah Penyewaan Sepeda',
+            'Kategori_Suhu_Terasa': 'Kategori Suhu Terasa'
+        },
+        opacity=0.8,
+        render_mode=rendering.scatter_render_mode(len(data_scatter)),
+    )
+
+    fig.update_traces(marker=dict(size=10, line=dict(width=1, color='black')))
+    fig.update_layout(legend_title_text='Kategori Suhu Terasa')
+    return fig
+
+
+@register_figure('membership')
+def _figur_membership(kategori_totals):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=kategori_totals['Jenis_Hari'],
+        y=kategori_totals['Member'],
+        name='Member',
+        marker_color='skyblue'
+    ))
+    fig.add_trace(go.Bar(
+        x=kategori_totals['Jenis_Hari'],
+        y=kategori_totals['Non_member'],
+        name='Non-Member',
+        marker_color='lightcoral'
+    ))
+
+    # Tambahkan judul dan label
+    fig.update_layout(
+        title='Perbandingan Penyewaan Sepeda oleh Member vs Non-Member\nPada Hari Kerja dan Akhir Pekan',
+        xaxis_title='Kategori Hari',
+        yaxis_title='Total Penyewaan',
+        barmode='group',
+        legend_title='Tipe Pengguna'
+    )
+    return fig
+
+
+@register_figure('jenis_hari_per_jam')
+def _figur_jenis_hari_per_jam(total_per_jam):
+    fig = go.Figure()
+    fig.add_trace(go.Bar(
+        x=total_per_jam['Jam'],
+        y=total_per_jam['Kerja'],
+        name='Hari Kerja',
+        marker_color='blue',
+        opacity=0.7
+    ))
+    fig.add_trace(go.Bar(
+        x=total_per_jam['Jam'],
+        y=total_per_jam['Libur'],
+        name='Akhir Pekan',
+        marker_color='orange',
+        opacity=0.7
+    ))
+
+    # Tambahkan judul dan label
+    fig.update_layout(
+        title='Perbandingan Pola Penyewaan Sepeda Berdasarkan Jam dalam Hari Kerja vs Akhir Pekan',
+        xaxis_title='Jam',
+        yaxis_title='Total Penyewaan',
+        barmode='group',
+        legend_title='Kategori Hari',
+        xaxis=dict(tickmode='linear', dtick=1)
+    )
+    return fig
+
+
+@register_figure('tren_musiman')
+def _figur_tren_musiman(total_Penyewaan):
+    fig = px.histogram(
+        total_Penyewaan,
+        x='Musim',
+        y='Total',
+        color='Tahun',
+        barmode='group',
+        title='Tren Penyewaan Sepeda Berdasarkan Musim dan Tahun',
+        labels={'Musim': 'Musim', 'Total': 'Total Penyewaan', 'Tahun': 'Tahun'},
+        category_orders={'Musim': URUTAN_MUSIM},
+        color_discrete_sequence=['palegoldenrod', 'royalblue']
+    )
+    return fig
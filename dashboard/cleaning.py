@@ -0,0 +1,467 @@
+import argparse
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+# Transformasi data mentah (skema data/hour.csv dan data/day.csv) menjadi data bersih
+# yang dipakai dashboard. Langkah-langkahnya mengikuti Notebook.ipynb.
+
+# 1. Mapping kode ke label
+MUSIM = {1: 'Musim Semi', 2: 'Musim Panas', 3: 'Musim Gugur', 4: 'Musim Dingin'}
+BULAN = {
+    1: 'Januari', 2: 'Februari', 3: 'Maret', 4: 'April', 5: 'Mei', 6: 'Juni',
+    7: 'Juli', 8: 'Agustus', 9: 'September', 10: 'Oktober', 11: 'November', 12: 'Desember'
+}
+HARI = {0: 'Minggu', 1: 'Senin', 2: 'Selasa', 3: 'Rabu', 4: 'Kamis', 5: 'Jumat', 6: 'Sabtu'}
+YA_TIDAK = {0: 'Tidak', 1: 'Ya'}
+CUACA = {1: 'Cerah/Berawan', 2: 'Kabut/Berawan', 3: 'Hujan/Salju Ringan', 4: 'Hujan Lebat/Salju'}
+
+# Musim harian diperbaiki berdasarkan bulan (lihat bagian "Memperbaiki musim yang salah" di notebook)
+MUSIM_PER_BULAN = {
+    12: 'Musim Dingin', 1: 'Musim Dingin', 2: 'Musim Dingin',
+    3: 'Musim Semi', 4: 'Musim Semi', 5: 'Musim Semi',
+    6: 'Musim Panas', 7: 'Musim Panas', 8: 'Musim Panas',
+    9: 'Musim Gugur', 10: 'Musim Gugur', 11: 'Musim Gugur',
+}
+
+RENAME = {
+    'instant': 'index',
+    'dteday': 'Tanggal',
+    'season': 'Musim',
+    'yr': 'Tahun',
+    'mnth': 'Bulan',
+    'hr': 'Jam',
+    'workingday': 'Kerja',
+    'holiday': 'Libur',
+    'weekday': 'Hari',
+    'weathersit': 'Cuaca',
+    'temp': 'Suhu',
+    'atemp': 'Suhu_Terasa',
+    'hum': 'Kelembapan',
+    'windspeed': 'Kecepatan_Angin',
+    'casual': 'Non_member',
+    'registered': 'Member',
+    'cnt': 'Total'
+}
+
+KOLOM_HARIAN = ['index', 'Tanggal', 'Musim', 'Tahun', 'Bulan', 'Hari', 'Libur',
+                'Kerja', 'Cuaca', 'Suhu', 'Suhu_Terasa', 'Kategori_Suhu_Terasa', 'Kelembapan',
+                'Kategori_Kelembapan', 'Kecepatan_Angin', 'Kategori_Angin', 'Non_member', 'Member', 'Total']
+KOLOM_PER_JAM = ['index', 'Tanggal', 'Musim', 'Tahun', 'Bulan', 'Hari', 'Jam', 'Kategori_Jam', 'Libur',
+                 'Kerja', 'Cuaca', 'Suhu', 'Suhu_Terasa', 'Kategori_Suhu_Terasa', 'Kelembapan',
+                 'Kategori_Kelembapan', 'Kecepatan_Angin', 'Kategori_Angin', 'Non_member', 'Member', 'Total']
+
+# 2. Binning
+BINS_SUHU_TERASA = [0, 5, 15, 25, 35, float('inf')]
+LABELS_SUHU_TERASA = ['Sangat Dingin', 'Dingin', 'Nyaman', 'Hangat', 'Panas']
+BINS_KELEMBAPAN = [0, 40, 60, 75, 85, 100]
+LABELS_KELEMBAPAN = ['Kering', 'Nyaman', 'Lembap', 'Sangat Lembap', 'Ekstrem Lembap']
+BINS_ANGIN_HARIAN = [0, 10, 20, 36]
+LABELS_ANGIN_HARIAN = ['Tenang', 'Sepoi Sepoi', 'Sedang']
+# Di notebook batas atas kategori Kencang adalah nilai maksimum data, di sini dibuat tak hingga
+# agar data baru dengan angin lebih kencang tetap mendapat kategori
+BINS_ANGIN_PER_JAM = [0, 10, 20, 36, float('inf')]
+LABELS_ANGIN_PER_JAM = ['Tenang', 'Sepoi Sepoi', 'Sedang', 'Kencang']
+BINS_JAM = [0, 5, 11, 15, 18, 23]
+LABELS_JAM = ['Dini Hari', 'Pagi', 'Siang', 'Sore', 'Malam']
+
+KOLOM_CUACA = ['temp', 'atemp', 'hum', 'windspeed', 'weathersit']
+KOLOM_JUMLAH = ['casual', 'registered', 'cnt']
+
+
+# 3. Fungsi bantu
+def denormalize(df):
+    # Pada dokumentasi temp dibagi 41, atemp dibagi 50, hum dibagi 100 dan windspeed dibagi 67
+    df['temp'] = df['temp'] * 41
+    df['atemp'] = df['atemp'] * 50
+    df['hum'] = df['hum'] * 100
+    df['windspeed'] = df['windspeed'] * 67
+    return df
+
+
+# holidays baru diimpor saat data mentah dibersihkan (modul ini ikut dimuat dashboard lewat ingest.py)
+def us_holidays(tanggal):
+    import holidays
+
+    tahun = sorted(tanggal.dt.year.unique().tolist())
+    return pd.to_datetime(list(holidays.US(years=tahun)))
+
+
+def add_categories(df, bins_angin, labels_angin):
+    df['Kategori_Suhu_Terasa'] = pd.cut(df['Suhu_Terasa'], bins=BINS_SUHU_TERASA, labels=LABELS_SUHU_TERASA, include_lowest=True)
+    df['Kategori_Kelembapan'] = pd.cut(df['Kelembapan'], bins=BINS_KELEMBAPAN, labels=LABELS_KELEMBAPAN, include_lowest=True)
+    df['Kategori_Angin'] = pd.cut(df['Kecepatan_Angin'], bins=bins_angin, labels=labels_angin, include_lowest=True)
+    return df
+
+
+# Jumlah casual/registered/cnt dan banyak baris terisi per (hr, weekday), df memakai skema mentah
+def count_sums(df):
+    grup = df.groupby(['hr', 'weekday'])
+    jumlah = grup[KOLOM_JUMLAH].sum().astype('float64')
+    jumlah['n'] = grup['cnt'].count().astype('float64')
+    return jumlah
+
+
+def combine_sums(jumlah, tambahan):
+    return tambahan if jumlah is None else jumlah.add(tambahan, fill_value=0)
+
+
+def means_from_sums(jumlah):
+    return jumlah[KOLOM_JUMLAH].div(jumlah['n'], axis=0)
+
+
+def _valid_end(nilai):
+    # Posisi setelah nilai valid terakhir, baris sesudahnya belum bisa diinterpolasi
+    valid = np.flatnonzero(nilai.notna().to_numpy())
+    return valid[-1] + 1 if len(valid) else 0
+
+
+# 4. Pembersihan data per jam
+# Dibuat bertahap (per potongan data) agar bisa dipakai untuk streaming dan penambahan data baru.
+# State yang dibawa antar potongan: jam terakhir, nilai cuaca terakhir (untuk forward fill jam yang hilang),
+# jumlah per (jam, hari) untuk mengisi jam yang hilang, dan baris yang menunggu interpolasi.
+# rata_rata: rata-rata per (hr, weekday) dari seluruh data (lihat hourly_means). Jika kosong,
+# dipakai rata-rata dari data yang sudah terbaca sejauh ini
+class HourCleaner:
+    def __init__(self, rata_rata=None):
+        self._jam_terakhir = None
+        self._cuaca_terakhir = None
+        self._instant = 0
+        self._rata_rata = rata_rata
+        self._jumlah = None
+        self._acuan = None
+        self._tertunda = None
+
+    # Melanjutkan dari data per jam yang sudah bersih (mis. hour_df_cleaned.csv)
+    @classmethod
+    def from_clean(cls, hour_df):
+        cleaner = cls()
+        if hour_df.empty:
+            return cleaner
+
+        terakhir = hour_df.iloc[-1]
+        cleaner._jam_terakhir = pd.Timestamp(terakhir['Tanggal']) + pd.Timedelta(hours=int(terakhir['Jam']))
+        cleaner._cuaca_terakhir = {
+            'temp': terakhir['Suhu'] / 41,
+            'atemp': terakhir['Suhu_Terasa'] / 50,
+            'hum': terakhir['Kelembapan'] / 100,
+            'windspeed': terakhir['Kecepatan_Angin'] / 67,
+            'weathersit': {v: k for k, v in CUACA.items()}[terakhir['Cuaca']],
+        }
+        cleaner._instant = int(hour_df['index'].max())
+        cleaner._acuan = {'atemp': float(terakhir['Suhu_Terasa']), 'windspeed': float(terakhir['Kecepatan_Angin'])}
+
+        cleaner._jumlah = count_sums(pd.DataFrame({
+            'hr': hour_df['Jam'].astype('int64'),
+            'weekday': hour_df['Tanggal'].dt.weekday,
+            'casual': hour_df['Non_member'],
+            'registered': hour_df['Member'],
+            'cnt': hour_df['Total'],
+        }))
+        return cleaner
+
+    # a. Melengkapi jam yang hilang, forward fill cuaca, menghitung ulang kolom kalender dan mengisi jumlah
+    def _prepare(self, raw):
+        df = raw.copy()
+        df['dteday'] = pd.to_datetime(df['dteday'])
+        waktu = df['dteday'] + pd.to_timedelta(df['hr'], unit='h')
+        df = df.set_index(waktu).sort_index()
+        df = df[~df.index.duplicated(keep='first')]
+
+        # Data lama yang dikirim ulang diabaikan (append-only)
+        if self._jam_terakhir is not None:
+            df = df[df.index > self._jam_terakhir]
+        if df.empty:
+            return None
+
+        awal = df.index[0] if self._jam_terakhir is None else self._jam_terakhir + pd.Timedelta(hours=1)
+        df = df.reindex(pd.date_range(awal, df.index[-1], freq='h'))
+        df['dteday'] = df.index.normalize()
+        df['hr'] = df.index.hour
+
+        # Mengisi kolom cuaca dengan forward fill (membawa nilai terakhir dari potongan sebelumnya)
+        if self._cuaca_terakhir is not None:
+            for kolom in KOLOM_CUACA:
+                if pd.isna(df[kolom].iloc[0]):
+                    df.loc[df.index[0], kolom] = self._cuaca_terakhir[kolom]
+        df[KOLOM_CUACA] = df[KOLOM_CUACA].ffill()
+        self._cuaca_terakhir = df[KOLOM_CUACA].iloc[-1].to_dict()
+        self._jam_terakhir = df.index[-1]
+
+        # Menghitung ulang kolom tahun bulan dan hari
+        df['yr'] = df['dteday'].dt.year - 2011
+        df['mnth'] = df['dteday'].dt.month
+        df['weekday'] = df['dteday'].dt.weekday
+        df['season'] = (df['mnth'] % 12) // 3 + 1
+        df['holiday'] = df['dteday'].isin(us_holidays(df['dteday'])).astype('int64')
+        df['workingday'] = (~((df['holiday'] == 1) | df['weekday'].isin([5, 6]))).astype('int64')
+
+        # Mengisi jumlah penyewaan jam yang hilang dengan rata-rata per (jam, hari)
+        if self._rata_rata is None:
+            self._jumlah = combine_sums(self._jumlah, count_sums(df))
+
+        hilang = df['cnt'].isna()
+        if hilang.any():
+            rata_rata = self._rata_rata if self._rata_rata is not None else means_from_sums(self._jumlah)
+            kunci = pd.MultiIndex.from_arrays([df.loc[hilang, 'hr'], df.loc[hilang, 'weekday']])
+            df.loc[hilang, KOLOM_JUMLAH] = rata_rata.reindex(kunci).to_numpy()
+
+        df['instant'] = np.arange(self._instant + 1, self._instant + 1 + len(df))
+        self._instant += len(df)
+        kolom_int = ['instant', 'season', 'yr', 'mnth', 'holiday', 'weekday', 'workingday', 'weathersit', 'casual', 'registered', 'cnt']
+        df[kolom_int] = df[kolom_int].astype('int64')
+
+        df = denormalize(df)
+
+        # Nilai yang tidak masuk akal dijadikan NaN lalu diinterpolasi
+        df['atemp'] = df['atemp'].replace(0, np.nan)
+        df.loc[(df['windspeed'] == 0.0) & (df['weathersit'] == 3), 'windspeed'] = np.nan
+        return df.reset_index(drop=True)
+
+    # b. Interpolasi linear atemp dan windspeed. Baris di ujung yang belum punya nilai valid
+    # sesudahnya ditahan sampai potongan berikutnya (atau flush), agar hasilnya sama seperti
+    # interpolasi pada seluruh file sekaligus
+    def _interpolate(self, df, final):
+        if self._tertunda is not None:
+            df = self._tertunda if df is None else pd.concat([self._tertunda, df], ignore_index=True)
+            self._tertunda = None
+        if df is None or df.empty:
+            return None
+
+        if not final:
+            batas = min(_valid_end(df[kolom]) for kolom in ['atemp', 'windspeed'])
+            if batas < len(df):
+                self._tertunda = df.iloc[batas:].reset_index(drop=True)
+            df = df.iloc[:batas].copy()
+            if df.empty:
+                return None
+
+        for kolom in ['atemp', 'windspeed']:
+            acuan = [] if self._acuan is None else [self._acuan[kolom]]
+            nilai = pd.Series(acuan + df[kolom].tolist(), dtype='float64')
+            df[kolom] = nilai.interpolate(method='linear').iloc[len(acuan):].to_numpy()
+
+        self._acuan = {'atemp': float(df['atemp'].iloc[-1]), 'windspeed': float(df['windspeed'].iloc[-1])}
+        return df
+
+    # c. Mapping label, rename, binning dan urutan kolom
+    @staticmethod
+    def _finish(df):
+        df['season'] = df['season'].map(MUSIM)
+        df['yr'] = df['yr'] + 2011
+        df['mnth'] = df['mnth'].map(BULAN)
+        df['holiday'] = df['holiday'].map(YA_TIDAK)
+        df['weekday'] = df['weekday'].map(HARI)
+        df['workingday'] = df['workingday'].map(YA_TIDAK)
+        df['weathersit'] = df['weathersit'].map(CUACA)
+        df = df.rename(columns=RENAME)
+
+        df = add_categories(df, BINS_ANGIN_PER_JAM, LABELS_ANGIN_PER_JAM)
+        df['Kategori_Jam'] = pd.cut(df['Jam'], bins=BINS_JAM, labels=LABELS_JAM, include_lowest=True)
+        return df.reindex(columns=KOLOM_PER_JAM)
+
+    def process(self, raw, final=False):
+        df = self._interpolate(self._prepare(raw), final)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=KOLOM_PER_JAM)
+        return self._finish(df)
+
+    def flush(self):
+        df = self._interpolate(None, final=True)
+        if df is None or df.empty:
+            return pd.DataFrame(columns=KOLOM_PER_JAM)
+        return self._finish(df)
+
+
+# 5. Menurunkan baris harian dari data per jam yang sudah bersih
+def derive_daily(hour_df, start_index=0):
+    per_tanggal = hour_df.groupby('Tanggal')
+    day_df = per_tanggal[['Non_member', 'Member', 'Total']].sum()
+    day_df[['Suhu', 'Suhu_Terasa', 'Kelembapan', 'Kecepatan_Angin']] = per_tanggal[['Suhu', 'Suhu_Terasa', 'Kelembapan', 'Kecepatan_Angin']].mean()
+    day_df['Libur'] = per_tanggal['Libur'].first().astype(str)
+
+    # Cuaca harian: kondisi yang paling sering muncul pada hari tersebut
+    cuaca = hour_df.groupby(['Tanggal', 'Cuaca'], observed=True).size().rename('n').reset_index()
+    cuaca = cuaca.sort_values(['Tanggal', 'n'], ascending=[True, False], kind='stable').drop_duplicates('Tanggal')
+    day_df['Cuaca'] = cuaca.set_index('Tanggal')['Cuaca'].astype(str)
+
+    day_df = day_df.reset_index()
+    tanggal = day_df['Tanggal']
+    day_df['Tahun'] = tanggal.dt.year
+    day_df['Bulan'] = tanggal.dt.month.map(BULAN)
+    day_df['Musim'] = tanggal.dt.month.map(MUSIM_PER_BULAN)
+    # dayofweek: Senin = 0, sedangkan HARI memakai kode data/day.csv (Minggu = 0)
+    day_df['Hari'] = ((tanggal.dt.dayofweek + 1) % 7).map(HARI)
+    day_df['Kerja'] = np.where((day_df['Libur'] == 'Ya') | tanggal.dt.dayofweek.isin([5, 6]), 'Tidak', 'Ya')
+    day_df['index'] = np.arange(start_index + 1, start_index + 1 + len(day_df))
+
+    day_df = add_categories(day_df, BINS_ANGIN_HARIAN, LABELS_ANGIN_HARIAN)
+    return day_df.reindex(columns=KOLOM_HARIAN)
+
+
+# 6. Pembersihan data harian (skema data/day.csv)
+# q95_hum_musim_1: kuantil 0.95 kelembapan season 1 dari seluruh data (lihat day_humidity_q95),
+# dipakai untuk mengganti kelembapan season 1 yang masih di bawah 20
+class DayCleaner:
+    def __init__(self, q95_hum_musim_1=None):
+        self._q95 = q95_hum_musim_1
+        self._acuan = None
+        self._tertunda = None
+
+    # a. Denormalisasi lalu interpolasi linear hum == 0. Seperti HourCleaner, baris di ujung
+    # yang belum punya nilai valid sesudahnya ditahan sampai potongan berikutnya
+    def prepare(self, raw, final=False):
+        df = None
+        if raw is not None:
+            df = denormalize(raw.copy())
+            df['dteday'] = pd.to_datetime(df['dteday'])
+            df['hum'] = df['hum'].replace(0, np.nan)
+        if self._tertunda is not None:
+            df = self._tertunda if df is None else pd.concat([self._tertunda, df], ignore_index=True)
+            self._tertunda = None
+        if df is None or df.empty:
+            return None
+
+        if not final:
+            batas = _valid_end(df['hum'])
+            if batas < len(df):
+                self._tertunda = df.iloc[batas:].reset_index(drop=True)
+            df = df.iloc[:batas].copy()
+            if df.empty:
+                return None
+
+        acuan = [] if self._acuan is None else [self._acuan]
+        nilai = pd.Series(acuan + df['hum'].tolist(), dtype='float64')
+        df['hum'] = nilai.interpolate(method='linear').iloc[len(acuan):].to_numpy()
+        self._acuan = float(df['hum'].iloc[-1])
+        return df
+
+    # b. Koreksi kelembapan, mapping label, rename, binning dan urutan kolom
+    def _finish(self, df):
+        if self._q95 is not None:
+            df.loc[(df['season'] == 1) & (df['hum'] < 20), 'hum'] = self._q95
+
+        # Musim langsung ditentukan dari bulan (hasil akhir perbaikan musim di notebook)
+        df['season'] = df['mnth'].map(MUSIM_PER_BULAN)
+        df['yr'] = df['yr'] + 2011
+        df['mnth'] = df['mnth'].map(BULAN)
+        df['holiday'] = df['holiday'].map(YA_TIDAK)
+        df['weekday'] = df['weekday'].map(HARI)
+        df['workingday'] = df['workingday'].map(YA_TIDAK)
+        df['weathersit'] = df['weathersit'].map(CUACA)
+        df = df.rename(columns=RENAME)
+
+        df = add_categories(df, BINS_ANGIN_HARIAN, LABELS_ANGIN_HARIAN)
+        return df.reindex(columns=KOLOM_HARIAN)
+
+    def process(self, raw, final=False):
+        df = self.prepare(raw, final)
+        if df is None:
+            return pd.DataFrame(columns=KOLOM_HARIAN)
+        return self._finish(df)
+
+    def flush(self):
+        return self.process(None, final=True)
+
+
+# 7. Pembersihan file secara streaming (per potongan, memori terbatas)
+# Statistik yang di notebook dihitung dari seluruh data (rata-rata per jam dan kuantil kelembapan)
+# dihitung lebih dulu dengan satu kali baca file yang hanya memuat kolom yang dibutuhkan
+def hourly_means(path, chunksize=100_000):
+    jumlah = None
+    for potongan in pd.read_csv(path, chunksize=chunksize, usecols=['dteday', 'hr'] + KOLOM_JUMLAH):
+        potongan['weekday'] = pd.to_datetime(potongan['dteday']).dt.weekday
+        jumlah = combine_sums(jumlah, count_sums(potongan))
+    return means_from_sums(jumlah)
+
+
+# Kuantil dihitung dari jumlah kemunculan setiap nilai kelembapan (digabung per potongan), hasilnya
+# sama dengan np.quantile (interpolasi linear). Memori sebanding dengan jumlah nilai unik, bukan jumlah baris
+# (nilai hum berasal dari data ternormalisasi dengan presisi terbatas, sehingga jumlah nilai uniknya kecil)
+def day_humidity_q95(path, chunksize=100_000):
+    cleaner = DayCleaner()
+    jumlah = None
+    potongan_iter = pd.read_csv(path, chunksize=chunksize, usecols=['dteday', 'season', 'temp', 'atemp', 'hum', 'windspeed'])
+    for df in itertools.chain(map(cleaner.prepare, potongan_iter), [cleaner.prepare(None, final=True)]):
+        if df is not None:
+            hitungan = df.loc[df['season'] == 1, 'hum'].value_counts()
+            jumlah = hitungan if jumlah is None else jumlah.add(hitungan, fill_value=0)
+    if jumlah is None or jumlah.empty:
+        return None
+    return _quantile_from_counts(jumlah, 0.95)
+
+
+def _quantile_from_counts(jumlah, q):
+    jumlah = jumlah.sort_index()
+    kumulatif = jumlah.to_numpy().cumsum()
+    posisi = (kumulatif[-1] - 1) * q
+    bawah, atas = int(np.floor(posisi)), int(np.ceil(posisi))
+    nilai = jumlah.index.to_numpy()
+    nilai_bawah = nilai[np.searchsorted(kumulatif, bawah, side='right')]
+    nilai_atas = nilai[np.searchsorted(kumulatif, atas, side='right')]
+    return float(nilai_bawah + (nilai_atas - nilai_bawah) * (posisi - bawah))
+
+
+def _write_csv(potongan_iter, output_path, kolom):
+    # Ditulis ke file sementara lalu rename, agar dashboard tidak membaca file setengah jadi
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    jumlah_baris = 0
+    with open(tmp_path, 'w', newline='') as f:
+        pd.DataFrame(columns=kolom).to_csv(f, index=False)
+        for df in potongan_iter:
+            if not df.empty:
+                df.to_csv(f, index=False, header=False)
+                jumlah_baris += len(df)
+    os.replace(tmp_path, output_path)
+    return jumlah_baris
+
+
+def clean_hour_file(path, output_path, chunksize=100_000):
+    cleaner = HourCleaner(rata_rata=hourly_means(path, chunksize))
+
+    def hasil():
+        for potongan in pd.read_csv(path, chunksize=chunksize):
+            yield cleaner.process(potongan)
+        yield cleaner.flush()
+
+    return _write_csv(hasil(), output_path, KOLOM_PER_JAM)
+
+
+def clean_day_file(path, output_path, chunksize=100_000):
+    cleaner = DayCleaner(q95_hum_musim_1=day_humidity_q95(path, chunksize))
+
+    def hasil():
+        for potongan in pd.read_csv(path, chunksize=chunksize):
+            yield cleaner.process(potongan)
+        yield cleaner.flush()
+
+    return _write_csv(hasil(), output_path, KOLOM_HARIAN)
+
+
+# 8. CLI
+# Contoh: python dashboard/cleaning.py --hour data/hour.csv --day data/day.csv --output-dir dashboard
+def main(argv=None):
+    folder_dashboard = os.path.dirname(os.path.abspath(__file__))
+    folder_data = os.path.join(os.path.dirname(folder_dashboard), 'data')
+
+    parser = argparse.ArgumentParser(description='Membersihkan data mentah Bike Sharing menjadi file CSV untuk dashboard.')
+    parser.add_argument('--hour', default=os.path.join(folder_data, 'hour.csv'), help='File mentah per jam (skema data/hour.csv)')
+    parser.add_argument('--day', default=os.path.join(folder_data, 'day.csv'), help='File mentah harian (skema data/day.csv)')
+    parser.add_argument('--output-dir', default=folder_dashboard, help='Folder tujuan day_df_cleaned.csv dan hour_df_cleaned.csv')
+    parser.add_argument('--chunksize', type=int, default=100_000, help='Jumlah baris per potongan yang dibaca sekaligus')
+    parser.add_argument('--skip-day', action='store_true', help='Hanya membersihkan data per jam')
+    parser.add_argument('--skip-hour', action='store_true', help='Hanya membersihkan data harian')
+    args = parser.parse_args(argv)
+
+    if not args.skip_day:
+        jumlah = clean_day_file(args.day, os.path.join(args.output_dir, 'day_df_cleaned.csv'), args.chunksize)
+        print(f'day_df_cleaned.csv: {jumlah} baris')
+    if not args.skip_hour:
+        jumlah = clean_hour_file(args.hour, os.path.join(args.output_dir, 'hour_df_cleaned.csv'), args.chunksize)
+        print(f'hour_df_cleaned.csv: {jumlah} baris')
+
+
+if __name__ == '__main__':
+    main()
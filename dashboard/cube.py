@@ -0,0 +1,24 @@
+# Dimensi kubus agregat (grain harian). Tahun, Bulan, Hari dan flag jenis hari ikut sebagai atribut tanggal,
+# nilainya tergantung pada Tanggal sehingga tidak menambah jumlah baris kubus
+DIMENSI_HARIAN = ['Tanggal', 'Tahun', 'Bulan', 'Hari', 'Jenis_Hari', 'Hari_Libur', 'Musim', 'Cuaca', 'Kategori_Suhu_Terasa']
+DIMENSI_PER_JAM = ['Tanggal', 'Tahun', 'Bulan', 'Hari', 'Jenis_Hari', 'Hari_Libur', 'Jam', 'Musim', 'Cuaca', 'Kategori_Suhu_Terasa']
+
+# Measure yang dijumlahkan
+MEASURE = ['Member', 'Non_member', 'Total']
+
+
+# 1. Membangun kubus dari data mentah
+def build_cube(df, dimensi):
+    kubus = df.groupby(dimensi, observed=True, sort=False)[MEASURE].sum()
+
+    # int64 agar penjumlahan rentang panjang tidak overflow
+    kubus = kubus.astype('int64').reset_index()
+    return kubus.sort_values('Tanggal', kind='stable').reset_index(drop=True)
+
+
+# 2. Roll-up kubus. Rentang tanggal dipotong lebih dulu dengan date_index.slice_range
+def rollup(kubus, by, measures='Total', where=None):
+    for kolom, nilai in (where or {}).items():
+        kubus = kubus[kubus[kolom].isin(nilai)]
+
+    return kubus.groupby(by, observed=True)[measures].sum().reset_index()
@@ -1,8 +1,25 @@
+import time
+_mulai_impor = time.perf_counter()
+
+from collections import deque
+
 import streamlit as st
 import pandas as pd
-from babel import numbers
-import plotly.express as px
-import plotly.graph_objects as go
+import storage
+import figure_cache
+import charts
+import prerender
+import ingest
+import date_index
+import views
+import agg_cache
+import range_query
+import rendering
+import tracing
+import startup
+import forecast
+
+_durasi_impor_ms = (time.perf_counter() - _mulai_impor) * 1000
 
 # Konfigurasi halaman
 st.set_page_config(
@@ -12,22 +29,74 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Fungsi untuk memuat data
-@st.cache_data
-def load_data():
-    # Load data
-    day_df = pd.read_csv('day_df_cleaned.csv')
-    hour_df = pd.read_csv('hour_df_cleaned.csv')
+# Trace rerun ini (span waktu per tahap, lihat tracing.py)
+st.session_state['_nomor_rerun'] = st.session_state.get('_nomor_rerun', 0) + 1
+tracing.start_rerun(f"rerun {st.session_state['_nomor_rerun']}")
+
+# Plotly baru diimpor saat figur pertama dibangun (cache figur miss), lihat charts.py
+go = charts.go
+startup.skip_notebook_display()
 
-    # Mengubah kolom Tanggal menjadi datetime
-    day_df['Tanggal'] = pd.to_datetime(day_df['Tanggal'])
-    hour_df['Tanggal'] = pd.to_datetime(hour_df['Tanggal'])
+# View rerun ini (lihat views.ViewRegistry)
+registry_view = views.ViewRegistry()
+
+# Fungsi untuk memuat data dari cache Parquet (dibangun ulang otomatis jika CSV berubah)
+def load_data():
+    day_df = date_index.ensure_sorted(storage.load_frame('day_df_cleaned.csv'))
+    hour_df = date_index.ensure_sorted(storage.load_frame('hour_df_cleaned.csv'))
 
     return day_df, hour_df
 
+# Dataset hidup (frame + kubus agregat) yang dipakai bersama semua sesi dan bisa ditambah data baru.
+# versi_sumber menjadi kunci cache, sehingga data dimuat ulang saat CSV berubah. Data hanya dimuat
+# (_muat_data dipanggil) saat versi belum ada di cache, setelah itu setiap rerun memakai objek yang
+# sama tanpa copy. Frame dibaca dari snapshot Arrow yang di-memory-map dan bersifat read-only.
+# Setelah restart, dataset dilanjutkan dari snapshot aktif data sumber yang sama, termasuk data per jam
+# yang sudah ditambahkan (ingest.LiveDataset.resume), tanpa memuat ulang CSV
+@st.cache_resource
+def load_dataset(versi_sumber, _muat_data):
+    folder_snapshot = storage.snapshot_folder('hour_df_cleaned.csv')
+    dataset = ingest.LiveDataset.resume(versi_sumber, folder_snapshot)
+    if dataset is None:
+        day_df, hour_df = _muat_data()
+        dataset = ingest.LiveDataset(day_df, hour_df, versi_sumber, folder_snapshot=folder_snapshot)
+    return dataset
+
+# Cache spec JSON figur Plotly bersama untuk semua sesi
+@st.cache_resource
+def load_figure_cache():
+    return agg_cache.AggregationCache(max_entries=512, max_bytes=32 * 1024 * 1024)
+
+# Folder spec figur di disk untuk versi Plotly/Streamlit dan kode grafik ini (dipakai juga oleh proses berikutnya)
+@st.cache_resource
+def load_figure_folder():
+    return figure_cache.figure_folder('hour_df_cleaned.csv', figure_cache.spec_version(charts, rendering))
+
+# Prefix sum dan sparse table data harian untuk metric, dibangun sekali per versi data
+@st.cache_resource(max_entries=4)
+def load_range_engine(versi_data, _day_df):
+    return range_query.RangeEngine(_day_df)
+
+# Worker peramalan bersama untuk semua sesi, parameter model disimpan di disk per versi data
+@st.cache_resource
+def load_forecaster():
+    return forecast.Forecaster(forecast.model_folder('hour_df_cleaned.csv'))
+
+# Indeks snapshot pre-render (prerender.py), manifest dibaca ulang saat batch baru selesai
+@st.cache_resource
+def load_prerendered():
+    return prerender.PrerenderIndex(prerender.prerender_folder('hour_df_cleaned.csv'))
+
+# Cache agregasi bersama untuk semua sesi (LRU, dibatasi jumlah entri dan ukuran)
+@st.cache_resource
+def load_agg_cache():
+    return agg_cache.AggregationCache(max_entries=256, max_bytes=64 * 1024 * 1024)
+
 # Memuat data
 try:
-    day_df, hour_df = load_data()
+    versi_sumber = (storage.source_signature('day_df_cleaned.csv'), storage.source_signature('hour_df_cleaned.csv'))
+    with tracing.span('load_dataset'):
+        dataset = load_dataset(versi_sumber, load_data)
     data_loaded = True
 except Exception as e:
     st.error(f"Error saat memuat data: {e}")
@@ -39,39 +108,376 @@ except Exception as e:
     hour_file = st.file_uploader("Upload cleaned_hour_df.csv", type=['csv'])
     
     if day_file and hour_file:
-        day_df = pd.read_csv(day_file)
-        hour_df = pd.read_csv(hour_file)
-        
-        day_df['Tanggal'] = pd.to_datetime(day_df['Tanggal'])
-        hour_df['Tanggal'] = pd.to_datetime(hour_df['Tanggal'])
+        versi_sumber = ('upload', day_file.file_id, hour_file.file_id)
+        with tracing.span('load_dataset'):
+            dataset = load_dataset(versi_sumber, lambda: (
+                date_index.ensure_sorted(storage.prepare_frame(pd.read_csv(day_file))),
+                date_index.ensure_sorted(storage.prepare_frame(pd.read_csv(hour_file)))
+            ))
         
         data_loaded = True
 
 # All about function
-# 1. Format number
+# 1. Format number (formatter id_ID dikompilasi sekali per proses)
 def format_number(number):
-    return numbers.format_number(number, locale='id_ID')
+    return startup.number_formatter('id_ID')(number)
 
-# 2. Filter tanggal
-def create_date_filter(container, dataframe, key_suffix=""):
+# 2. Filter tanggal, batas pilihan tanggal diambil dari dataframe (default: seluruh rentang)
+def create_date_filter(container, dataframe, key_suffix="", default=None):
+    tanggal_min, tanggal_max = date_index.date_bounds(dataframe)
     tanggal_awal = container.date_input('Filter Tanggal:', 
-                                value=(dataframe['Tanggal'].min(), dataframe['Tanggal'].max()),
-                                min_value=dataframe['Tanggal'].min(), 
-                                max_value=dataframe['Tanggal'].max(),
+                                value=views.widget_default(f"date_filter_{key_suffix}", default or (tanggal_min, tanggal_max)),
+                                min_value=tanggal_min, 
+                                max_value=tanggal_max,
                                 key=f"date_filter_{key_suffix}")
     
-    if isinstance(tanggal_awal, tuple):
+    # Selama pengguna baru memilih satu tanggal, rentang berisi satu elemen (dipakai sebagai rentang satu hari),
+    # rentang kosong (input dikosongkan) dianggap seluruh rentang data
+    if isinstance(tanggal_awal, tuple) and not tanggal_awal:
+        start_date, end_date = pd.to_datetime(tanggal_min), pd.to_datetime(tanggal_max)
+    elif isinstance(tanggal_awal, tuple):
         start_date = pd.to_datetime(tanggal_awal[0])
-        end_date = pd.to_datetime(tanggal_awal[1])
+        end_date = pd.to_datetime(tanggal_awal[-1])
     else:
         start_date = pd.to_datetime(tanggal_awal)
         end_date = pd.to_datetime(tanggal_awal)
+    
+    views.remember_widget(f"date_filter_{key_suffix}", (start_date, end_date))
         
     return start_date, end_date
 
+# 3. Filter pilihan (selectbox) yang nilainya tetap diingat saat view lain dibuka
+def create_select_filter(container, options, key_suffix="", label='Filter Berdasarkan:'):
+    pilihan = container.selectbox(label, options,
+                                  index=options.index(views.widget_default(f"select_filter_{key_suffix}", options[0])),
+                                  key=f"select_filter_{key_suffix}")
+    
+    return views.remember_widget(f"select_filter_{key_suffix}", pilihan)
+
+# 4. Tabel dengan paginasi di sisi server, hanya halaman yang tampil yang dikirim ke browser
+def create_paginated_table(dataframe, key_suffix=""):
+    col_ukuran, col_halaman = st.columns(2)
+    ukuran_halaman = col_ukuran.selectbox('Baris per halaman:', rendering.UKURAN_HALAMAN, key=f"ukuran_halaman_{key_suffix}")
+    jumlah_halaman = rendering.page_count(len(dataframe), ukuran_halaman)
+    halaman = col_halaman.number_input(f'Halaman (dari {jumlah_halaman}):', min_value=1, max_value=jumlah_halaman,
+                                       value=1, step=1, key=f"halaman_{key_suffix}")
+    
+    st.dataframe(rendering.paginate(dataframe, halaman, ukuran_halaman))
+
+# 5. Menampilkan figur. Spec JSON figur disimpan di cache bersama (memori dan disk) dengan kunci hash data agregat
+# dan nama grafik, sehingga buat_figur (Plotly Express + serialisasi) hanya dijalankan jika datanya berubah
+def show_chart(nama_grafik, data, buat_figur):
+    spec = figure_cache.figure_spec(load_figure_cache(), nama_grafik, data, buat_figur, load_figure_folder())
+    with tracing.span('plotly_chart'):
+        figure_cache.plotly_chart_spec(spec)
+
+# 6. Data agregat grafik (lihat charts.py) dari snapshot data rerun ini
+def chart_data(nama_grafik, start_date, end_date):
+    return charts.chart_data(nama_grafik, kubus_harian, kubus_per_jam, day_df, start_date, end_date,
+                             lokasi_snapshot=dataset.snapshot_location(versi_data))
+
+# 7. Grafik view. Snapshot pre-render (prerender.py) untuk grafik, rentang tanggal dan versi data ini
+# langsung dikirim tanpa agregasi dan pembuatan figur. Jika tidak ada, data dihitung live (hitung)
+def show_view_chart(nama_grafik, start_date, end_date, hitung):
+    with tracing.span('snapshot pre-render') as info:
+        spec = load_prerendered().spec(storage.snapshot_token(versi_data), nama_grafik, start_date, end_date)
+        info['sumber'] = 'live' if spec is None else 'snapshot'
+    if spec is None:
+        data = hitung()
+        show_chart(nama_grafik, data, lambda: charts.figure(nama_grafik, data))
+    else:
+        with tracing.span('plotly_chart'):
+            figure_cache.plotly_chart_spec(spec)
+
+
+# -------------------------- Tab 1 (Perbandingan Penyewaan Sepeda) ------------------------------ #
+
+@registry_view.register("Perbandingan Penyewaan Sepeda")
+def view_perbandingan():
+    st.subheader("Total Penyewaan Sepeda")
+    
+    # Tipe Filter
+    col_tgl, col_select_box_null, col_perbandingan = st.columns([2, 3, 1])
+    
+    # Filter Tanggal
+    start_date, end_date = create_date_filter(col_tgl, kubus_harian, key_suffix="tab1")
+    
+    # Filter perbandingan
+    perbandingan = create_select_filter(col_perbandingan, ['Tahun', 'Bulan', 'Hari', 'Jam', 'Musim'], key_suffix="tab1")
+    
+    # Roll-up kubus hanya untuk pilihan yang ditampilkan, hasilnya diingat selama filter tidak berubah
+    kunci_filter = (versi_data, start_date, end_date, perbandingan)
+    judul_view = "Perbandingan Penyewaan Sepeda"
+    nama_grafik = charts.VIEW[judul_view][perbandingan]
+    show_view_chart(nama_grafik, start_date, end_date,
+                    lambda: views.remember(judul_view, kunci_filter, lambda: chart_data(nama_grafik, start_date, end_date)))
+    
+    if perbandingan == 'Tahun':
+        with st.expander("Insight Perbandingan Berdasarkan Tahun"):
+            st.info(f"""
+                    ### Kesimpulan:
+                    - **Tahun 2012** adalah tahun terbaik untuk **Total Penyewaan Sepeda** di **Capital Bike Share** karena:
+                    - Keberhasilan **Ekspansi** besar-besaran dengan penambahan **32 stasiun** baru dan perluasan **18 stasiun** existing, hingga total mencapai **50 stasiun** pada akhir tahun. Strategi ini terbukti efektif meningkatkan **Total Penyewaan** ([Capital Bike Share System](https://capitalbikeshare.com/system-data)).
+                    - Faktor **Cuaca** sangat mendukung, dengan **Tahun 2012** tercatat sebagai tahun terhangat di Washington, D.C., termasuk Maret yang sangat hangat dan musim panas yang masuk dalam tiga terhangat sepanjang sejarah ([The Washington Post](https://www.washingtonpost.com/blogs/capital-weather-gang/post/top-5-dc-weather-events-of-2012/2012/12/28/d384311c-4f0e-11e2-950a-7863a013264b_blog.html)).
+                    - Meskipun ada bencana seperti **Hurricane Sandy**, **Tahun 2012** tetap menjadi tahun dengan **Total Penyewaan** terbanyak, dan ini valid 100%.
+                    """)
+            st.success("""
+                    ### Saran:
+                    Untuk meningkatkan Penyewaan di tahun mendatang, **Capital Bike Share** disarankan:
+                    - Melanjutkan **Ekspansi** stasiun di lokasi strategis.
+                    - Mengoptimalkan distribusi sepeda berdasarkan data penggunaan.
+                    - Menawarkan insentif seperti diskon atau paket keanggotaan fleksibel untuk menarik lebih banyak pengguna.
+                    - Meningkatkan keamanan, kenyamanan, dan manfaat bagi anggota agar loyalitas pengguna terjaga.
+                    """)
+        
+    elif perbandingan == 'Jam':
+        with st.expander("Insight Perbandingan Berdasarkan Jam"):
+            st.info("""
+                    ### Kesimpulan:
+                    Data menunjukkan bahwa meskipun **Tahun 2011** dan **Tahun 2012** memiliki lonjakan Penyewaan yang signifikan dengan pola serupa, **Tahun 2012** selalu menempati posisi tertinggi.
+                    - **Morning Rush** dan **Evening Rush** sangat memengaruhi Penyewaan sepeda di kedua tahun, tetapi **Tahun 2012** mencatat lonjakan luar biasa pada **Evening Rush**, mencapai **2.000.000 Penyewaan**.
+                    - Pola penggunaan di pagi dan sore hari pada kedua tahun sangat mirip, menunjukkan bahwa sepeda telah menjadi pilihan utama untuk **mobilitas sehari-hari**, bukan sekadar rekreasi.
+                    - Lonjakan pada **Evening Rush** jauh lebih tajam dibandingkan **Morning Rush**, kemungkinan karena lebih banyak orang menggunakan sepeda untuk pulang kerja atau sekolah.
+                    - **Tahun 2012** adalah tahun terbaik berkat strategi matang dari **Capital Bike Share**.
+                    """)
+            st.success("""
+                       ### Saran:
+                       - Optimalkan ketersediaan sepeda pada jam **Evening Rush** untuk mendukung lonjakan permintaan, misalnya dengan menambah stok sepeda di stasiun strategis.
+                       - Promosikan penggunaan sepeda sebagai moda transportasi harian dengan kampanye yang menargetkan pengguna saat **Morning Rush** dan **Evening Rush**.
+                       """)
+
+
+# -------------------------- Tab 2 (Pengaruh Cuaca) ------------------------------ #
+
+@registry_view.register("Pengaruh Cuaca")
+def view_pengaruh_cuaca():
+    st.subheader("Pengaruh Cuaca")
+    
+    # Tipe Filter
+    col_tgl, col_select_box_null, col_perbandingan = st.columns([2, 3, 1])
+    
+    # Filter Tanggal
+    start_date, end_date = create_date_filter(col_tgl, kubus_harian, key_suffix="tab2")
+    
+    # Filter perbandingan
+    perbandingan = create_select_filter(col_perbandingan, ['Cuaca', 'Suhu'], key_suffix="tab2")
+    
+    if perbandingan == 'Cuaca':
+        show_view_chart('pengaruh_cuaca', start_date, end_date,
+                        lambda: views.remember("Pengaruh Cuaca", (versi_data, start_date, end_date, perbandingan),
+                                               lambda: chart_data('pengaruh_cuaca', start_date, end_date)))
+        
+        with st.expander("Insight Pengaruh Cuaca"):
+            st.info("""
+                    ### Kesimpulan:
+                    Berdasarkan grafik di atas, terlihat bahwa kondisi cuaca memiliki pengaruh besar terhadap jumlah Penyewaan sepeda di **Capital Bike Share**.
+                    - Pada **Tahun 2011** dan **Tahun 2012**, **Cuaca Cerah/Berawan** selalu mencatat **Penyewaan tertinggi**, sementara **Hujan/Salju Ringan** memiliki **Penyewaan terendah**.
+                    - **Tahun 2012** menunjukkan peningkatan drastis di semua kondisi **Cuaca** dibandingkan **Tahun 2011**, terutama pada **Cerah/Berawan** yang melonjak tajam. Ini dipengaruhi oleh pola **Cuaca** yang mendukung serta faktor eksternal seperti ekspansi stasiun pada tahun tersebut.
+                    - Untuk memverifikasi apakah cuaca di **Tahun 2012** lebih mendukung dibanding **Tahun 2011**, perlu analisis tambahan terhadap variabel seperti suhu rata-rata dan curah hujan bulanan.
+                    """)
+            st.success("""
+                       ### Saran:
+                       Tingkatkan Penyewaan saat **Hujan/Salju Ringan** dengan menyediakan jas hujan gratis di setiap stasiun dan memasang kanopi di jalur sepeda. Langkah ini dapat menjaga kenyamanan pengguna meskipun **Cuaca** kurang mendukung, sehingga mencegah penurunan drastis **Penyewaan** di **Musim Hujan**.
+                       """)
+    
+    elif perbandingan == 'Suhu':
+        # Hasil downsampling diingat per versi data, rentang tanggal dan batas titik, agar LTTB tidak dijalankan setiap rerun
+        show_view_chart('pengaruh_suhu', start_date, end_date,
+                        lambda: views.remember("Pengaruh Cuaca", (versi_data, start_date, end_date, perbandingan, rendering.MAX_TITIK_SCATTER),
+                                               lambda: chart_data('pengaruh_suhu', start_date, end_date)))
+        
+        with st.expander("Insight Pengaruh Suhu"):
+            st.info("""
+                    ### Kesimpulan:
+                    Berdasarkan analisis menggunakan data **hour_df**, saya menemukan bahwa **Cuaca Cerah/Berawan** memberikan kontribusi tertinggi terhadap **Total Penyewaan**. Saya memilih **Suhu_Terasa** sebagai indikator karena mencerminkan kombinasi **Suhu Asli** dan **Kelembapan**, sehingga memberikan gambaran yang lebih akurat tentang kondisi nyata yang dirasakan penyewa sepeda.
+                    - Kondisi **Hangat** dan **Nyaman** (ketika **Suhu_Terasa** berada di rentang 15°C hingga 35°C) menunjukkan peningkatan **Jumlah Penyewaan** yang stabil dan signifikan, seperti terlihat pada **scatterplot** di atas.
+                    - **Cuaca Cerah/Berawan** terbukti secara faktual sebagai faktor utama yang paling berkontribusi pada **Total Penyewaan** di **Capital Bike Share**.
+                    """)
+            st.success("""
+                       ### Saran:
+                       Promosikan sewa sepeda saat **Cuaca Cerah/Berawan** dan suhu 15°C-35°C untuk maksimalkan **Total Penyewaan**.
+                       """)
+
+
+# -------------------------- Tab 3 (Pola Pengguna) ------------------------------ #
+
+@registry_view.register("Pola Pengguna")
+def view_pola_pengguna():
+    st.subheader("Pola Pengguna")
+    
+    # Tipe Filter
+    col_tgl, col_select_box_null, col_kondisi = st.columns([2, 3, 1])
+    
+    # Filter Tanggal
+    start_date, end_date = create_date_filter(col_tgl, kubus_harian, key_suffix="tab3")
+    
+    # Filter berdasarkan kondisi
+    kondisi = create_select_filter(col_kondisi, ['Membership', 'Jenis Hari'], key_suffix="tab3")
+    
+    # Kedua seri (lihat charts.user_patterns) diingat bersama, sehingga berpindah kondisi tidak menghitung ulang
+    def pola_pengguna():
+        return views.remember("Pola Pengguna", (versi_data, start_date, end_date), lambda: charts.user_patterns(
+            kubus_harian, kubus_per_jam, start_date, end_date, lokasi_snapshot=dataset.snapshot_location(versi_data)))
+    
+    if kondisi == 'Membership':
+        show_view_chart('membership', start_date, end_date, lambda: pola_pengguna()[0])
+        
+        with st.expander("Insight Berdasarkan Membership"):
+            st.info("""
+                    ### Kesimpulan:
+                    Perbedaan yang bisa kita simpulkan dan kita ambil antara **Non_member** dan **Member** adalah:
+                    - **Member**: Pengguna berlangganan lebih dominan menggunakan sepeda pada **hari kerja**, yang menunjukkan bahwa mereka memanfaatkannya sebagai sarana transportasi utama untuk aktivitas rutin seperti perjalanan ke **tempat kerja atau sekolah**.
+                    - Jumlah Penyewaan mereka turun cukup signifikan pada **akhir pekan**, menandakan bahwa mereka lebih jarang menggunakan sepeda untuk liburan, karena mungkin lebih memilih istirahat dan meluangkan waktu bersama keluarganya. Dia liburannya pake mobil ye.
+                    - **Non Member**: Berbeda dengan Pengguna kasual yang memiliki pola Penyewaan lebih merata antara **hari kerja** dan **akhir pekan**, meskipun total Penyewaannya tetap lebih kecil dibandingkan member.
+                    - Hal ini mengindikasikan bahwa **Non member** kemungkinan besar adalah wisatawan atau pengguna rekreasi, yang menggunakan sepeda secara fleksibel tanpa bergantung pada jadwal kerja.
+                    - **Member** lebih mengandalkan sepeda sebagai alat transportasi fungsional, sedangkan **Non member** lebih cenderung menggunakannya untuk keperluan rekreasi. 
+                    """)
+            st.success("""
+                       ### Saran:
+                       Dengan **insight** ini, kita bisa menyusun strategi yang lebih tepat untuk meningkatkan jumlah pengguna. Misalnya, menawarkan paket langganan fleksibel untuk Non member agar mereka tertarik menjadi member, atau meningkatkan promosi dan fasilitas bagi wisatawan pada akhir pekan.
+                       Tapi untuk membuktikan data ini benar aku akan menghadirkan support nya.
+                       """)
+        
+    elif kondisi == 'Jenis Hari':
+        show_view_chart('jenis_hari_per_jam', start_date, end_date, lambda: pola_pengguna()[1])
+        
+        with st.expander("Insight Berdasarkan Jam"):
+            st.info("""
+                    ### Kesimpulan:
+                    Dari insight yang sudah kita dapatkan sebelumnya di tambah dengan barplot yang lebih spesifik dengan melihat perbedaan perjamnya aku menemmukan bahwa:
+                    - **Hari Kerja** sangat mendominasi sekali dan tadi insight sebelumnya mengatakan bahwa **Hari Kerja** di dominasi oleh **Member**. dan terbukti karena:
+                    - Aktivitas di **Pagi Hari** (Jam 6 - 8) dan **Sore menjelang Malam** (Jam 16 - 19) terlihat bahwa lonjakan besar yang sangat signifikan terjadi, ini menunjukan bukti bahwa **Member** lebih memanfaatkan sepedanya dengan menjadikan sepeda nya alat **transportasi umum** atau **commuter**.
+                    - Sedangkan untuk **Akhir Pekan** grafik menunjukan ke stabilan dan tidak ada lonjakan yang terlalu signifikan, ini membuktikan bahwa **Non Member** menggunakan sepedanya tanpa ada variable lain yang mendukung nya, mungkin ada, yaitu saat liburan dan hanya iseng saja.
+                    """)
+            st.success("""
+                       ### Saran:
+                       Perusahaan harus lebih memfokuskan diri kepada **Member** tanpa mengurangi kepedulian terhadap **Non-member**. Misalkan, mungkin saja di **Non-member** bukan hanya sekedar orang orang yang berlibur tapi ada juga pekerja yang belum mau berlangganan menjadi **Member**. Nah perusahaan harus memfokuskan diri kepada hal itu juga.
+                       """)
+
+
+# -------------------------- Tab 4 (Tren Musiman) ------------------------------ #
+
+@registry_view.register("Tren Musiman")
+def view_tren_musiman():
+    st.subheader("Tren Musiman")
+    
+    # Tipe Filter
+    col_tgl, _ = st.columns([2, 3])
+    
+    # Filter Tanggal
+    start_date, end_date = create_date_filter(col_tgl, kubus_harian, key_suffix="tab4")
+    
+    # Hitung total Penyewaan per musim untuk setiap tahun
+    show_view_chart('tren_musiman', start_date, end_date,
+                    lambda: views.remember("Tren Musiman", (versi_data, start_date, end_date),
+                                           lambda: chart_data('tren_musiman', start_date, end_date)))
+    
+    with st.expander("Insight Tren Musiman"):
+        st.info("""
+                ### Kesimpulan:
+                Analisis data Penyewaan sepeda menunjukkan pola musiman yang konsisten dengan beberapa temuan menarik antara **Tahun 2011** dan **Tahun 2012**.
+                - **Peningkatan di Semua Musim:** Jumlah Penyewaan pada **Tahun 2012** lebih tinggi dibandingkan **Tahun 2011** di semua musim, mengindikasikan pertumbuhan penggunaan sepeda secara keseluruhan, kemungkinan akibat **ekspansi layanan** atau peningkatan kesadaran pengguna.
+                - **Musim Panas Puncak Tertinggi:** Baik di **Tahun 2011** maupun **Tahun 2012**, **Musim Panas** mencatat Penyewaan tertinggi karena cuaca yang nyaman dan mendukung aktivitas luar ruangan.
+                - **Musim Dingin Terendah:** Penyewaan turun drastis pada **Musim Dingin**, terutama di **Tahun 2011**, kemungkinan dipengaruhi oleh suhu rendah, hujan, atau salju.
+                - **Lonjakan di Musim Semi dan Gugur:** Dari **Tahun 2011** ke **Tahun 2012**, Penyewaan meningkat signifikan pada **Musim Semi** dan **Musim Gugur**, menunjukkan kenyamanan pengguna bertambah di luar **Musim Panas**, mungkin karena infrastruktur atau strategi pemasaran yang lebih baik.
+                """)
+        st.success("""
+                ### Saran:
+                - Manfaatkan **Musim Panas** dengan promosi intensif untuk memaksimalkan Penyewaan.
+                - Tingkatkan Penyewaan di **Musim Dingin** dengan menyediakan fasilitas pendukung seperti jas hujan atau pemanas di stasiun sepeda.
+                - Perkuat infrastruktur dan kampanye di **Musim Semi** dan **Musim Gugur** untuk mempertahankan tren peningkatan penggunaan sepeda.
+                """)
+
+
+# -------------------------- Tab 5 (Peramalan Permintaan) ------------------------------ #
+
+# Jeda (detik) pemeriksaan status model yang sedang dilatih di background
+JEDA_CEK_MODEL = 2
+
+# Selama model untuk versi data ini dilatih, hanya fragment ini yang dijalankan ulang secara berkala.
+# Setelah model siap, halaman dirender ulang dengan model baru
+@st.fragment(run_every=JEDA_CEK_MODEL)
+def tunggu_model(seri, measure):
+    _, status = load_forecaster().request(versi_data, day_df, hour_df, seri, measure)
+    if status == 'siap':
+        st.rerun()
+    st.caption(f"Status model versi data ini: {status}")
+
+@registry_view.register("Peramalan Permintaan")
+def view_peramalan():
+    st.subheader("Peramalan Permintaan")
+    
+    # Tipe Filter
+    col_seri, col_measure, col_cuaca, col_horizon = st.columns(4)
+    
+    pilihan_seri = {'Harian': 'harian', 'Per Jam': 'per_jam'}
+    seri = pilihan_seri[create_select_filter(col_seri, list(pilihan_seri), key_suffix="seri_tab5", label='Seri:')]
+    measure = create_select_filter(col_measure, forecast.MEASURE, key_suffix="measure_tab5", label='Pengguna:')
+    
+    # Skenario cuaca periode ramalan, default proporsi cuaca historis di bulan yang sama
+    proporsi_historis = 'Proporsi historis'
+    pilihan_cuaca = [proporsi_historis] + [kategori for kategori, jumlah in day_df['Cuaca'].value_counts(sort=False).items() if jumlah]
+    cuaca = create_select_filter(col_cuaca, pilihan_cuaca, key_suffix="cuaca_tab5", label='Skenario Cuaca:')
+    
+    # Horizon ramalan (hari untuk seri harian, jam untuk seri per jam)
+    satuan, batas_horizon, default_horizon = ('hari', (7, 90), 30) if seri == 'harian' else ('jam', (24, 336), 72)
+    key_horizon = f"horizon_{seri}"
+    horizon = col_horizon.slider(f'Horizon ({satuan}):', *batas_horizon, value=views.widget_default(key_horizon, default_horizon), key=key_horizon)
+    views.remember_widget(key_horizon, horizon)
+    
+    # Model dilatih di background, selama versi data ini belum siap model versi sebelumnya (jika ada) tetap dipakai
+    model, status = load_forecaster().request(versi_data, day_df, hour_df, seri, measure)
+    if status.startswith('gagal'):
+        st.error(f"Model {seri} {measure} {status}")
+    elif status != 'siap':
+        tunggu_model(seri, measure)
+    if model is None:
+        st.info("Model sedang dilatih di background, grafik akan tampil otomatis setelah model siap.")
+        return
+    if status != 'siap':
+        st.caption("Ramalan memakai model versi data sebelumnya sampai model versi data ini selesai dilatih.")
+    
+    # Ramalan dari model di memori (tanpa estimasi ulang), diingat per model dan filter
+    ramalan = views.remember("Peramalan Permintaan", (model.token, seri, measure, cuaca, horizon),
+                             lambda: model.forecast(horizon, cuaca=None if cuaca == proporsi_historis else cuaca))
+    riwayat = model.riwayat.iloc[-3 * horizon:]
+    
+    def buat_figur():
+        fig = go.Figure()
+        fig.add_trace(go.Scatter(x=riwayat['Waktu'], y=riwayat[measure], mode='lines', name='Aktual', line=dict(color='royalblue')))
+        fig.add_trace(go.Scatter(x=ramalan['Waktu'], y=ramalan['Batas_Atas'], mode='lines', line=dict(width=0), showlegend=False, hoverinfo='skip'))
+        fig.add_trace(go.Scatter(x=ramalan['Waktu'], y=ramalan['Batas_Bawah'], mode='lines', line=dict(width=0), fill='tonexty', 
+                                 fillcolor='rgba(255, 140, 0, 0.2)', name=f'Interval {1 - forecast.ALPHA:.0%}'))
+        fig.add_trace(go.Scatter(x=ramalan['Waktu'], y=ramalan['Prediksi'], mode='lines', name='Prediksi', line=dict(color='darkorange')))
+        fig.update_layout(
+            title=f'Peramalan Penyewaan {measure} ({horizon} {satuan} ke depan)',
+            xaxis_title="Waktu",
+            yaxis_title=f"Penyewaan {measure}"
+        )
+        return fig
+
+    show_chart('peramalan', (riwayat, ramalan), buat_figur)
+    
+    with st.expander("Detail Model"):
+        info = model.info
+        st.write(f"SARIMAX {forecast.SERI[seri]['model']['order']} x {forecast.SERI[seri]['model']['seasonal_order']}, "
+                 f"eksogen: {', '.join(forecast.EXOG)}" + (" + harmonik Fourier harian/mingguan" if seri == 'per_jam' else ""))
+        st.write(f"Data latih: {format_number(info['jumlah_latih'])} baris | Estimasi terakhir sampai: {info['akhir_estimasi']} | AIC: {format_number(info['aic'])}")
+        st.write(f"Diperbarui dengan: {info['cara']} ({format_number(round(info['durasi_ms']))} ms)")
+        create_paginated_table(ramalan, key_suffix="peramalan")
 
 # Membuat dashboard
 if data_loaded:
+    # Tambah data per jam baru (format data/hour.csv) tanpa memuat ulang seluruh CSV
+    with st.sidebar.expander("Tambah Data Per Jam"):
+        file_baru = st.file_uploader("Upload baris baru (format hour.csv)", type=['csv'], key="file_data_baru")
+        if file_baru and st.button("Tambahkan"):
+            jumlah_baru = dataset.append_hourly(pd.read_csv(file_baru))
+            st.success(f"{format_number(jumlah_baru)} baris per jam ditambahkan")
+
+    versi_data, day_df, hour_df, kubus_harian, kubus_per_jam = dataset.snapshot()
+    views.use_shared_cache(load_agg_cache())
+
     # Head dashboard
     st.title("Dashboard Analisis Penyewaan Sepeda 🚲")
     st.markdown("""
@@ -80,39 +486,51 @@ if data_loaded:
     """)
 
     st.header("Informasi Penyewaan")
+    
+    # Periode metric, default tahun terakhir yang ada di data. Pembanding: periode yang sama setahun sebelumnya
+    col_tgl_kpi, _ = st.columns([2, 3])
+    tanggal_min, tanggal_max = date_index.date_bounds(day_df)
+    awal_tahun_terakhir = max(tanggal_min, pd.Timestamp(year=tanggal_max.year, month=1, day=1))
+    start_kpi, end_kpi = create_date_filter(col_tgl_kpi, day_df, key_suffix="kpi", default=(awal_tahun_terakhir, tanggal_max))
+    start_lalu, end_lalu = range_query.previous_year(start_kpi, end_kpi)
+    label_kpi = range_query.period_label(start_kpi, end_kpi)
+    label_lalu = range_query.period_label(start_lalu, end_lalu)
+    
     col1, col2, col3, col4, col5 = st.columns(5)
 
     # Metric
-    # Total Penyewaan tahun 2011
-    total_Penyewaan_2011 = day_df[day_df['Tahun'] == 2011]['Total'].sum()
-    rerata_Penyewaan_harian_2011 = day_df[day_df['Tahun'] == 2011]['Total'].mean()
-    nilai_Penyewaan_harian_tertinggi_2011 = day_df[day_df['Tahun'] == 2011]['Total'].max()
-    total_non_member_2011 = day_df[day_df['Tahun'] == 2011]['Non_member'].sum()
-    total_member_2011 = day_df[day_df['Tahun'] == 2011]['Member'].sum()
-    
-    # Total Penyewaan tahun 2012
-    total_Penyewaan_2012 = day_df[day_df['Tahun'] == 2012]['Total'].sum()
-    rerata_Penyewaan_harian_2012 = day_df[day_df['Tahun'] == 2012]['Total'].mean()
-    nilai_Penyewaan_harian_tertinggi_2012 = day_df[day_df['Tahun'] == 2012]['Total'].max()
-    total_non_member_2012 = day_df[day_df['Tahun'] == 2012]['Non_member'].sum()
-    total_member_2012 = day_df[day_df['Tahun'] == 2012]['Member'].sum()
+    with tracing.span('metric'):
+        mesin_rentang = load_range_engine(versi_data, day_df)
+        sekarang = mesin_rentang.summary(start_kpi, end_kpi)
+        lalu = mesin_rentang.summary(start_lalu, end_lalu)
+
+    def nilai_metric(ringkasan, kolom, statistik):
+        nilai = ringkasan[kolom][statistik]
+        return format_number(nilai) if nilai is not None and ringkasan['hari'] else "-"
+
+    def delta_metric(kolom, statistik):
+        if not lalu['hari']:
+            return f"tidak ada data ({label_lalu})"
+        return f"{nilai_metric(lalu, kolom, statistik)} ({label_lalu})"
+
+    warna_delta = 'normal' if lalu['hari'] else 'off'
 
     # Membuat metric
-    col1.metric(label="Total Penyewaan (2012)", value=format_number(total_Penyewaan_2012), delta=f"{format_number(total_Penyewaan_2011)} (2011)", border=True)
-    col2.metric(label="Rerata Penyewaan Harian (2012)", value=format_number(rerata_Penyewaan_harian_2012), delta=f"{format_number(rerata_Penyewaan_harian_2011)} (2011)", border=True)
-    col3.metric(label="Nilai Sewa Harian Tertinggi (2012)", value=format_number(nilai_Penyewaan_harian_tertinggi_2012), delta=f"{format_number(nilai_Penyewaan_harian_tertinggi_2011)} (2011)", border=True)
-    col4.metric(label="Total Non-Member (2012)", value=format_number(total_non_member_2012), delta=f"{format_number(total_non_member_2011)} (2011)", border=True)
-    col5.metric(label="Total Member (2012)", value=format_number(total_member_2012), delta=f"{format_number(total_member_2011)} (2011)", border=True)
+    col1.metric(label=f"Total Penyewaan ({label_kpi})", value=nilai_metric(sekarang, 'Total', 'total'), delta=delta_metric('Total', 'total'), delta_color=warna_delta, border=True)
+    col2.metric(label=f"Rerata Penyewaan Harian ({label_kpi})", value=nilai_metric(sekarang, 'Total', 'mean'), delta=delta_metric('Total', 'mean'), delta_color=warna_delta, border=True)
+    col3.metric(label=f"Nilai Sewa Harian Tertinggi ({label_kpi})", value=nilai_metric(sekarang, 'Total', 'max'), delta=delta_metric('Total', 'max'), delta_color=warna_delta, border=True)
+    col4.metric(label=f"Total Non-Member ({label_kpi})", value=nilai_metric(sekarang, 'Non_member', 'total'), delta=delta_metric('Non_member', 'total'), delta_color=warna_delta, border=True)
+    col5.metric(label=f"Total Member ({label_kpi})", value=nilai_metric(sekarang, 'Member', 'total'), delta=delta_metric('Member', 'total'), delta_color=warna_delta, border=True)
 
     # Detail Data
     with st.expander("Detail Data"):
         col_day, col_hour = st.columns(2)
         with col_day:
             st.subheader("Data Harian")
-            st.dataframe(day_df)
+            create_paginated_table(day_df, key_suffix="harian")
         with col_hour:
             st.subheader("Data Per Jam")
-            st.dataframe(hour_df)
+            create_paginated_table(hour_df, key_suffix="per_jam")
             
     # Spasi
     st.markdown("""
@@ -124,397 +542,52 @@ if data_loaded:
     """, unsafe_allow_html=True)
     
     # Tabs
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "Perbandingan Penyewaan Sepeda", 
-        "Pengaruh Cuaca", 
-        "Pola Pengguna", 
-        "Tren Musiman"
-    ])
-    
-    with tab1:
-        st.subheader("Total Penyewaan Sepeda")
-        
-        # Tipe Filter
-        col_tgl, col_select_box_null, col_perbandingan = st.columns([2, 3, 1])
-        
-        # Filter Tanggal
-        start_date, end_date = create_date_filter(col_tgl, day_df, key_suffix="tab1")
-        
-        # Filter data berdasarkan tanggal
-        filtered_df_day = day_df[(day_df['Tanggal'] >= start_date) & (day_df['Tanggal'] <= end_date)]
-        filtered_df_hour = hour_df[(hour_df['Tanggal'] >= start_date) & (hour_df['Tanggal'] <= end_date)]
-        
-        # Filter perbandingan
-        perbandingan = col_perbandingan.selectbox('Filter Berdasarkan:', ['Tahun', 'Bulan', 'Hari', 'Jam', 'Musim'])
-        
-        # Filter data berdasarkan pilihan
-        perbandingan_tahun = filtered_df_day.groupby(by='Tahun', observed=False)['Total'].sum().reset_index()
-        perbandingan_bulan = filtered_df_day.groupby(by='Bulan', observed=False)['Total'].sum().reset_index()
-        perbandingan_hari = filtered_df_day.groupby(by='Hari', observed=False)['Total'].sum().reset_index()
-        perbandingan_jam = filtered_df_hour.groupby(['Tahun', 'Jam'], observed=False)['Total'].sum().reset_index()
-        perbandingan_musim = filtered_df_day.groupby(['Musim', 'Tahun'], observed=False)['Total'].sum().reset_index()
-        
-        if perbandingan == 'Tahun':
-            # perbandingan_tahun["  Tahun"] = perbandingan_tahun["Tahun"].astype(str)
-            fig = px.bar(perbandingan_tahun, x=perbandingan_tahun["Tahun"], y='Total', category_orders={"Tahun": ["2011", "2012"]}, title='Perbandingan Total Penyewaan Sepeda (2011 - 2012)')
-            fig.update_layout(
-                xaxis_title="Tahun",
-                xaxis_type="category",
-                yaxis_title="Total Penyewaan Sepeda"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-
-            # st.write(perbandingan_tahun.dtypes)
-            
-            with st.expander("Insight Perbandingan Berdasarkan Tahun"):
-                st.info(f"""
-                        ### Kesimpulan:
-                        - **Tahun 2012** adalah tahun terbaik untuk **Total Penyewaan Sepeda** di **Capital Bike Share** karena:
-                        - Keberhasilan **Ekspansi** besar-besaran dengan penambahan **32 stasiun** baru dan perluasan **18 stasiun** existing, hingga total mencapai **50 stasiun** pada akhir tahun. Strategi ini terbukti efektif meningkatkan **Total Penyewaan** ([Capital Bike Share System](https://capitalbikeshare.com/system-data)).
-                        - Faktor **Cuaca** sangat mendukung, dengan **Tahun 2012** tercatat sebagai tahun terhangat di Washington, D.C., termasuk Maret yang sangat hangat dan musim panas yang masuk dalam tiga terhangat sepanjang sejarah ([The Washington Post](https://www.washingtonpost.com/blogs/capital-weather-gang/post/top-5-dc-weather-events-of-2012/2012/12/28/d384311c-4f0e-11e2-950a-7863a013264b_blog.html)).
-                        - Meskipun ada bencana seperti **Hurricane Sandy**, **Tahun 2012** tetap menjadi tahun dengan **Total Penyewaan** terbanyak, dan ini valid 100%.
-                        """)
-                st.success("""
-                        ### Saran:
-                        Untuk meningkatkan Penyewaan di tahun mendatang, **Capital Bike Share** disarankan:
-                        - Melanjutkan **Ekspansi** stasiun di lokasi strategis.
-                        - Mengoptimalkan distribusi sepeda berdasarkan data penggunaan.
-                        - Menawarkan insentif seperti diskon atau paket keanggotaan fleksibel untuk menarik lebih banyak pengguna.
-                        - Meningkatkan keamanan, kenyamanan, dan manfaat bagi anggota agar loyalitas pengguna terjaga.
-                        """)
-            
-        elif perbandingan == 'Bulan':
-            # Urutkan bulan
-            bulan_order = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-            
-            fig = px.bar(perbandingan_bulan, 
-                         x='Bulan', 
-                         y='Total', 
-                         title='Perbandingan Total Penyewaan Sepeda Bulanan (2011 - 2012)',
-                         category_orders={"Bulan": bulan_order})
-            
-            fig.update_layout(
-                xaxis_title="Bulan",
-                xaxis_type="category",
-                yaxis_title="Total Penyewaan Sepeda"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-        elif perbandingan == 'Hari':
-            # Urutkan hari
-            hari_order = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu']
-            
-            fig = px.bar(perbandingan_hari, 
-                         x='Hari', 
-                         y='Total', 
-                         title='Perbandingan Total Penyewaan Sepeda Harian (2011 - 2012)',
-                         category_orders={"Hari": hari_order})
-            
-            fig.update_layout(
-                xaxis_title="Hari",
-                xaxis_type="category",
-                yaxis_title="Total Penyewaan Sepeda"
-            )
-            st.plotly_chart(fig, use_container_width=True)
-            
-        elif perbandingan == 'Jam':
-            fig = px.histogram(perbandingan_jam, 
-                               x='Jam', 
-                               y='Total', 
-                               color='Tahun', 
-                               barmode='group', 
-                               title='Perbandingan Total Penyewaan Sepeda per Jam (2011 - 2012)')
-            
-            fig.update_xaxes(type='category', categoryorder='array', categoryarray=sorted(perbandingan_musim['Musim'].unique()))
-            
-            fig.update_layout(
-                xaxis_title="Jam",
-                yaxis_title="Total Penyewaan Sepeda"
-            )
+    # Mode lazy: hanya view yang sedang dibuka yang dihitung dan dirender.
+    # st.tabs selalu menjalankan isi semua tab pada setiap rerun
+    mode_lazy = st.sidebar.toggle('Mode lazy (hanya tab aktif)', value=True)
     
-            st.plotly_chart(fig, use_container_width=True)
-            
-            with st.expander("Insight Perbandingan Berdasarkan Jam"):
-                st.info("""
-                        ### Kesimpulan:
-                        Data menunjukkan bahwa meskipun **Tahun 2011** dan **Tahun 2012** memiliki lonjakan Penyewaan yang signifikan dengan pola serupa, **Tahun 2012** selalu menempati posisi tertinggi.
-                        - **Morning Rush** dan **Evening Rush** sangat memengaruhi Penyewaan sepeda di kedua tahun, tetapi **Tahun 2012** mencatat lonjakan luar biasa pada **Evening Rush**, mencapai **2.000.000 Penyewaan**.
-                        - Pola penggunaan di pagi dan sore hari pada kedua tahun sangat mirip, menunjukkan bahwa sepeda telah menjadi pilihan utama untuk **mobilitas sehari-hari**, bukan sekadar rekreasi.
-                        - Lonjakan pada **Evening Rush** jauh lebih tajam dibandingkan **Morning Rush**, kemungkinan karena lebih banyak orang menggunakan sepeda untuk pulang kerja atau sekolah.
-                        - **Tahun 2012** adalah tahun terbaik berkat strategi matang dari **Capital Bike Share**.
-                        """)
-                st.success("""
-                           ### Saran:
-                           - Optimalkan ketersediaan sepeda pada jam **Evening Rush** untuk mendukung lonjakan permintaan, misalnya dengan menambah stok sepeda di stasiun strategis.
-                           - Promosikan penggunaan sepeda sebagai moda transportasi harian dengan kampanye yang menargetkan pengguna saat **Morning Rush** dan **Evening Rush**.
-                           """)
-                
-            
-        elif perbandingan == 'Musim':
-            fig = px.histogram(perbandingan_musim, 
-                               x='Musim',
-                               y='Total', 
-                               color='Tahun', 
-                               barmode='group', 
-                               title='Perbandingan Total Penyewaan Sepeda Musiman (2011 - 2012)')
-            
-            fig.update_layout(
-                xaxis_title="Musim",
-                yaxis_title="Total Penyewaan Sepeda"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-              
-            
-                
-    # -------------------------- Tab 2 (Pengaruh Cuaca) ------------------------------ #
+    # Panel profiling (opsional), diisi setelah semua view selesai dirender
+    tampilkan_profiling = st.sidebar.toggle('Panel profiling', value=False)
+    panel_profiling = st.sidebar.container()
     
-    with tab2:
-        st.subheader("Pengaruh Cuaca")
-        
-        # Tipe Filter
-        col_tgl, col_select_box_null, col_perbandingan = st.columns([2, 3, 1])
-        
-        # Filter Tanggal
-        start_date, end_date = create_date_filter(col_tgl, hour_df, key_suffix="tab2")
-        
-        # Filter perbandingan
-        perbandingan = col_perbandingan.selectbox('Filter Berdasarkan:', ['Cuaca', 'Suhu'])
-        
-        # Filter data berdasarkan tanggal
-        filtered_df_day = day_df[(day_df['Tanggal'] >= start_date) & (day_df['Tanggal'] <= end_date)]
-        filtered_df_hour = hour_df[(hour_df['Tanggal'] >= start_date) & (hour_df['Tanggal'] <= end_date)]
-        
-        # Filter data berdasarkan pilihan
-        impact_cuaca = filtered_df_day.groupby(by=['Tahun', 'Cuaca'], observed=False)['Total'].sum().reset_index()
-        atemp_impact = hour_df.groupby(by='Kategori_Suhu_Terasa', observed=False)['Total'].sum().sort_values(ascending=False).reset_index()
-        
-        if perbandingan == 'Cuaca':
-            fig = px.histogram(impact_cuaca, 
-                     x='Cuaca', 
-                     y='Total', 
-                     color='Tahun', 
-                     barmode='group', 
-                     title='Pengaruh Cuaca terhadap Total Penyewaan Sepeda (2011 - 2012)')
-        
-            fig.update_layout(
-                yaxis_title="Total Penyewaan Sepeda",
-                xaxis_title="Jenis Cuaca"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            with st.expander("Insight Pengaruh Cuaca"):
-                st.info("""
-                        ### Kesimpulan:
-                        Berdasarkan grafik di atas, terlihat bahwa kondisi cuaca memiliki pengaruh besar terhadap jumlah Penyewaan sepeda di **Capital Bike Share**.
-                        - Pada **Tahun 2011** dan **Tahun 2012**, **Cuaca Cerah/Berawan** selalu mencatat **Penyewaan tertinggi**, sementara **Hujan/Salju Ringan** memiliki **Penyewaan terendah**.
-                        - **Tahun 2012** menunjukkan peningkatan drastis di semua kondisi **Cuaca** dibandingkan **Tahun 2011**, terutama pada **Cerah/Berawan** yang melonjak tajam. Ini dipengaruhi oleh pola **Cuaca** yang mendukung serta faktor eksternal seperti ekspansi stasiun pada tahun tersebut.
-                        - Untuk memverifikasi apakah cuaca di **Tahun 2012** lebih mendukung dibanding **Tahun 2011**, perlu analisis tambahan terhadap variabel seperti suhu rata-rata dan curah hujan bulanan.
-                        """)
-                st.success("""
-                           ### Saran:
-                           Tingkatkan Penyewaan saat **Hujan/Salju Ringan** dengan menyediakan jas hujan gratis di setiap stasiun dan memasang kanopi di jalur sepeda. Langkah ini dapat menjaga kenyamanan pengguna meskipun **Cuaca** kurang mendukung, sehingga mencegah penurunan drastis **Penyewaan** di **Musim Hujan**.
-                           """)
-        
-        elif perbandingan == 'Suhu':
-            fig = px.scatter(
-                day_df,
-                x='Suhu_Terasa',
-                y='Total',
-                color='Kategori_Suhu_Terasa',
-                color_continuous_scale='coolwarm',
-                title='Pengaruh Kategori Suhu Terasa terhadap Penyewaan Sepeda Per Jam',
-                labels={
-                    'Suhu_Terasa': 'Suhu Terasa (°C)',
-                    'Total': 'Jumlah Penyewaan Sepeda',
-                    'Kategori_Suhu_Terasa': 'Kategori Suhu Terasa'
-                },
-                opacity=0.8,
-            )
-
-            fig.update_traces(marker=dict(size=10, line=dict(width=1, color='black')))
-            fig.update_layout(legend_title_text='Kategori Suhu Terasa')
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            with st.expander("Insight Pengaruh Suhu"):
-                st.info("""
-                        ### Kesimpulan:
-                        Berdasarkan analisis menggunakan data **hour_df**, saya menemukan bahwa **Cuaca Cerah/Berawan** memberikan kontribusi tertinggi terhadap **Total Penyewaan**. Saya memilih **Suhu_Terasa** sebagai indikator karena mencerminkan kombinasi **Suhu Asli** dan **Kelembapan**, sehingga memberikan gambaran yang lebih akurat tentang kondisi nyata yang dirasakan penyewa sepeda.
-                        - Kondisi **Hangat** dan **Nyaman** (ketika **Suhu_Terasa** berada di rentang 15°C hingga 35°C) menunjukkan peningkatan **Jumlah Penyewaan** yang stabil dan signifikan, seperti terlihat pada **scatterplot** di atas.
-                        - **Cuaca Cerah/Berawan** terbukti secara faktual sebagai faktor utama yang paling berkontribusi pada **Total Penyewaan** di **Capital Bike Share**.
-                        """)
-                st.success("""
-                           ### Saran:
-                           Promosikan sewa sepeda saat **Cuaca Cerah/Berawan** dan suhu 15°C-35°C untuk maksimalkan **Total Penyewaan**.
-                           """)
-        
+    # Statistik cache agregasi
+    with st.sidebar.expander("Statistik Cache Agregasi"):
+        statistik = load_agg_cache().stats()
+        st.write(f"Hit: {statistik['hits']} | Miss: {statistik['misses']} | Hit rate: {statistik['hit_rate']:.0%}")
+        st.write(f"Entri: {statistik['entries']} ({statistik['bytes'] / 1024:.1f} KB), dibuang: {statistik['evictions']}")
+        statistik = load_figure_cache().stats()
+        st.write(f"Figur - Hit: {statistik['hits']} | Miss: {statistik['misses']} | Hit rate: {statistik['hit_rate']:.0%}")
+        st.write(f"Figur - Entri: {statistik['entries']} ({statistik['bytes'] / 1024:.1f} KB), dibuang: {statistik['evictions']}")
+        st.write(f"Snapshot pre-render: {load_prerendered().count(storage.snapshot_token(versi_data))} grafik")
+    judul_views = registry_view.titles()
     
-    # -------------------------- Tab 3 (Pola Pengguna) ------------------------------ #
+    if mode_lazy:
+        view_aktif = st.radio('Tampilan:', judul_views, horizontal=True, label_visibility='collapsed',
+                              index=judul_views.index(views.widget_default('view_aktif', judul_views[0])),
+                              key='view_aktif')
+        views.remember_widget('view_aktif', view_aktif)
+        registry_view.render(view_aktif)
+    else:
+        for tab, judul in zip(st.tabs(judul_views), judul_views):
+            with tab:
+                registry_view.render(judul)
     
-    with tab3:
-        st.subheader("Pola Pengguna")
-        
-        # Tipe Filter
-        col_tgl, col_select_box_null, col_kondisi = st.columns([2, 3, 1])
-        
-        # Filter Tanggal
-        start_date, end_date = create_date_filter(col_tgl, day_df, key_suffix="tab3")
-        
-        # Filter berdasarkan kondisi
-        kondisi = col_kondisi.selectbox('Filter Berdasarkan:', ['Membership', 'Jenis Hari'])
-        
-        # Filter data berdasarkan tanggal
-        filtered_df_day = day_df[(day_df['Tanggal'] >= start_date) & (day_df['Tanggal'] <= end_date)]
-        filtered_df_hour = hour_df[(hour_df['Tanggal'] >= start_date) & (hour_df['Tanggal'] <= end_date)]
-        
-        # Kelompokkan data langsung tanpa buat kolom baru
-        kategori_totals = filtered_df_day.groupby(
-            day_df['Hari'].apply(lambda x: 'Libur' if x in ['Sabtu', 'Minggu'] else 'Kerja')
-        )[['Member', 'Non_member']].sum().reset_index()
-        
-        if kondisi == 'Membership':
-            # Buat plot dengan Plotly
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=kategori_totals['Hari'],
-                y=kategori_totals['Member'],
-                name='Member',
-                marker_color='skyblue'
-            ))
-            fig.add_trace(go.Bar(
-                x=kategori_totals['Hari'],
-                y=kategori_totals['Non_member'],
-                name='Non-Member',
-                marker_color='lightcoral'
-            ))
-            
-            st.plotly_chart(fig, use_container_width=True)
-
-            # Tambahkan judul dan label
-            fig.update_layout(
-                title='Perbandingan Penyewaan Sepeda oleh Member vs Non-Member\nPada Hari Kerja dan Akhir Pekan',
-                xaxis_title='Kategori Hari',
-                yaxis_title='Total Penyewaan',
-                barmode='group',
-                legend_title='Tipe Pengguna'
-            )
-            
-            with st.expander("Insight Berdasarkan Membership"):
-                st.info("""
-                        ### Kesimpulan:
-                        Perbedaan yang bisa kita simpulkan dan kita ambil antara **Non_member** dan **Member** adalah:
-                        - **Member**: Pengguna berlangganan lebih dominan menggunakan sepeda pada **hari kerja**, yang menunjukkan bahwa mereka memanfaatkannya sebagai sarana transportasi utama untuk aktivitas rutin seperti perjalanan ke **tempat kerja atau sekolah**.
-                        - Jumlah Penyewaan mereka turun cukup signifikan pada **akhir pekan**, menandakan bahwa mereka lebih jarang menggunakan sepeda untuk liburan, karena mungkin lebih memilih istirahat dan meluangkan waktu bersama keluarganya. Dia liburannya pake mobil ye.
-                        - **Non Member**: Berbeda dengan Pengguna kasual yang memiliki pola Penyewaan lebih merata antara **hari kerja** dan **akhir pekan**, meskipun total Penyewaannya tetap lebih kecil dibandingkan member.
-                        - Hal ini mengindikasikan bahwa **Non member** kemungkinan besar adalah wisatawan atau pengguna rekreasi, yang menggunakan sepeda secara fleksibel tanpa bergantung pada jadwal kerja.
-                        - **Member** lebih mengandalkan sepeda sebagai alat transportasi fungsional, sedangkan **Non member** lebih cenderung menggunakannya untuk keperluan rekreasi. 
-                        """)
-                st.success("""
-                           ### Saran:
-                           Dengan **insight** ini, kita bisa menyusun strategi yang lebih tepat untuk meningkatkan jumlah pengguna. Misalnya, menawarkan paket langganan fleksibel untuk Non member agar mereka tertarik menjadi member, atau meningkatkan promosi dan fasilitas bagi wisatawan pada akhir pekan.
-                           Tapi untuk membuktikan data ini benar aku akan menghadirkan support nya.
-                           """)
-            
-        elif kondisi == 'Jenis Hari':
-            # Filtering data berdasarkan hari
-            df_kerja = filtered_df_hour[filtered_df_hour['Hari'].isin(['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat'])]
-            df_libur = filtered_df_hour[filtered_df_hour['Hari'].isin(['Sabtu', 'Minggu'])]
-
-            # Grouping berdasarkan jam dan total
-            jam_kerja = df_kerja.groupby('Jam', observed=False)['Total'].sum().reset_index()
-            jam_libur = df_libur.groupby('Jam', observed=False)['Total'].sum().reset_index()
-
-            # Buat plot dengan Plotly
-            fig = go.Figure()
-            fig.add_trace(go.Bar(
-                x=jam_kerja['Jam'],
-                y=jam_kerja['Total'],
-                name='Hari Kerja',
-                marker_color='blue',
-                opacity=0.7
-            ))
-            fig.add_trace(go.Bar(
-                x=jam_libur['Jam'],
-                y=jam_libur['Total'],
-                name='Akhir Pekan',
-                marker_color='orange',
-                opacity=0.7
-            ))
-
-            # Tambahkan judul dan label
-            fig.update_layout(
-                title='Perbandingan Pola Penyewaan Sepeda Berdasarkan Jam dalam Hari Kerja vs Akhir Pekan',
-                xaxis_title='Jam',
-                yaxis_title='Total Penyewaan',
-                barmode='group',
-                legend_title='Kategori Hari',
-                xaxis=dict(tickmode='linear', dtick=1)
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
-            
-            with st.expander("Insight Berdasarkan Jam"):
-                st.info("""
-                        ### Kesimpulan:
-                        Dari insight yang sudah kita dapatkan sebelumnya di tambah dengan barplot yang lebih spesifik dengan melihat perbedaan perjamnya aku menemmukan bahwa:
-                        - **Hari Kerja** sangat mendominasi sekali dan tadi insight sebelumnya mengatakan bahwa **Hari Kerja** di dominasi oleh **Member**. dan terbukti karena:
-                        - Aktivitas di **Pagi Hari** (Jam 6 - 8) dan **Sore menjelang Malam** (Jam 16 - 19) terlihat bahwa lonjakan besar yang sangat signifikan terjadi, ini menunjukan bukti bahwa **Member** lebih memanfaatkan sepedanya dengan menjadikan sepeda nya alat **transportasi umum** atau **commuter**.
-                        - Sedangkan untuk **Akhir Pekan** grafik menunjukan ke stabilan dan tidak ada lonjakan yang terlalu signifikan, ini membuktikan bahwa **Non Member** menggunakan sepedanya tanpa ada variable lain yang mendukung nya, mungkin ada, yaitu saat liburan dan hanya iseng saja.
-                        """)
-                st.success("""
-                           ### Saran:
-                           Perusahaan harus lebih memfokuskan diri kepada **Member** tanpa mengurangi kepedulian terhadap **Non-member**. Misalkan, mungkin saja di **Non-member** bukan hanya sekedar orang orang yang berlibur tapi ada juga pekerja yang belum mau berlangganan menjadi **Member**. Nah perusahaan harus memfokuskan diri kepada hal itu juga.
-                           """)
-    
-    # -------------------------- Tab 4 (Tren Musiman) ------------------------------ #
-
-    with tab4:
-        st.subheader("Tren Musiman")
-        
-        # Tipe Filter
-        col_tgl, _ = st.columns([2, 3])
-        
-        # Filter Tanggal
-        start_date, end_date = create_date_filter(col_tgl, day_df, key_suffix="tab4")
-        
-        # Filter data berdasarkan tanggal
-        filtered_df_day = day_df[(day_df['Tanggal'] >= start_date) & (day_df['Tanggal'] <= end_date)]
-        
-        # Urutan musim
-        urutan_musim = ['Musim Dingin', 'Musim Semi', 'Musim Panas', 'Musim Gugur']
-
-        # Hitung total Penyewaan per musim untuk setiap tahun
-        total_Penyewaan = filtered_df_day.groupby(['Tahun', 'Musim'], observed=False)['Total'].sum().reset_index()
-
-        # Buat plot dengan Plotly
-        fig = px.histogram(
-            total_Penyewaan,
-            x='Musim',
-            y='Total',
-            color='Tahun',
-            barmode='group',
-            title='Tren Penyewaan Sepeda Berdasarkan Musim dan Tahun',
-            labels={'Musim': 'Musim', 'Total': 'Total Penyewaan', 'Tahun': 'Tahun'},
-            category_orders={'Musim': urutan_musim},
-            color_discrete_sequence=['palegoldenrod', 'royalblue']
-        )
-        
-        st.plotly_chart(fig, use_container_width=True)
-        
-        with st.expander("Insight Tren Musiman"):
-            st.info("""
-                    ### Kesimpulan:
-                    Analisis data Penyewaan sepeda menunjukkan pola musiman yang konsisten dengan beberapa temuan menarik antara **Tahun 2011** dan **Tahun 2012**.
-                    - **Peningkatan di Semua Musim:** Jumlah Penyewaan pada **Tahun 2012** lebih tinggi dibandingkan **Tahun 2011** di semua musim, mengindikasikan pertumbuhan penggunaan sepeda secara keseluruhan, kemungkinan akibat **ekspansi layanan** atau peningkatan kesadaran pengguna.
-                    - **Musim Panas Puncak Tertinggi:** Baik di **Tahun 2011** maupun **Tahun 2012**, **Musim Panas** mencatat Penyewaan tertinggi karena cuaca yang nyaman dan mendukung aktivitas luar ruangan.
-                    - **Musim Dingin Terendah:** Penyewaan turun drastis pada **Musim Dingin**, terutama di **Tahun 2011**, kemungkinan dipengaruhi oleh suhu rendah, hujan, atau salju.
-                    - **Lonjakan di Musim Semi dan Gugur:** Dari **Tahun 2011** ke **Tahun 2012**, Penyewaan meningkat signifikan pada **Musim Semi** dan **Musim Gugur**, menunjukkan kenyamanan pengguna bertambah di luar **Musim Panas**, mungkin karena infrastruktur atau strategi pemasaran yang lebih baik.
-                    """)
-            st.success("""
-                    ### Saran:
-                    - Manfaatkan **Musim Panas** dengan promosi intensif untuk memaksimalkan Penyewaan.
-                    - Tingkatkan Penyewaan di **Musim Dingin** dengan menyediakan fasilitas pendukung seperti jas hujan atau pemanas di stasiun sepeda.
-                    - Perkuat infrastruktur dan kampanye di **Musim Semi** dan **Musim Gugur** untuk mempertahankan tren peningkatan penggunaan sepeda.
-                    """)
\ No newline at end of file
+    # Rerun selesai, trace disimpan ke riwayat sesi (N rerun terakhir)
+    riwayat_trace = st.session_state.setdefault('_riwayat_trace', deque(maxlen=20))
+    riwayat_trace.append(tracing.finish_rerun())
+    # Rerun pertama proses ini: laporan waktu startup terhadap anggaran (dicetak ke stderr)
+    startup.report_startup(_durasi_impor_ms, riwayat_trace[-1])
+    
+    if tampilkan_profiling:
+        with panel_profiling.expander("Profiling Rerun", expanded=True):
+            jumlah_rerun = st.slider('Rerun terakhir:', 1, riwayat_trace.maxlen, 5, key='jumlah_rerun_profiling')
+            traces = list(riwayat_trace)[-jumlah_rerun:]
+            laporan_startup = startup.startup_report()
+            if laporan_startup is not None:
+                st.caption(f"Startup proses: {laporan_startup['total_ms']:.0f} ms "
+                           f"(anggaran {laporan_startup['anggaran_ms']:.0f} ms)")
+            for trace in reversed(traces):
+                st.write(f"**{trace.label}**: {trace.durasi_ms:.1f} ms")
+            st.dataframe(tracing.spans_frame(traces), hide_index=True)
+            st.download_button("Unduh JSON lines", tracing.to_jsonl(traces), file_name="trace.jsonl")
+            st.download_button("Unduh Chrome trace", tracing.to_chrome_trace(traces), file_name="trace.json")
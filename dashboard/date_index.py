@@ -0,0 +1,35 @@
+import pandas as pd
+
+# Akses rentang tanggal berbasis indeks Tanggal yang terurut.
+# Semua fungsi di sini mengasumsikan kolom Tanggal sudah terurut naik (lihat ensure_sorted)
+
+
+# 1. Memastikan data terurut berdasarkan Tanggal
+def ensure_sorted(df):
+    if df['Tanggal'].is_monotonic_increasing:
+        return df
+    return df.sort_values('Tanggal', kind='stable').reset_index(drop=True)
+
+
+# 2. Tanggal awal dan akhir dalam O(1)
+def date_bounds(df):
+    tanggal = df['Tanggal']
+    return tanggal.iloc[0], tanggal.iloc[-1]
+
+
+# 3. Potongan data untuk rentang tanggal [start_date, end_date] dengan binary search.
+# Hasilnya slice posisi (iloc), bukan boolean mask, sehingga tidak menyalin data
+def slice_range(df, start_date, end_date):
+    tanggal = df['Tanggal']
+    kiri = tanggal.searchsorted(start_date, side='left')
+    kanan = tanggal.searchsorted(end_date, side='right')
+    return df.iloc[kiri:kanan]
+
+
+# 4. Mengganti semua baris dengan Tanggal di [start_date, end_date] dengan baris `baru` (terurut, semua
+# Tanggal-nya di rentang itu). Baris di luar rentang tidak diurutkan ulang
+def replace_range(df, baru, start_date, end_date):
+    tanggal = df['Tanggal']
+    kiri = tanggal.searchsorted(start_date, side='left')
+    kanan = tanggal.searchsorted(end_date, side='right')
+    return ensure_sorted(pd.concat([df.iloc[:kiri], baru, df.iloc[kanan:]], ignore_index=True))
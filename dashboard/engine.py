@@ -0,0 +1,197 @@
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+import cube
+import date_index
+import parallel
+import storage
+import tracing
+
+# Mesin agregasi tanpa Streamlit: query (dimensi, measure, rentang tanggal, filter) dijawab
+# dari kubus agregat. Dipakai oleh dashboard.py dan oleh endpoint JSON di api.py
+
+# Dimensi yang hanya ada di kubus per jam, query dengan dimensi/filter ini dijawab dari kubus per jam
+DIMENSI_PER_JAM_SAJA = set(cube.DIMENSI_PER_JAM) - set(cube.DIMENSI_HARIAN)
+
+
+# 1. Query. Frozen sehingga bisa dipakai langsung sebagai kunci cache
+@dataclass(frozen=True)
+class Query:
+    dimensi: tuple
+    measure: tuple = ('Total',)
+    start_date: pd.Timestamp = None
+    end_date: pd.Timestamp = None
+    filter: tuple = field(default=())
+
+    def __post_init__(self):
+        # Nilai tunggal dijadikan tuple, tanggal dijadikan Timestamp, filter dijadikan tuple terurut
+        for nama in ('dimensi', 'measure'):
+            nilai = getattr(self, nama)
+            object.__setattr__(self, nama, (nilai,) if isinstance(nilai, str) else tuple(nilai))
+        for nama in ('start_date', 'end_date'):
+            nilai = getattr(self, nama)
+            object.__setattr__(self, nama, None if nilai is None else pd.Timestamp(nilai))
+        saring = self.filter.items() if isinstance(self.filter, dict) else self.filter
+        object.__setattr__(self, 'filter', tuple(sorted(
+            (kolom, (nilai,) if isinstance(nilai, (str, int, bool)) else tuple(nilai)) for kolom, nilai in saring
+        )))
+        self.validate()
+
+    def validate(self):
+        if not self.dimensi:
+            raise ValueError("Query membutuhkan minimal satu dimensi")
+        dimensi_valid = set(cube.DIMENSI_PER_JAM)
+        for kolom in self.dimensi + tuple(kolom for kolom, _ in self.filter):
+            if kolom not in dimensi_valid:
+                raise ValueError(f"Dimensi tidak dikenal: {kolom!r} (pilihan: {sorted(dimensi_valid)})")
+        for kolom in self.measure:
+            if kolom not in cube.MEASURE:
+                raise ValueError(f"Measure tidak dikenal: {kolom!r} (pilihan: {cube.MEASURE})")
+        if self.start_date is not None and self.end_date is not None and self.start_date > self.end_date:
+            raise ValueError("start_date harus sebelum atau sama dengan end_date")
+
+    @property
+    def per_jam(self):
+        return any(kolom in DIMENSI_PER_JAM_SAJA for kolom in self.dimensi + tuple(kolom for kolom, _ in self.filter))
+
+    @classmethod
+    def from_dict(cls, data):
+        if not isinstance(data, dict):
+            raise ValueError("Query harus berupa objek JSON")
+        kunci_valid = {'dimensi', 'measure', 'start_date', 'end_date', 'filter'}
+        tidak_dikenal = set(data) - kunci_valid
+        if tidak_dikenal:
+            raise ValueError(f"Kunci query tidak dikenal: {sorted(tidak_dikenal)}")
+        if 'dimensi' not in data:
+            raise ValueError("Query membutuhkan 'dimensi'")
+        try:
+            return cls(**data)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Query tidak valid: {e}") from e
+
+    def to_dict(self):
+        return {
+            'dimensi': list(self.dimensi),
+            'measure': list(self.measure),
+            'start_date': None if self.start_date is None else self.start_date.date().isoformat(),
+            'end_date': None if self.end_date is None else self.end_date.date().isoformat(),
+            'filter': {kolom: list(nilai) for kolom, nilai in self.filter},
+        }
+
+
+# Analisis yang ditampilkan dashboard, bisa dipanggil dengan nama lewat analysis() atau /api/analisis/<nama>
+ANALISIS = {
+    'perbandingan_tahun': {'dimensi': ('Tahun',)},
+    'perbandingan_bulan': {'dimensi': ('Bulan',)},
+    'perbandingan_hari': {'dimensi': ('Hari',)},
+    'perbandingan_jam': {'dimensi': ('Tahun', 'Jam')},
+    'perbandingan_musim': {'dimensi': ('Musim', 'Tahun')},
+    'pengaruh_cuaca': {'dimensi': ('Tahun', 'Cuaca')},
+    'membership': {'dimensi': ('Jenis_Hari',), 'measure': ('Member', 'Non_member')},
+    'jenis_hari_per_jam': {'dimensi': ('Jam', 'Jenis_Hari')},
+    'tren_musiman': {'dimensi': ('Tahun', 'Musim')},
+}
+
+
+def analysis(nama, start_date=None, end_date=None):
+    if nama not in ANALISIS:
+        raise ValueError(f"Analisis tidak dikenal: {nama!r} (pilihan: {sorted(ANALISIS)})")
+    return Query(start_date=start_date, end_date=end_date, **ANALISIS[nama])
+
+
+# 2. Menjawab query dari kubus. Filter nilai mengikuti tipe kolom (mis. '2011' untuk kolom Tahun)
+def _coerce(kolom, nilai):
+    if isinstance(kolom.dtype, pd.CategoricalDtype):
+        return [str(item) for item in nilai]
+    if pd.api.types.is_bool_dtype(kolom):
+        return [item if isinstance(item, bool) else str(item).lower() in ('1', 'true', 'ya') for item in nilai]
+    if pd.api.types.is_integer_dtype(kolom):
+        return [int(item) for item in nilai]
+    return list(nilai)
+
+
+# lokasi_snapshot (folder, token): snapshot yang berisi kedua kubus, agar roll-up data besar bisa
+# dijalankan paralel di process pool (lihat parallel.rollup)
+def aggregate(kubus_harian, kubus_per_jam, query, lokasi_snapshot=None):
+    nama = 'kubus_per_jam' if query.per_jam else 'kubus_harian'
+    kubus = kubus_per_jam if query.per_jam else kubus_harian
+
+    with tracing.span('filter tanggal') as info:
+        tanggal_min, tanggal_max = date_index.date_bounds(kubus)
+        kubus = date_index.slice_range(kubus, query.start_date or tanggal_min, query.end_date or tanggal_max)
+        info['baris'] = len(kubus)
+
+    with tracing.span('rollup') as info:
+        try:
+            where = {kolom: _coerce(kubus[kolom], nilai) for kolom, nilai in query.filter}
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Nilai filter tidak valid: {e}") from e
+        hasil = parallel.rollup(kubus, by=list(query.dimensi), measures=list(query.measure), where=where,
+                                nama=nama, lokasi_snapshot=lokasi_snapshot)
+        info['baris'] = len(hasil)
+    return hasil
+
+
+# 3. Mesin di atas dataset hidup (ingest.LiveDataset atau SnapshotSource), dengan cache hasil opsional
+# (agg_cache.AggregationCache) yang dikunci versi data dan query
+class Engine:
+    def __init__(self, dataset, cache=None):
+        self.dataset = dataset
+        self.cache = cache
+
+    def run(self, query):
+        return self.run_many([query])[1][0]
+
+    # Batch query dijawab dari satu snapshot, sehingga semua hasil berasal dari versi data yang sama
+    def run_many(self, queries):
+        versi, _, _, kubus_harian, kubus_per_jam = self.dataset.snapshot()
+        lokasi = self.dataset.snapshot_location(versi)
+        hasil = []
+        for query in queries:
+            if self.cache is None:
+                hasil.append(aggregate(kubus_harian, kubus_per_jam, query, lokasi))
+            else:
+                hasil.append(self.cache.get_or_compute(
+                    ('engine', versi, query), lambda: aggregate(kubus_harian, kubus_per_jam, query, lokasi)))
+        return versi, hasil
+
+    def metadata(self):
+        versi, day_df, _, _, kubus_per_jam = self.dataset.snapshot()
+        tanggal_min, tanggal_max = date_index.date_bounds(kubus_per_jam)
+        return {
+            'versi': str(versi),
+            'tanggal_min': tanggal_min.date().isoformat(),
+            'tanggal_max': tanggal_max.date().isoformat(),
+            'dimensi': {kolom: _values(kubus_per_jam[kolom]) for kolom in cube.DIMENSI_PER_JAM if kolom != 'Tanggal'},
+            'measure': cube.MEASURE,
+            'analisis': {nama: Query(**kwargs).to_dict() for nama, kwargs in ANALISIS.items()},
+        }
+
+
+def _values(kolom):
+    if isinstance(kolom.dtype, pd.CategoricalDtype):
+        return [str(nilai) for nilai in kolom.cat.categories]
+    return sorted(nilai.item() if hasattr(nilai, 'item') else nilai for nilai in kolom.unique())
+
+
+# 4. Dataset read-only dari snapshot yang dipublikasikan dashboard (storage.publish_snapshot).
+# Versi baru dibuka otomatis saat CURRENT.json menunjuk token lain
+class SnapshotSource:
+    def __init__(self, folder):
+        self.folder = folder
+        self._token = None
+        self._frames = None
+
+    def snapshot(self):
+        aktif = storage.current_snapshot(self.folder)
+        if aktif is None:
+            raise FileNotFoundError(f"Belum ada snapshot di {self.folder}")
+        if aktif['token'] != self._token:
+            self._frames = storage.open_snapshot(self.folder, aktif['token'])
+            self._token = aktif['token']
+        frames = self._frames
+        return self._token, frames['day_df'], frames['hour_df'], frames['kubus_harian'], frames['kubus_per_jam']
+
+    def snapshot_location(self, versi):
+        return self.folder, versi
@@ -0,0 +1,145 @@
+import glob
+import hashlib
+import importlib.metadata
+import json
+import os
+import shutil
+import threading
+
+import pandas as pd
+import streamlit as st
+
+import startup
+import storage
+
+# plotly.io hanya diimpor saat cache miss
+pio = startup.LazyModule('plotly.io')
+
+# Cache spec JSON figur Plotly. Kunci: nama grafik + hash isi data agregat, sehingga figur yang
+# datanya sama (walaupun dari filter berbeda atau sesi lain) tidak dibangun dan diserialisasi ulang.
+# Spec dikirim langsung ke frontend tanpa membuat ulang objek figur. Spec juga disimpan di disk (satu file per
+# kunci), sehingga proses baru (restart atau replika lain) mengirim figur yang sudah pernah dibangun tanpa
+# mengimpor Plotly dan membangun figur, termasuk grafik pertama yang menentukan waktu startup
+
+# Folder spec di disk (di dalam FOLDER_CACHE, subfolder per versi spec) dan jumlah spec yang disimpan
+FOLDER_FIGUR = 'figur'
+FIGUR_DISIMPAN = 512
+
+
+# 1. Hash isi data (nilai, kolom dan tipe data) dari satu atau beberapa DataFrame
+def fingerprint(nama_grafik, data):
+    sha = hashlib.sha1(nama_grafik.encode())
+    for df in data if isinstance(data, (tuple, list)) else [data]:
+        sha.update(json.dumps([list(map(str, df.columns)), [str(tipe) for tipe in df.dtypes]]).encode())
+        sha.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return sha.hexdigest()
+
+
+# 2. Spec JSON figur dari cache (agg_cache.AggregationCache), lalu dari folder spec di disk (jika diisi).
+# buat_figur hanya dipanggil jika spec belum ada di keduanya
+def figure_spec(cache, nama_grafik, data, buat_figur, folder=None):
+    kunci = fingerprint(nama_grafik, data)
+
+    def bangun():
+        spec = load_spec(folder, kunci) if folder is not None else None
+        if spec is None:
+            spec = pio.to_json(buat_figur(), validate=False)
+            if folder is not None:
+                save_spec(folder, kunci, spec)
+        return spec
+    return cache.get_or_compute(('figur', kunci), bangun)
+
+
+# 3. Spec di disk. Versi spec: versi Plotly dan Streamlit (tema) serta isi modul yang membangun figur,
+# sehingga spec dari kode grafik lama tidak pernah dipakai. Folder versi lain dihapus saat folder dibuat
+def spec_version(*modul):
+    sha = hashlib.sha1(f"{importlib.metadata.version('plotly')}|{st.__version__}".encode())
+    for m in modul:
+        with open(m.__file__, 'rb') as f:
+            sha.update(f.read())
+    return sha.hexdigest()[:16]
+
+
+def figure_folder(csv_path, versi):
+    induk = os.path.join(os.path.dirname(os.path.abspath(csv_path)), storage.FOLDER_CACHE, FOLDER_FIGUR)
+    if os.path.isdir(induk):
+        for nama in os.listdir(induk):
+            if nama != versi and os.path.isdir(os.path.join(induk, nama)):
+                shutil.rmtree(os.path.join(induk, nama), ignore_errors=True)
+    return os.path.join(induk, versi)
+
+
+def _spec_path(folder, kunci):
+    return os.path.join(folder, f"{kunci}.json")
+
+
+def load_spec(folder, kunci):
+    path = _spec_path(folder, kunci)
+    try:
+        with open(path, encoding='utf-8') as f:
+            spec = f.read()
+        # Waktu akses dicatat sebagai mtime, spec yang paling lama tidak dipakai dihapus lebih dulu
+        os.utime(path)
+    except OSError:
+        return None
+    return spec
+
+
+def save_spec(folder, kunci, spec):
+    try:
+        os.makedirs(folder, exist_ok=True)
+        path = _spec_path(folder, kunci)
+        sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(sementara, 'w', encoding='utf-8') as f:
+            f.write(spec)
+        os.replace(sementara, path)
+    except OSError:
+        # Folder tidak bisa ditulis: spec tetap ada di cache memori
+        return
+
+    lama = sorted(glob.glob(_spec_path(folder, '*')), key=os.path.getmtime, reverse=True)
+    for path_lama in lama[FIGUR_DISIMPAN:]:
+        try:
+            os.remove(path_lama)
+        except OSError:
+            pass
+
+
+# 4. Mengirim spec yang sudah jadi sebagai elemen plotly_chart. st.plotly_chart selalu membangun
+# ulang objek figur dari input (validasi + serialisasi), jadi elemen disusun langsung seperti di
+# dalam st.plotly_chart (Streamlit 1.43, versi dipin di requirements.txt). Jika API internal itu
+# berubah (modul, fungsi atau field proto tidak ada), spec dibaca ulang menjadi figur untuk st.plotly_chart
+def _plotly_chart_figure(spec, use_container_width):
+    return st.plotly_chart(pio.from_json(spec, skip_invalid=True), use_container_width=use_container_width)
+
+
+def plotly_chart_spec(spec, use_container_width=True):
+    try:
+        from streamlit.elements.lib.form_utils import current_form_id
+        from streamlit.elements.lib.utils import compute_and_register_element_id
+        from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+    except ImportError:
+        return _plotly_chart_figure(spec, use_container_width)
+
+    try:
+        dg = st._main
+        proto = PlotlyChartProto()
+        proto.use_container_width = use_container_width
+        proto.theme = 'streamlit'
+        proto.form_id = current_form_id(dg)
+        proto.spec = spec
+        proto.config = json.dumps({'showLink': False, 'linkText': False})
+        proto.id = compute_and_register_element_id(
+            'plotly_chart',
+            user_key=None,
+            form_id=proto.form_id,
+            plotly_spec=proto.spec,
+            plotly_config=proto.config,
+            selection_mode=('points', 'box', 'lasso'),
+            is_selection_activated=False,
+            theme='streamlit',
+            use_container_width=use_container_width,
+        )
+        return dg._enqueue('plotly_chart', proto)
+    except (AttributeError, TypeError):
+        return _plotly_chart_figure(spec, use_container_width)
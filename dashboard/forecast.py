@@ -0,0 +1,349 @@
+import glob
+import itertools
+import json
+import os
+import queue
+import threading
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import storage
+
+# Peramalan permintaan (Total/Member/Non_member) dengan SARIMAX statsmodels, cuaca dan musim sebagai
+# variabel eksogen. Model dilatih di thread worker (Forecaster) sehingga UI tidak pernah menunggu.
+# Parameter hasil estimasi disimpan di disk per versi data (JSON kecil, bukan pickle objek statsmodels).
+# Saat data baru masuk, parameter lama dipakai ulang dan hanya Kalman filter yang dijalankan ulang
+# (puluhan ms), estimasi ulang (MLE) baru dilakukan jika data baru sudah cukup banyak.
+# Permintaan peramalan dari UI dijawab dari model di memori dalam hitungan milidetik
+
+# Folder parameter model (di dalam FOLDER_CACHE) dan jumlah versi yang disimpan per model
+FOLDER_MODEL = 'model'
+MODEL_DISIMPAN = 2
+
+# Spesifikasi model per seri. jendela: jumlah baris terakhir yang dipakai melatih (None: seluruh data)
+SERI = {
+    'harian': {
+        'frekuensi': 'D',
+        'jendela': None,
+        'model': {'order': (1, 1, 1), 'seasonal_order': (0, 1, 1, 7), 'trend': 'n'},
+    },
+    'per_jam': {
+        'frekuensi': 'h',
+        'jendela': 8 * 7 * 24,
+        'model': {'order': (2, 0, 1), 'seasonal_order': (0, 0, 0, 0), 'trend': 'c'},
+    },
+}
+MEASURE = ['Total', 'Member', 'Non_member']
+
+# Variabel eksogen kategori (dummy, kategori pertama sebagai acuan)
+EXOG = ['Cuaca', 'Musim']
+
+# Pola harian dan mingguan seri per jam sebagai harmonik Fourier: periode (jam) -> jumlah harmonik
+FOURIER_PER_JAM = {24: 4, 168: 6}
+
+# Estimasi ulang parameter jika data baru sejak estimasi terakhir >= bagian ini dari data latih
+BATAS_ESTIMASI_ULANG = 0.1
+
+# Tingkat kepercayaan interval prediksi
+ALPHA = 0.05
+
+# Jeda (detik) sebelum pelatihan yang gagal dicoba lagi, dan jumlah versi data terakhir yang urutannya diingat
+JEDA_ULANG_GAGAL = 60
+RIWAYAT_VERSI = 64
+
+
+def model_folder(csv_path):
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), storage.FOLDER_CACHE, FOLDER_MODEL)
+
+
+# 1. Data latih: kolom Waktu, measure dan variabel eksogen, terurut per waktu
+def training_frame(seri, day_df, hour_df):
+    if seri == 'harian':
+        frame = day_df[['Tanggal'] + MEASURE + EXOG].rename(columns={'Tanggal': 'Waktu'})
+    else:
+        frame = hour_df[MEASURE + EXOG].assign(
+            Waktu=hour_df['Tanggal'] + pd.to_timedelta(hour_df['Jam'].astype('int64'), unit='h'))
+    return frame.sort_values('Waktu', kind='stable').reset_index(drop=True)
+
+
+def _fourier(waktu):
+    jam = ((waktu - pd.Timestamp(0)) / pd.Timedelta(hours=1)).to_numpy(dtype='float64')
+    kolom = {}
+    for periode, jumlah in FOURIER_PER_JAM.items():
+        for k in range(1, jumlah + 1):
+            sudut = 2 * np.pi * k * jam / periode
+            kolom[f"sin_{periode}_{k}"] = np.sin(sudut)
+            kolom[f"cos_{periode}_{k}"] = np.cos(sudut)
+    return pd.DataFrame(kolom, index=waktu.index)
+
+
+# Matriks eksogen. kolom_exog: daftar kolom model yang sudah dilatih (kolom lain dibuang, yang hilang diisi 0)
+def exog_matrix(seri, frame, kolom_exog=None):
+    bagian = [pd.get_dummies(frame[EXOG], dtype='float64').drop(
+        columns=[f"{kolom}_{storage.URUTAN_KATEGORI[kolom][0]}" for kolom in EXOG])]
+    if seri == 'per_jam':
+        bagian.append(_fourier(frame['Waktu']))
+    exog = pd.concat(bagian, axis=1)
+    if kolom_exog is None:
+        # Kategori yang tidak pernah muncul di data latih tidak bisa diestimasi
+        return exog.loc[:, exog.any(axis=0)]
+    return exog.reindex(columns=kolom_exog, fill_value=0.0)
+
+
+# 2. Kalender untuk periode ramalan: musim per (bulan, tanggal) dan proporsi cuaca per bulan dari seluruh data
+def calendar(frame):
+    waktu = frame['Waktu']
+    musim = frame.groupby([waktu.dt.month, waktu.dt.day], observed=True)['Musim'].last()
+    cuaca = pd.get_dummies(frame['Cuaca'], dtype='float64').groupby(waktu.dt.month.to_numpy()).mean()
+    return musim, cuaca
+
+
+def _future_exog(seri, waktu, kolom_exog, kalender, cuaca=None):
+    musim, profil_cuaca = kalender
+    waktu = pd.Series(waktu)
+    kunci = pd.MultiIndex.from_arrays([waktu.dt.month, waktu.dt.day])
+    # Tanggal yang tidak ada di kalender (mis. 29 Februari) memakai musim hari sebelumnya
+    nilai_musim = pd.Series(musim.reindex(kunci).to_numpy()).ffill().bfill()
+    frame = pd.DataFrame({
+        'Waktu': waktu,
+        'Musim': pd.Categorical(nilai_musim, categories=storage.URUTAN_KATEGORI['Musim']),
+        'Cuaca': pd.Categorical([cuaca or storage.URUTAN_KATEGORI['Cuaca'][0]] * len(waktu),
+                                categories=storage.URUTAN_KATEGORI['Cuaca']),
+    })
+    exog = exog_matrix(seri, frame, kolom_exog)
+    if cuaca is None:
+        # Tanpa skenario cuaca: proporsi historis setiap cuaca di bulan yang sama
+        proporsi = profil_cuaca.reindex(waktu.dt.month.to_numpy()).fillna(0.0)
+        for kategori in profil_cuaca.columns:
+            if f"Cuaca_{kategori}" in exog.columns:
+                exog[f"Cuaca_{kategori}"] = proporsi[kategori].to_numpy()
+    return exog
+
+
+# 3. Estimasi dan filter SARIMAX (target log1p agar ramalan tidak negatif dan efek eksogen multiplikatif)
+def _sarimax(seri, frame, measure, exog):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    endog = np.log1p(frame[measure].to_numpy(dtype='float64'))
+    return SARIMAX(endog, exog=exog.to_numpy(), **SERI[seri]['model'])
+
+
+def _estimate(model, start_params=None):
+    from statsmodels.tools.sm_exceptions import ConvergenceWarning
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', ConvergenceWarning)
+        warnings.simplefilter('ignore', UserWarning)
+        if start_params is not None:
+            try:
+                return model.fit(start_params=start_params, disp=False)
+            except (np.linalg.LinAlgError, ValueError):
+                pass
+        return model.fit(disp=False)
+
+
+# 4. Model siap pakai untuk satu seri/measure pada satu versi data
+class ForecastModel:
+    def __init__(self, seri, measure, token, hasil, kolom_exog, riwayat, kalender, info):
+        self.seri = seri
+        self.measure = measure
+        self.token = token
+        self.hasil = hasil
+        self.kolom_exog = kolom_exog
+        self.riwayat = riwayat
+        self.kalender = kalender
+        self.info = info
+
+    # Ramalan horizon langkah ke depan. cuaca: skenario satu kategori cuaca, None untuk proporsi historis
+    def forecast(self, horizon, cuaca=None):
+        akhir = self.riwayat['Waktu'].iloc[-1]
+        waktu = pd.date_range(akhir, periods=horizon + 1, freq=SERI[self.seri]['frekuensi'])[1:]
+        exog = _future_exog(self.seri, waktu, self.kolom_exog, self.kalender, cuaca)
+        prediksi = self.hasil.get_forecast(horizon, exog=exog.to_numpy())
+        interval = prediksi.conf_int(alpha=ALPHA)
+        return pd.DataFrame({
+            'Waktu': waktu,
+            'Prediksi': np.expm1(prediksi.predicted_mean).clip(min=0),
+            'Batas_Bawah': np.expm1(interval[:, 0]).clip(min=0),
+            'Batas_Atas': np.expm1(interval[:, 1]).clip(min=0),
+        })
+
+
+# 5. Parameter model di disk: {seri}_{measure}_{token}.json
+def _params_path(folder, seri, measure, token):
+    return os.path.join(folder, f"{seri}_{measure}_{token}.json")
+
+
+def save_params(folder, seri, measure, token, data):
+    os.makedirs(folder, exist_ok=True)
+    path = _params_path(folder, seri, measure, token)
+    sementara = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(sementara, 'w') as f:
+        json.dump(data, f)
+    os.replace(sementara, path)
+
+    lama = sorted(glob.glob(_params_path(folder, seri, measure, '*')), key=os.path.getmtime, reverse=True)
+    for path_lama in lama[MODEL_DISIMPAN:]:
+        try:
+            os.remove(path_lama)
+        except OSError:
+            pass
+
+
+# Parameter untuk versi token, atau parameter terbaru dengan spesifikasi yang sama jika token None
+def load_params(folder, seri, measure, token=None):
+    kandidat = [_params_path(folder, seri, measure, token)] if token is not None else \
+        sorted(glob.glob(_params_path(folder, seri, measure, '*')), key=os.path.getmtime, reverse=True)
+    for path in kandidat:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if data.get('spesifikasi') == _spec(seri):
+            return data
+    return None
+
+
+def _spec(seri):
+    # Bentuk JSON spesifikasi, untuk membandingkan dengan parameter yang tersimpan
+    return json.loads(json.dumps({**SERI[seri]['model'], 'exog': EXOG, 'fourier': FOURIER_PER_JAM if seri == 'per_jam' else {}}))
+
+
+# 6. Melatih (atau memperbarui) satu model untuk versi data token.
+# Urutan: parameter versi ini di disk -> parameter lama + filter ulang (inkremental) -> estimasi MLE
+def train(folder, token, day_df, hour_df, seri, measure, lama=None):
+    t_awal = time.perf_counter()
+    frame_penuh = training_frame(seri, day_df, hour_df)
+    jendela = SERI[seri]['jendela']
+    frame = frame_penuh.iloc[-jendela:].reset_index(drop=True) if jendela else frame_penuh
+
+    tersimpan = load_params(folder, seri, measure, token)
+    if tersimpan is not None:
+        cara = 'cache disk'
+    else:
+        tersimpan = lama or load_params(folder, seri, measure)
+        if tersimpan is not None:
+            baru = int((frame['Waktu'] > pd.Timestamp(tersimpan['akhir_estimasi'])).sum())
+            kolom_sama = tersimpan['kolom_exog'] == list(exog_matrix(seri, frame).columns)
+            cara = 'inkremental' if kolom_sama and baru < BATAS_ESTIMASI_ULANG * len(frame) else 'estimasi ulang'
+        else:
+            cara = 'estimasi'
+
+    if cara in ('cache disk', 'inkremental'):
+        kolom_exog = tersimpan['kolom_exog']
+        model = _sarimax(seri, frame, measure, exog_matrix(seri, frame, kolom_exog))
+        hasil = model.filter(np.asarray(tersimpan['params']))
+        akhir_estimasi = tersimpan['akhir_estimasi']
+    else:
+        exog = exog_matrix(seri, frame)
+        kolom_exog = list(exog.columns)
+        awal = None
+        if tersimpan is not None and tersimpan['kolom_exog'] == kolom_exog:
+            awal = np.asarray(tersimpan['params'])
+        hasil = _estimate(_sarimax(seri, frame, measure, exog), start_params=awal)
+        akhir_estimasi = frame['Waktu'].iloc[-1].isoformat()
+
+    data = {
+        'seri': seri,
+        'measure': measure,
+        'token': token,
+        'spesifikasi': _spec(seri),
+        'kolom_exog': kolom_exog,
+        'params': [float(nilai) for nilai in hasil.params],
+        'akhir_estimasi': akhir_estimasi,
+        'jumlah_latih': len(frame),
+        'aic': float(hasil.aic),
+    }
+    if cara != 'cache disk':
+        save_params(folder, seri, measure, token, data)
+
+    info = {'cara': cara, 'durasi_ms': (time.perf_counter() - t_awal) * 1000, 'jumlah_latih': len(frame),
+            'akhir_estimasi': akhir_estimasi, 'aic': data['aic']}
+    model = ForecastModel(seri, measure, token, hasil, kolom_exog, frame[['Waktu', measure]], calendar(frame_penuh), info)
+    return model, data
+
+
+# 7. Worker latar belakang. Satu thread melatih model satu per satu dari antrian, permintaan yang sama
+# untuk versi yang sama tidak diantrikan dua kali. Dipakai bersama semua sesi (st.cache_resource).
+# Model disimpan per token versi data. Token tidak bisa dibandingkan, jadi versi diurutkan menurut
+# kapan pertama kali diminta: pelatihan versi lama yang selesai belakangan tidak menggantikan model versi
+# yang lebih baru. Hanya MODEL_DISIMPAN versi terbaru (model dan status) yang disimpan di memori
+class Forecaster:
+    def __init__(self, folder):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._model = {}
+        self._status = {}
+        self._waktu_gagal = {}
+        self._urutan = {}
+        self._nomor = itertools.count()
+        self._antrian = queue.Queue()
+        self._thread = threading.Thread(target=self._worker, name='forecast-worker', daemon=True)
+        self._thread.start()
+
+    # Nomor urut token (dipanggil di bawah lock), token yang baru pertama kali diminta mendapat nomor terbesar
+    def _order(self, token):
+        if token not in self._urutan:
+            self._urutan[token] = next(self._nomor)
+            while len(self._urutan) > RIWAYAT_VERSI:
+                del self._urutan[next(iter(self._urutan))]
+        return self._urutan[token]
+
+    def _newest(self, model_versi):
+        if not model_versi:
+            return None
+        return model_versi[max(model_versi, key=lambda token: self._urutan.get(token, -1))]
+
+    # Model (seri, measure) untuk versi versi_data dan statusnya: 'antri', 'dilatih', 'siap' atau 'gagal: ...'.
+    # Jika versi ini belum siap, model versi terbaru yang ada tetap dikembalikan sambil versi ini dilatih.
+    # Pelatihan yang gagal diantrikan lagi setelah JEDA_ULANG_GAGAL detik
+    def request(self, versi_data, day_df, hour_df, seri, measure):
+        token = storage.snapshot_token(versi_data)
+        with self._lock:
+            self._order(token)
+            model_versi = self._model.get((seri, measure), {})
+            if token in model_versi:
+                return model_versi[token][0], 'siap'
+            kunci = (seri, measure, token)
+            status = self._status.get(kunci)
+            if status is None or (status.startswith('gagal')
+                                  and time.monotonic() - self._waktu_gagal.get(kunci, 0) >= JEDA_ULANG_GAGAL):
+                status = self._status[kunci] = 'antri'
+                self._antrian.put((token, day_df, hour_df, seri, measure))
+            terbaru = self._newest(model_versi)
+            return (None if terbaru is None else terbaru[0]), status
+
+    def _worker(self):
+        while True:
+            token, day_df, hour_df, seri, measure = self._antrian.get()
+            kunci = (seri, measure, token)
+            with self._lock:
+                self._status[kunci] = 'dilatih'
+                terbaru = self._newest(self._model.get((seri, measure), {}))
+            try:
+                model, data = train(self.folder, token, day_df, hour_df, seri, measure,
+                                    lama=None if terbaru is None else terbaru[1])
+            except Exception as e:
+                with self._lock:
+                    self._status[kunci] = f"gagal: {e}"
+                    self._waktu_gagal[kunci] = time.monotonic()
+                continue
+            with self._lock:
+                self._model.setdefault((seri, measure), {})[token] = (model, data)
+                self._status[kunci] = 'siap'
+                self._prune(seri, measure)
+
+    # Membuang model dan status versi lama (dipanggil di bawah lock). Status yang masih antri/dilatih dipertahankan
+    def _prune(self, seri, measure):
+        model_versi = self._model[(seri, measure)]
+        for token in sorted(model_versi, key=lambda token: self._urutan.get(token, -1))[:-MODEL_DISIMPAN]:
+            del model_versi[token]
+        terbaru = set(list(self._urutan)[-MODEL_DISIMPAN:])
+        for kunci in [kunci for kunci, status in self._status.items()
+                      if kunci[2] not in terbaru and status not in ('antri', 'dilatih')]:
+            del self._status[kunci]
+            self._waktu_gagal.pop(kunci, None)
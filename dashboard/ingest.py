@@ -0,0 +1,136 @@
+import ast
+import threading
+
+import numpy as np
+import pandas as pd
+
+import cleaning
+import cube
+import date_index
+import storage
+
+
+# Dataset yang hidup di memori dan bisa ditambah data per jam baru tanpa memuat ulang CSV.
+# Setiap penambahan hanya membersihkan baris baru dan menghitung ulang baris harian dan kubus untuk
+# tanggal yang tersentuh. Jika folder_snapshot diisi, versi awal dipublikasikan utuh sebagai snapshot
+# Arrow (dibaca kembali lewat memory-map, sehingga proses lain bisa membuka versi yang sama tanpa
+# menyalin data) dan setiap penambahan hanya menulis delta untuk rentang tanggal tersebut
+# (storage.publish_delta), sehingga data yang ditambahkan tetap ada setelah restart (lihat resume).
+# Frame dan kubus tidak pernah diubah di tempat: setiap penambahan membuat objek baru di luar
+# lock pembaca (penulis diserialkan dengan lock tersendiri), lalu hanya referensinya yang ditukar
+# di bawah lock pembaca, sehingga rerun sesi lain tidak menunggu selama penambahan berjalan
+class LiveDataset:
+    def __init__(self, day_df, hour_df, versi_sumber, folder_snapshot=None):
+        self._setup(hour_df, folder_snapshot)
+        frames = {'day_df': day_df, 'hour_df': hour_df,
+                  'kubus_harian': cube.build_cube(day_df, cube.DIMENSI_HARIAN),
+                  'kubus_per_jam': cube.build_cube(hour_df, cube.DIMENSI_PER_JAM)}
+        versi, token = (versi_sumber, 0), None
+        if folder_snapshot is not None:
+            token = storage.publish_snapshot(folder_snapshot, versi, frames)
+            frames = storage.open_snapshot(folder_snapshot, token)
+        self._set(versi, token, frames)
+
+    def _setup(self, hour_df, folder_snapshot):
+        self._lock = threading.Lock()
+        self._kunci_tulis = threading.Lock()
+        self._folder_snapshot = folder_snapshot
+        self._cleaner = cleaning.HourCleaner.from_clean(hour_df)
+
+    def _set(self, versi, token, frames):
+        with self._lock:
+            self.day_df, self.hour_df = frames['day_df'], frames['hour_df']
+            self.kubus_harian, self.kubus_per_jam = frames['kubus_harian'], frames['kubus_per_jam']
+            self.versi, self.token = versi, token
+
+    # Melanjutkan dari snapshot aktif di folder_snapshot jika snapshot itu berasal dari data sumber yang
+    # sama (versi_sumber), termasuk baris per jam yang ditambahkan sebelum proses di-restart.
+    # None jika belum ada snapshot yang cocok (dataset dibuat dari data sumber)
+    @classmethod
+    def resume(cls, versi_sumber, folder_snapshot):
+        aktif = storage.current_snapshot(folder_snapshot)
+        if aktif is None:
+            return None
+        try:
+            versi = ast.literal_eval(aktif['versi'])
+        except (ValueError, SyntaxError):
+            return None
+        if not isinstance(versi, tuple) or len(versi) != 2 or versi[0] != versi_sumber:
+            return None
+        try:
+            frames = storage.open_snapshot(folder_snapshot, aktif['token'])
+        except OSError:
+            return None
+
+        dataset = cls.__new__(cls)
+        dataset._setup(frames['hour_df'], folder_snapshot)
+        dataset._set(versi, aktif['token'], frames)
+        return dataset
+
+    def snapshot(self):
+        with self._lock:
+            return self.versi, self.day_df, self.hour_df, self.kubus_harian, self.kubus_per_jam
+
+    # Lokasi snapshot Arrow untuk versi tertentu (folder, token), None jika tidak dipublikasikan
+    def snapshot_location(self, versi):
+        if self._folder_snapshot is None:
+            return None
+        return self._folder_snapshot, storage.snapshot_token(versi)
+
+    # Menambahkan baris per jam mentah (skema data/hour.csv), mengembalikan jumlah baris bersih yang masuk.
+    # Pembersihan, baris harian, kubus dan delta snapshot hanya dihitung untuk tanggal yang tersentuh
+    # (sebanding dengan baris baru). Frame versi baru di memori tetap disusun dengan satu concat per frame
+    # (salin memori berurutan). Setiap SEGMEN_MAKS delta, versi ditulis utuh agar rantai delta tetap pendek
+    def append_hourly(self, raw):
+        with self._kunci_tulis:
+            versi, day_lama, hour_lama, kubus_harian_lama, kubus_per_jam_lama = self.snapshot()
+
+            # Data feed harus langsung tampil, jadi interpolasi di ujung data tidak ditunda
+            baru = self._cleaner.process(raw, final=True)
+            if baru.empty:
+                return 0
+            baru = storage.prepare_frame(baru)
+
+            # Semua baris per jam di tanggal yang tersentuh (lama + baru), baris harian tanggal tersebut
+            # dihitung ulang dari baris-baris ini
+            tanggal_awal, tanggal_akhir = baru['Tanggal'].min(), baru['Tanggal'].max()
+            jam_terdampak = date_index.ensure_sorted(pd.concat(
+                [date_index.slice_range(hour_lama, tanggal_awal, tanggal_akhir), baru], ignore_index=True))
+            hari_lama = date_index.slice_range(day_lama, tanggal_awal, tanggal_akhir)
+            nomor_awal = int(day_lama['index'].max()) if len(day_lama) else 0
+            hari_baru = storage.prepare_frame(cleaning.derive_daily(jam_terdampak, start_index=nomor_awal))
+            hari_baru['index'] = self._keep_index(hari_lama, hari_baru, nomor_awal)
+            hari_baru = date_index.ensure_sorted(hari_baru)
+
+            delta = {'day_df': hari_baru, 'hour_df': jam_terdampak,
+                     'kubus_harian': cube.build_cube(hari_baru, cube.DIMENSI_HARIAN),
+                     'kubus_per_jam': cube.build_cube(jam_terdampak, cube.DIMENSI_PER_JAM)}
+            lama = {'day_df': day_lama, 'hour_df': hour_lama,
+                    'kubus_harian': kubus_harian_lama, 'kubus_per_jam': kubus_per_jam_lama}
+            self._publish((versi[0], versi[1] + 1), lama, delta, tanggal_awal, tanggal_akhir)
+            return len(baru)
+
+    # Versi baru dipublikasikan di luar lock pembaca, lalu seluruh referensi ditukar sekaligus
+    def _publish(self, versi, lama, delta, tanggal_awal, tanggal_akhir):
+        folder = self._folder_snapshot
+        if folder is not None and storage.delta_depth(folder, self.token) < storage.SEGMEN_MAKS:
+            # Frame versi baru digabung dari versi yang sedang terbuka + delta yang dibaca kembali dari disk,
+            # sama seperti proses lain yang membuka versi ini
+            token = storage.publish_delta(folder, versi, self.token, delta, tanggal_awal, tanggal_akhir)
+            self._set(versi, token, storage.open_snapshot(folder, token, terbuka=(self.token, lama)))
+            return
+
+        frames = {nama: date_index.replace_range(lama[nama], df, tanggal_awal, tanggal_akhir) for nama, df in delta.items()}
+        if folder is None:
+            self._set(versi, None, frames)
+            return
+        token = storage.publish_snapshot(folder, versi, frames)
+        self._set(versi, token, storage.open_snapshot(folder, token))
+
+    @staticmethod
+    def _keep_index(hari_lama, hari_baru, nomor_awal):
+        # Tanggal yang sudah ada tetap memakai nomor index lamanya, tanggal baru melanjutkan nomor terakhir
+        nomor = hari_baru['Tanggal'].map(hari_lama.set_index('Tanggal')['index']).to_numpy(dtype='float64')
+        baru = np.isnan(nomor)
+        nomor[baru] = np.arange(nomor_awal + 1, nomor_awal + 1 + baru.sum())
+        return nomor.astype(hari_baru['index'].dtype)
@@ -0,0 +1,312 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import date
+
+import numpy as np
+import psutil
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+# Load test sesi bersamaan: server Streamlit lokal menjalankan dashboard.py, lalu N klien websocket
+# (pengganti browser) membuka sesi dan bergantian pindah tab, mengubah Filter Tanggal dan selectbox.
+# AppTest tidak bisa dipakai untuk sesi bersamaan karena mengganti Runtime global selama satu run.
+# Hasil: persentil latensi rerun (p50/p95/p99) per jenis aksi, throughput dan memori server per sesi.
+# Exception yang tampil di dashboard selama load test (mis. bug konkurensi antar sesi) membuat
+# exit status bukan nol, sehingga load test bisa dipakai sebagai pemeriksaan di CI.
+# Contoh: python loadtest.py --sesi 1 5 20 --aksi 30
+
+# Batas ukuran satu pesan websocket (tabel dan spec figur bisa besar)
+MAKS_PESAN = 200 * 1024 * 1024
+
+# Widget yang diubah klien, dikenali dari key widget di dashboard.py
+KEY_VIEW = 'view_aktif'
+PREFIX_TANGGAL = 'date_filter_'
+PREFIX_PILIHAN = 'select_filter_'
+
+# Statistik cache yang ditampilkan di sidebar (mis. "Hit: 10 | Miss: 2 | Hit rate: 83%")
+POLA_CACHE = re.compile(r'^(Figur - )?Hit: (\d+) \| Miss: (\d+)')
+
+# Status akhir run skrip penuh. FINISHED_EARLY_FOR_RERUN (run disela rerun lain) tidak dihitung selesai
+SELESAI = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+
+def _widget_key(id_widget):
+    # ID widget Streamlit: $$ID-<hash>-<key>
+    return id_widget.split('-', 2)[-1]
+
+
+# 1. Satu sesi klien: mengirim BackMsg rerun_script dengan state widget, membaca ForwardMsg sampai script_finished
+class Session:
+    def __init__(self, url, rng):
+        self.url = url
+        self.rng = rng
+        self.ws = None
+        self.page_script_hash = ''
+        self.widget = {}
+        self.state = {}
+        self.cache_pesan = {}
+        self.latensi = []
+        self.error = 0
+        self.statistik_cache = {}
+
+    async def connect(self):
+        self.ws = await websocket_connect(self.url.replace('http', 'ws', 1) + '/_stcore/stream',
+                                          max_message_size=MAKS_PESAN)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    async def rerun(self, aksi):
+        client_state = ClientState(query_string='', page_script_hash=self.page_script_hash)
+        # Seperti browser, hanya state widget yang tampil di run terakhir yang dikirim
+        for id_widget, state in self.state.items():
+            if id_widget in self.widget:
+                client_state.widget_states.widgets.append(state)
+
+        mulai = time.perf_counter()
+        await self.ws.write_message(BackMsg(rerun_script=client_state).SerializeToString(), binary=True)
+        self.widget = {}
+        # Rerun ini adalah run skrip penuh pertama yang dimulai setelah permintaan dikirim (new_session tanpa
+        # fragment_ids_this_run). Run fragment (mis. tunggu_model dengan run_every) juga mengirim new_session
+        # dan script_finished, jadi pesan dan script_finished miliknya diabaikan
+        id_run = run_aktif = None
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise ConnectionError('Koneksi websocket ke server terputus')
+            pesan = ForwardMsg()
+            pesan.ParseFromString(data)
+            jenis = pesan.WhichOneof('type')
+            if jenis == 'ref_hash':
+                # Pesan yang sudah pernah dikirim ke sesi ini hanya dikirim ulang sebagai hash
+                pesan = self.cache_pesan.get(pesan.ref_hash, pesan)
+                jenis = pesan.WhichOneof('type')
+            elif pesan.metadata.cacheable:
+                self.cache_pesan[pesan.hash] = pesan
+
+            if jenis == 'new_session':
+                run_aktif = pesan.new_session.script_run_id
+                if id_run is None and not pesan.new_session.fragment_ids_this_run:
+                    id_run = run_aktif
+                    self.page_script_hash = pesan.new_session.page_script_hash
+            elif id_run is None or run_aktif != id_run:
+                continue
+            elif jenis == 'delta' and pesan.delta.WhichOneof('type') == 'new_element':
+                self._read_element(pesan.delta.new_element)
+            elif jenis == 'script_finished' and pesan.script_finished in SELESAI:
+                break
+
+        self.latensi.append((aksi, time.perf_counter() - mulai))
+
+    def _read_element(self, elemen):
+        jenis = elemen.WhichOneof('type')
+        if jenis in ('radio', 'selectbox', 'date_input'):
+            proto = getattr(elemen, jenis)
+            self.widget[proto.id] = (jenis, proto)
+        elif jenis == 'exception':
+            self.error += 1
+        elif jenis == 'markdown':
+            cocok = POLA_CACHE.match(elemen.markdown.body)
+            if cocok:
+                self.statistik_cache['figur' if cocok.group(1) else 'agregasi'] = (int(cocok.group(2)), int(cocok.group(3)))
+
+    # 2. Aksi acak pengguna: pindah tab, ubah Filter Tanggal atau ubah selectbox filter
+    def _candidates(self):
+        kandidat = {'pindah tab': [], 'filter tanggal': [], 'pilihan': []}
+        for id_widget, (jenis, proto) in self.widget.items():
+            key = _widget_key(id_widget)
+            if jenis == 'radio' and key == KEY_VIEW:
+                kandidat['pindah tab'].append(id_widget)
+            elif jenis == 'date_input' and key.startswith(PREFIX_TANGGAL):
+                kandidat['filter tanggal'].append(id_widget)
+            elif jenis == 'selectbox' and key.startswith(PREFIX_PILIHAN):
+                kandidat['pilihan'].append(id_widget)
+        return {aksi: daftar for aksi, daftar in kandidat.items() if daftar}
+
+    def random_action(self):
+        kandidat = self._candidates()
+        if not kandidat:
+            return 'rerun'
+        aksi = self.rng.choice(sorted(kandidat))
+        id_widget = self.rng.choice(kandidat[aksi])
+        _, proto = self.widget[id_widget]
+        state = WidgetState(id=id_widget)
+        if aksi == 'filter tanggal':
+            awal, akhir = (date.fromisoformat(nilai.replace('/', '-')) for nilai in (proto.min, proto.max))
+            hari = np.sort(self.rng.integers(0, (akhir - awal).days + 1, 2))
+            state.string_array_value.data.extend(
+                [date.fromordinal(awal.toordinal() + int(n)).strftime('%Y/%m/%d') for n in hari])
+        else:
+            state.int_value = int(self.rng.integers(0, len(proto.options)))
+        self.state[id_widget] = state
+        return aksi
+
+    async def run(self, jumlah_aksi, jeda):
+        await self.connect()
+        await self.rerun('buka sesi')
+        for _ in range(jumlah_aksi):
+            if jeda:
+                await asyncio.sleep(self.rng.uniform(0, 2 * jeda))
+            await self.rerun(self.random_action())
+
+
+# 3. Server Streamlit lokal untuk dashboard.py
+def _free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_server(folder_dashboard, port, log=None):
+    perintah = [sys.executable, '-m', 'streamlit', 'run', 'dashboard.py',
+                '--server.headless', 'true', '--server.port', str(port), '--server.address', '127.0.0.1',
+                '--server.fileWatcherType', 'none', '--browser.gatherUsageStats', 'false']
+    keluaran = open(log, 'w') if log else subprocess.DEVNULL
+    return subprocess.Popen(perintah, cwd=folder_dashboard, stdout=keluaran, stderr=subprocess.STDOUT)
+
+
+def wait_until_healthy(url, batas_detik=60):
+    batas = time.time() + batas_detik
+    while time.time() < batas:
+        try:
+            with urllib.request.urlopen(url + '/_stcore/health', timeout=1) as respons:
+                if respons.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f'Server {url} tidak siap dalam {batas_detik} detik')
+
+
+# RSS server (termasuk proses anak, mis. worker process pool) dalam byte
+def server_rss(pid):
+    if pid is None:
+        return None
+    proses = psutil.Process(pid)
+    return proses.memory_info().rss + sum(anak.memory_info().rss for anak in proses.children(recursive=True))
+
+
+# 4. Ringkasan latensi per jenis aksi
+def summarize(latensi):
+    waktu_ms = np.asarray(latensi) * 1000
+    p50, p95, p99 = np.percentile(waktu_ms, [50, 95, 99])
+    return {'n': len(waktu_ms), 'p50_ms': round(float(p50), 1), 'p95_ms': round(float(p95), 1),
+            'p99_ms': round(float(p99), 1), 'maks_ms': round(float(waktu_ms.max()), 1)}
+
+
+async def run_level(url, pid, jumlah_sesi, jumlah_aksi, jeda, seed):
+    rss_awal = server_rss(pid)
+    sesi = [Session(url, np.random.default_rng([seed, jumlah_sesi, nomor])) for nomor in range(jumlah_sesi)]
+    mulai = time.perf_counter()
+    try:
+        await asyncio.gather(*(item.run(jumlah_aksi, jeda) for item in sesi))
+        durasi = time.perf_counter() - mulai
+        rss_akhir = server_rss(pid)
+    finally:
+        for item in sesi:
+            item.close()
+
+    semua = [(aksi, detik) for item in sesi for aksi, detik in item.latensi]
+    per_aksi = {'semua': summarize([detik for _, detik in semua])}
+    for aksi in sorted({aksi for aksi, _ in semua}):
+        per_aksi[aksi] = summarize([detik for nama, detik in semua if nama == aksi])
+
+    hasil = {
+        'sesi': jumlah_sesi,
+        'rerun': len(semua),
+        'durasi_s': round(durasi, 2),
+        'throughput_rerun_per_s': round(len(semua) / durasi, 2),
+        'error': sum(item.error for item in sesi),
+        'latensi': per_aksi,
+        'cache': sesi[-1].statistik_cache,
+    }
+    if rss_awal is not None:
+        hasil['rss_awal_mb'] = round(rss_awal / 1024 / 1024, 1)
+        hasil['rss_akhir_mb'] = round(rss_akhir / 1024 / 1024, 1)
+        hasil['memori_per_sesi_mb'] = round((rss_akhir - rss_awal) / jumlah_sesi / 1024 / 1024, 2)
+    return hasil
+
+
+def print_report(laporan):
+    for level in laporan:
+        memori = ''
+        if 'rss_akhir_mb' in level:
+            memori = (f", RSS {level['rss_awal_mb']:.1f} -> {level['rss_akhir_mb']:.1f} MB"
+                      f" ({level['memori_per_sesi_mb']:.2f} MB/sesi)")
+        cache = ', '.join(f"cache {nama} hit {hit}/{hit + miss}" for nama, (hit, miss) in sorted(level['cache'].items()))
+        print(f"\n{level['sesi']} sesi: {level['rerun']} rerun dalam {level['durasi_s']:.1f} s, "
+              f"{level['throughput_rerun_per_s']:.1f} rerun/s, {level['error']} error{memori}" + (f"\n  {cache}" if cache else ''))
+        print(f"  {'aksi':<16} {'n':>6} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'maks ms':>10}")
+        for aksi, ringkasan in level['latensi'].items():
+            print(f"  {aksi:<16} {ringkasan['n']:>6} {ringkasan['p50_ms']:>10.1f} {ringkasan['p95_ms']:>10.1f} "
+                  f"{ringkasan['p99_ms']:>10.1f} {ringkasan['maks_ms']:>10.1f}")
+
+
+async def run(args, url, pid):
+    # Sesi pemanasan: data dimuat dan kubus dibangun sekali sebelum pengukuran
+    pemanasan = Session(url, np.random.default_rng(args.seed))
+    await pemanasan.connect()
+    await pemanasan.rerun('buka sesi')
+    pemanasan.close()
+    print(f"Sesi pertama (server dingin): {pemanasan.latensi[0][1] * 1000:.0f} ms")
+
+    laporan = []
+    for jumlah_sesi in args.sesi:
+        laporan.append(await run_level(url, pid, jumlah_sesi, args.aksi, args.jeda, args.seed))
+    return laporan, pemanasan.error
+
+
+def main(argv=None):
+    folder_dashboard = os.path.dirname(os.path.abspath(__file__))
+
+    parser = argparse.ArgumentParser(description='Load test sesi dashboard bersamaan lewat websocket Streamlit.')
+    parser.add_argument('--sesi', type=int, nargs='+', default=[1, 5, 10], help='Jumlah sesi bersamaan per tingkat, mis. --sesi 1 10 50')
+    parser.add_argument('--aksi', type=int, default=20, help='Jumlah aksi (rerun) per sesi setelah sesi dibuka')
+    parser.add_argument('--jeda', type=float, default=0.0, help='Rata-rata jeda berpikir antar aksi (detik)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--url', help='Server yang sudah berjalan (mis. http://localhost:8501), default: jalankan server lokal baru')
+    parser.add_argument('--pid', type=int, help='PID server untuk --url, agar memori server bisa diukur')
+    parser.add_argument('--log-server', help='Simpan log server lokal ke file ini')
+    parser.add_argument('--output', help='Simpan hasil sebagai JSON (mis. untuk dibandingkan dengan baseline)')
+    args = parser.parse_args(argv)
+
+    server = None
+    if args.url:
+        url, pid = args.url.rstrip('/'), args.pid
+    else:
+        port = _free_port()
+        server = start_server(folder_dashboard, port, args.log_server)
+        url, pid = f'http://127.0.0.1:{port}', server.pid
+    try:
+        wait_until_healthy(url)
+        laporan, error_pemanasan = asyncio.run(run(args, url, pid))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    print_report(laporan)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(laporan, f, indent=2)
+
+    jumlah_error = error_pemanasan + sum(level['error'] for level in laporan)
+    if jumlah_error:
+        print(f"GAGAL: {jumlah_error} exception saat rerun (lihat log server, --log-server)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+import cube
+import date_index
+import storage
+
+# Roll-up map-reduce di process pool. Kubus dipartisi per tahun/bulan, setiap worker menghitung
+# jumlah parsial partisinya langsung dari snapshot Arrow yang di-memory-map (storage.open_snapshot),
+# sehingga data tidak perlu di-pickle ke worker. Jumlah parsial lalu dijumlahkan di langkah reduce.
+# Di bawah BATAS_PARALEL baris, atau jika hanya ada satu core, roll-up dijalankan serial
+
+# Jumlah baris minimum agar biaya kirim tugas dan gabung hasil sebanding dengan keuntungannya
+BATAS_PARALEL = 2_000_000
+
+# Jumlah worker (default: semua core)
+JUMLAH_WORKER = os.cpu_count() or 1
+
+_pool = None
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        # spawn: aman dipakai dari proses server yang multi-thread (Streamlit/tornado)
+        _pool = ProcessPoolExecutor(max_workers=JUMLAH_WORKER, mp_context=multiprocessing.get_context('spawn'))
+    return _pool
+
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+# 1. Partisi per tahun/bulan: daftar (awal, akhir) tanggal setiap bulan di dalam rentang
+def month_partitions(start_date, end_date):
+    awal_bulan = pd.date_range(start_date.to_period('M').to_timestamp(), end_date, freq='MS')
+    return [(max(awal, start_date), min(awal + pd.offsets.MonthEnd(0), end_date)) for awal in awal_bulan]
+
+
+# 2. Map: jumlah parsial satu partisi, dijalankan di worker.
+# Snapshot terakhir yang dibuka disimpan per proses worker
+_snapshot_worker = {}
+
+
+def _open_worker_snapshot(folder, token):
+    if token not in _snapshot_worker:
+        _snapshot_worker.clear()
+        _snapshot_worker[token] = storage.open_snapshot(folder, token)
+    return _snapshot_worker[token]
+
+
+def _map_partitions(folder, token, nama, partisi, by, measures, where):
+    kubus = _open_worker_snapshot(folder, token)[nama]
+    parsial = []
+    for awal, akhir in partisi:
+        potongan = date_index.slice_range(kubus, awal, akhir)
+        for kolom, nilai in where.items():
+            potongan = potongan[potongan[kolom].isin(nilai)]
+        parsial.append(potongan.groupby(by, observed=True)[measures].sum())
+    return pd.concat(parsial) if parsial else None
+
+
+# 3. Reduce: menjumlahkan hasil parsial per kunci dimensi
+def reduce_partials(parsial, by, measures):
+    parsial = [item for item in parsial if item is not None]
+    gabungan = pd.concat(parsial)
+    return gabungan.groupby(level=list(range(len(by))), observed=True)[measures].sum().reset_index()
+
+
+# 4. Roll-up kubus (hasil sama dengan cube.rollup). kubus harus berupa potongan rentang tanggal
+# (date_index.slice_range) dari kubus bernama `nama` di snapshot lokasi_snapshot = (folder, token).
+# Tanpa lokasi snapshot roll-up selalu serial.
+# mode: 'auto' memilih berdasarkan jumlah baris, 'serial' atau 'paralel' untuk memaksa
+def rollup(kubus, by, measures='Total', where=None, nama=None, lokasi_snapshot=None, mode='auto'):
+    if mode == 'auto':
+        paralel = lokasi_snapshot is not None and JUMLAH_WORKER > 1 and len(kubus) >= BATAS_PARALEL
+    else:
+        paralel = mode == 'paralel' and lokasi_snapshot is not None
+    if not paralel or kubus.empty:
+        return cube.rollup(kubus, by, measures=measures, where=where)
+
+    by_list = [by] if isinstance(by, str) else list(by)
+    measures_list = [measures] if isinstance(measures, str) else list(measures)
+    start_date, end_date = date_index.date_bounds(kubus)
+    partisi = month_partitions(start_date, end_date)
+
+    # Bulan-bulan dibagi rata ke worker (beberapa tugas per worker agar beban seimbang)
+    jumlah_tugas = min(len(partisi), JUMLAH_WORKER * 4)
+    tugas = [partisi[i::jumlah_tugas] for i in range(jumlah_tugas)]
+    folder, token = lokasi_snapshot
+    futures = [_get_pool().submit(_map_partitions, folder, token, nama, bagian, by_list, measures_list, where or {})
+               for bagian in tugas]
+    return reduce_partials([future.result() for future in futures], by_list, measures_list)
@@ -0,0 +1,279 @@
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+
+import charts
+import date_index
+import ingest
+import parallel
+import startup
+import storage
+
+# plotly.io hanya diimpor saat grafik pertama diserialisasi
+pio = startup.LazyModule('plotly.io')
+
+# Pre-render batch: grafik setiap view dan pilihan 'Filter Berdasarkan' (charts.VIEW) untuk daftar
+# rentang tanggal dihitung paralel di process pool. Setiap worker membaca snapshot Arrow yang
+# di-memory-map (storage.open_snapshot), lalu menulis spec JSON figur Plotly dan halaman HTML statis.
+# manifest.json mencatat versi data (token snapshot) dan isi batch. Dashboard menampilkan snapshot
+# yang cocok dengan grafik, rentang tanggal dan versi datanya, selain itu grafik dihitung live.
+# Contoh: python prerender.py --rentang penuh 2012-01-01:2012-12-31
+
+FOLDER_PRERENDER = 'prerender'
+# Snapshot milik pre-render saat belum ada snapshot bersama untuk versi data CSV saat ini
+FOLDER_SNAPSHOT_PRIVAT = 'prerender_snapshot'
+MANIFEST = 'manifest.json'
+
+# Nama folder hasil satu versi data (storage.snapshot_token)
+POLA_TOKEN = re.compile(r'^[0-9a-f]{16}$')
+
+
+def prerender_folder(csv_path):
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), storage.FOLDER_CACHE, FOLDER_PRERENDER)
+
+
+def entry_key(nama_grafik, start_date, end_date):
+    return f"{nama_grafik}|{pd.Timestamp(start_date).date().isoformat()}|{pd.Timestamp(end_date).date().isoformat()}"
+
+
+def _write_atomic(path, teks):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(teks)
+    os.replace(tmp, path)
+
+
+def load_manifest(folder):
+    path = os.path.join(folder, MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+# 1. Sumber data: snapshot aktif (CURRENT.json) jika berasal dari CSV saat ini, termasuk baris per jam
+# yang sudah ditambahkan dashboard/API, atau snapshot versi awal CSV. Snapshot bersama hanya dibaca,
+# CURRENT.json tidak pernah diganti. Jika keduanya tidak ada, data dimuat dari CSV dan snapshot versi
+# awalnya dipublikasikan ke folder privat pre-render
+def load_source(folder_data):
+    day_path = os.path.join(folder_data, 'day_df_cleaned.csv')
+    hour_path = os.path.join(folder_data, 'hour_df_cleaned.csv')
+    folder_snapshot = storage.snapshot_folder(hour_path)
+    folder_privat = os.path.join(os.path.dirname(folder_snapshot), FOLDER_SNAPSHOT_PRIVAT)
+    versi_sumber = (storage.source_signature(day_path), storage.source_signature(hour_path))
+
+    aktif = storage.current_snapshot(folder_snapshot)
+    # versi snapshot: repr((versi_sumber, jumlah penambahan))
+    if (aktif is not None and aktif['versi'].startswith(f"({versi_sumber!r}, ")
+            and os.path.isdir(os.path.join(folder_snapshot, aktif['token']))):
+        return folder_snapshot, aktif['token']
+
+    token = storage.snapshot_token((versi_sumber, 0))
+    for folder in (folder_snapshot, folder_privat):
+        if os.path.isdir(os.path.join(folder, token)):
+            return folder, token
+
+    day_df = date_index.ensure_sorted(storage.load_frame(day_path))
+    hour_df = date_index.ensure_sorted(storage.load_frame(hour_path))
+    ingest.LiveDataset(day_df, hour_df, versi_sumber, folder_snapshot=folder_privat)
+    return folder_privat, token
+
+
+# 2. Rentang tanggal 'AWAL:AKHIR' (YYYY-MM-DD) atau 'penuh' (seluruh data, default filter dashboard)
+def parse_range(teks, tanggal_min, tanggal_max):
+    if teks == 'penuh':
+        return tanggal_min, tanggal_max
+    awal, sep, akhir = teks.partition(':')
+    if not sep:
+        raise ValueError(f"Rentang tidak valid: {teks!r} (format AWAL:AKHIR atau 'penuh')")
+    start_date, end_date = pd.Timestamp(awal), pd.Timestamp(akhir)
+    if start_date > end_date:
+        raise ValueError(f"Rentang tidak valid: {teks!r} (AWAL setelah AKHIR)")
+    return max(start_date, tanggal_min), min(end_date, tanggal_max)
+
+
+def batch_items(judul_views, rentang):
+    item = []
+    for judul in judul_views:
+        if judul not in charts.VIEW:
+            raise ValueError(f"View tidak dikenal: {judul!r} (pilihan: {list(charts.VIEW)})")
+        for pilihan, nama_grafik in charts.VIEW[judul].items():
+            for start_date, end_date in rentang:
+                item.append({'view': judul, 'pilihan': pilihan, 'grafik': nama_grafik,
+                             'start_date': start_date.date().isoformat(), 'end_date': end_date.date().isoformat()})
+    return item
+
+
+# 3. Worker: agregasi, figur, spec JSON dan HTML satu grafik.
+# Snapshot terakhir yang dibuka disimpan per proses worker
+_snapshot_worker = {}
+
+
+def _open_worker_snapshot(folder, token):
+    if token not in _snapshot_worker:
+        _snapshot_worker.clear()
+        _snapshot_worker[token] = storage.open_snapshot(folder, token)
+    return _snapshot_worker[token]
+
+
+# Template figur (dashboard, HTML). Spec untuk dashboard memakai tema Streamlit seperti figur live
+# (warna sementara yang diganti frontend sesuai tema), HTML statis memakai template bawaan Plotly
+@lru_cache(maxsize=None)
+def figure_templates():
+    bawaan = pio.templates.default
+    try:
+        from streamlit.elements.lib.streamlit_plotly_theme import configure_streamlit_plotly_theme
+    except ImportError:
+        return bawaan, bawaan
+    configure_streamlit_plotly_theme()
+    return 'streamlit', bawaan
+
+
+def _build_figure(nama_grafik, data, template):
+    pio.templates.default = template
+    return charts.figure(nama_grafik, data)
+
+
+def render_item(folder_snapshot, token, folder_output, item, plotlyjs='cdn'):
+    t_awal = time.perf_counter()
+    frames = _open_worker_snapshot(folder_snapshot, token)
+    start_date, end_date = pd.Timestamp(item['start_date']), pd.Timestamp(item['end_date'])
+    data = charts.chart_data(item['grafik'], frames['kubus_harian'], frames['kubus_per_jam'], frames['day_df'],
+                             start_date, end_date)
+    template_dashboard, template_html = figure_templates()
+
+    nama_file = f"{item['grafik']}_{start_date:%Y%m%d}_{end_date:%Y%m%d}"
+    _write_atomic(os.path.join(folder_output, token, f"{nama_file}.json"),
+                  pio.to_json(_build_figure(item['grafik'], data, template_dashboard), validate=False))
+    _write_atomic(os.path.join(folder_output, token, f"{nama_file}.html"),
+                  pio.to_html(_build_figure(item['grafik'], data, template_html), include_plotlyjs=plotlyjs, full_html=True))
+    return {**item, 'json': f"{token}/{nama_file}.json", 'html': f"{token}/{nama_file}.html",
+            'durasi_ms': round((time.perf_counter() - t_awal) * 1000, 1)}
+
+
+# 4. Menjalankan batch di process pool, lalu menulis manifest. Entri batch sebelumnya untuk versi
+# data yang sama dipertahankan (ditimpa jika grafik dan rentangnya sama). Dari versi lain hanya folder
+# token yang tercatat di manifest sebelumnya yang dihapus, folder lain di output tidak pernah disentuh
+def run_batch(folder_snapshot, token, folder_output, item, jumlah_worker=parallel.JUMLAH_WORKER, plotlyjs='cdn'):
+    os.makedirs(os.path.join(folder_output, token), exist_ok=True)
+    manifest_lama = load_manifest(folder_output)
+    if manifest_lama is not None and manifest_lama.get('token') == token:
+        manifest = manifest_lama
+    else:
+        manifest = {'token': token, 'entri': {}}
+
+    hasil, gagal = [], []
+    # spawn: sama seperti parallel.py, worker tidak mewarisi state proses induk
+    with ProcessPoolExecutor(max_workers=max(1, min(jumlah_worker, len(item))),
+                             mp_context=multiprocessing.get_context('spawn')) as pool:
+        futures = {pool.submit(render_item, folder_snapshot, token, folder_output, bagian, plotlyjs): bagian for bagian in item}
+        for future in as_completed(futures):
+            try:
+                hasil.append(future.result())
+            except Exception as e:
+                gagal.append((futures[future], e))
+
+    for entri in hasil:
+        manifest['entri'][entry_key(entri['grafik'], entri['start_date'], entri['end_date'])] = entri
+    manifest['dibuat'] = datetime.now().isoformat(timespec='seconds')
+    _write_atomic(os.path.join(folder_output, MANIFEST), json.dumps(manifest, indent=1, ensure_ascii=False))
+
+    token_lama = manifest_lama.get('token') if manifest_lama is not None else None
+    if token_lama != token and isinstance(token_lama, str) and POLA_TOKEN.match(token_lama):
+        shutil.rmtree(os.path.join(folder_output, token_lama), ignore_errors=True)
+    return hasil, gagal
+
+
+# 5. Indeks snapshot untuk dashboard. Manifest dibaca ulang saat file-nya berubah (batch baru),
+# spec yang sudah dibaca disimpan di memori sampai manifest berganti
+class PrerenderIndex:
+    def __init__(self, folder):
+        self.folder = folder
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._manifest = None
+        self._spec = {}
+
+    def _refresh(self):
+        try:
+            mtime = os.stat(os.path.join(self.folder, MANIFEST)).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self._mtime:
+            try:
+                manifest = load_manifest(self.folder)
+            except (OSError, ValueError):
+                manifest = None
+            self._mtime, self._manifest, self._spec = mtime, manifest, {}
+        return self._manifest
+
+    # Spec JSON figur untuk grafik, rentang tanggal dan token versi data, None jika tidak ada snapshot
+    def spec(self, token, nama_grafik, start_date, end_date):
+        with self._lock:
+            manifest = self._refresh()
+            if manifest is None or manifest.get('token') != token:
+                return None
+            kunci = entry_key(nama_grafik, start_date, end_date)
+            entri = manifest['entri'].get(kunci)
+            if entri is None:
+                return None
+            if kunci not in self._spec:
+                try:
+                    with open(os.path.join(self.folder, entri['json']), encoding='utf-8') as f:
+                        self._spec[kunci] = f.read()
+                except OSError:
+                    return None
+            return self._spec[kunci]
+
+    def count(self, token):
+        with self._lock:
+            manifest = self._refresh()
+            return len(manifest['entri']) if manifest is not None and manifest.get('token') == token else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Pre-render batch grafik dashboard (spec JSON + HTML statis + manifest).')
+    parser.add_argument('--data-dir', default=os.path.dirname(os.path.abspath(__file__)), help='Folder day_df_cleaned.csv dan hour_df_cleaned.csv')
+    parser.add_argument('--rentang', nargs='+', default=['penuh'], help="Rentang tanggal AWAL:AKHIR (YYYY-MM-DD) atau 'penuh', default: penuh")
+    parser.add_argument('--view', nargs='+', default=list(charts.VIEW), help='Judul view, default: semua view (semua pilihan filternya)')
+    parser.add_argument('--output-dir', help='Folder hasil, default: folder yang dibaca dashboard (.cache/prerender)')
+    parser.add_argument('--worker', type=int, default=parallel.JUMLAH_WORKER, help='Jumlah proses worker')
+    parser.add_argument('--html-mandiri', action='store_true', help='Sertakan plotly.js di setiap HTML (bisa dibuka offline), default: dari CDN')
+    args = parser.parse_args(argv)
+
+    folder_snapshot, token = load_source(args.data_dir)
+    kubus_harian = storage.open_snapshot(folder_snapshot, token)['kubus_harian']
+    tanggal_min, tanggal_max = date_index.date_bounds(kubus_harian)
+    try:
+        rentang = [parse_range(teks, tanggal_min, tanggal_max) for teks in args.rentang]
+        item = batch_items(args.view, rentang)
+    except ValueError as e:
+        parser.error(str(e))
+
+    folder_output = args.output_dir or prerender_folder(os.path.join(args.data_dir, 'hour_df_cleaned.csv'))
+    t_awal = time.perf_counter()
+    hasil, gagal = run_batch(folder_snapshot, token, folder_output, item, jumlah_worker=args.worker,
+                             plotlyjs=True if args.html_mandiri else 'cdn')
+
+    print(f"Pre-render versi data {token}: {len(hasil)} grafik dalam {time.perf_counter() - t_awal:.1f} s "
+          f"({args.worker} worker) -> {os.path.join(folder_output, MANIFEST)}")
+    for entri in sorted(hasil, key=lambda entri: (entri['view'], entri['start_date'], entri['grafik'])):
+        print(f"  {entri['view']:<30} {str(entri['pilihan'] or '-'):<12} {entri['start_date']} - {entri['end_date']} {entri['durasi_ms']:8.1f} ms")
+    for bagian, e in gagal:
+        print(f"  GAGAL {bagian['grafik']} {bagian['start_date']} - {bagian['end_date']}: {e}", file=sys.stderr)
+    return 1 if gagal else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
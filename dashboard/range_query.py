@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+# Query rentang tanggal O(1) di atas data harian: jumlah dan rata-rata dari prefix sum,
+# nilai maksimum dari sparse table. Data harian harus terurut per Tanggal (date_index.ensure_sorted)
+
+KOLOM = ['Total', 'Member', 'Non_member']
+
+
+# 1. Sparse table: level k berisi maksimum setiap jendela 2^k baris
+def _sparse_table(nilai):
+    tabel = [nilai]
+    lebar = 1
+    while lebar * 2 <= len(nilai):
+        sebelumnya = tabel[-1]
+        tabel.append(np.maximum(sebelumnya[:-lebar], sebelumnya[lebar:]))
+        lebar *= 2
+    return tabel
+
+
+class RangeEngine:
+    def __init__(self, day_df, kolom=KOLOM):
+        self.tanggal = day_df['Tanggal'].to_numpy()
+        self._prefix = {}
+        self._sparse = {}
+        for nama in kolom:
+            nilai = day_df[nama].to_numpy(dtype='int64')
+            self._prefix[nama] = np.concatenate([[0], np.cumsum(nilai)])
+            self._sparse[nama] = _sparse_table(nilai)
+
+    # 2. Posisi [awal, akhir) untuk rentang tanggal [start_date, end_date] (binary search)
+    def _positions(self, start_date, end_date):
+        awal = np.searchsorted(self.tanggal, np.datetime64(pd.Timestamp(start_date)), side='left')
+        akhir = np.searchsorted(self.tanggal, np.datetime64(pd.Timestamp(end_date)), side='right')
+        return int(awal), int(max(awal, akhir))
+
+    def count(self, start_date, end_date):
+        awal, akhir = self._positions(start_date, end_date)
+        return akhir - awal
+
+    def total(self, kolom, start_date, end_date):
+        awal, akhir = self._positions(start_date, end_date)
+        return int(self._prefix[kolom][akhir] - self._prefix[kolom][awal])
+
+    def mean(self, kolom, start_date, end_date):
+        awal, akhir = self._positions(start_date, end_date)
+        if akhir == awal:
+            return None
+        return float(self._prefix[kolom][akhir] - self._prefix[kolom][awal]) / (akhir - awal)
+
+    def max(self, kolom, start_date, end_date):
+        awal, akhir = self._positions(start_date, end_date)
+        if akhir == awal:
+            return None
+        # Dua jendela 2^k yang saling tumpang tindih menutupi seluruh rentang
+        k = (akhir - awal).bit_length() - 1
+        tabel = self._sparse[kolom][k]
+        return int(max(tabel[awal], tabel[akhir - (1 << k)]))
+
+    # 3. Ringkasan satu periode: jumlah hari, lalu total/rata-rata/maksimum setiap kolom
+    def summary(self, start_date, end_date):
+        hasil = {'hari': self.count(start_date, end_date)}
+        for kolom in self._prefix:
+            hasil[kolom] = {
+                'total': self.total(kolom, start_date, end_date),
+                'mean': self.mean(kolom, start_date, end_date),
+                'max': self.max(kolom, start_date, end_date),
+            }
+        return hasil
+
+
+# 4. Periode yang sama satu tahun sebelumnya
+def previous_year(start_date, end_date):
+    return start_date - pd.DateOffset(years=1), end_date - pd.DateOffset(years=1)
+
+
+# Label periode: tahun saja jika periode tepat satu tahun kalender
+def period_label(start_date, end_date):
+    if start_date.year == end_date.year and (start_date.month, start_date.day) == (1, 1) \
+            and (end_date.month, end_date.day) == (12, 31):
+        return str(start_date.year)
+    return f"{start_date:%d/%m/%Y} - {end_date:%d/%m/%Y}"
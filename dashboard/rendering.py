@@ -0,0 +1,73 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+# Batas jumlah titik scatter yang dikirim ke browser, di atas batas ini data di-downsample
+MAX_TITIK_SCATTER = 5000
+
+# Di atas batas ini scatter digambar dengan WebGL (Scattergl) alih-alih SVG
+BATAS_WEBGL = 1000
+
+# Pilihan jumlah baris per halaman tabel detail
+UKURAN_HALAMAN = [25, 50, 100, 500]
+
+
+# 1. Largest-Triangle-Three-Buckets: memilih n_out titik yang paling menjaga bentuk kurva.
+# x harus sudah terurut naik
+def lttb_indices(x, y, n_out):
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    lebar = (n - 2) / (n_out - 2)
+    indeks = np.empty(n_out, dtype='int64')
+    indeks[0], indeks[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        awal = int(i * lebar) + 1
+        akhir = int((i + 1) * lebar) + 1
+        berikut_akhir = min(int((i + 2) * lebar) + 1, n)
+
+        # Titik rata-rata bucket berikutnya sebagai titik ketiga segitiga
+        rata_x = x[akhir:berikut_akhir].mean()
+        rata_y = y[akhir:berikut_akhir].mean()
+
+        luas = np.abs((x[a] - rata_x) * (y[awal:akhir] - y[a]) - (x[a] - x[awal:akhir]) * (rata_y - y[a]))
+        a = awal + int(luas.argmax())
+        indeks[i + 1] = a
+
+    return indeks
+
+
+# 2. Downsample data scatter. Jika ada kolom warna, setiap kelompok mendapat jatah titik
+# sebanding dengan ukurannya, agar kategori kecil tidak hilang dari grafik
+def downsample_scatter(df, x, y, color=None, max_points=MAX_TITIK_SCATTER):
+    if len(df) <= max_points:
+        return df
+
+    kelompok = [df] if color is None else [g for _, g in df.groupby(color, observed=True)]
+    hasil = []
+    for g in kelompok:
+        jatah = max(3, math.ceil(max_points * len(g) / len(df)))
+        g = g.sort_values(x, kind='stable')
+        hasil.append(g.iloc[lttb_indices(g[x].to_numpy(), g[y].to_numpy(), jatah)])
+
+    return pd.concat(hasil)
+
+
+def scatter_render_mode(jumlah_titik):
+    return 'webgl' if jumlah_titik > BATAS_WEBGL else 'svg'
+
+
+# 3. Paginasi di sisi server: hanya baris di halaman yang tampil yang dikirim ke browser
+def page_count(jumlah_baris, ukuran_halaman):
+    return max(1, math.ceil(jumlah_baris / ukuran_halaman))
+
+
+def paginate(df, halaman, ukuran_halaman):
+    awal = (halaman - 1) * ukuran_halaman
+    return df.iloc[awal:awal + ukuran_halaman]
@@ -0,0 +1,324 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+import date_index
+
+# Urutan kategori untuk setiap kolom kategorikal (disimpan sebagai ordered categorical)
+URUTAN_KATEGORI = {
+    'Musim': ['Musim Dingin', 'Musim Semi', 'Musim Panas', 'Musim Gugur'],
+    'Bulan': ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni',
+              'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember'],
+    'Hari': ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Minggu'],
+    'Libur': ['Tidak', 'Ya'],
+    'Kerja': ['Tidak', 'Ya'],
+    'Cuaca': ['Cerah/Berawan', 'Kabut/Berawan', 'Hujan/Salju Ringan', 'Hujan Lebat/Salju'],
+    'Kategori_Jam': ['Dini Hari', 'Pagi', 'Siang', 'Sore', 'Malam'],
+    'Kategori_Suhu_Terasa': ['Sangat Dingin', 'Dingin', 'Nyaman', 'Hangat', 'Panas'],
+    'Kategori_Kelembapan': ['Kering', 'Nyaman', 'Lembap', 'Sangat Lembap', 'Ekstrem Lembap'],
+    'Kategori_Angin': ['Tenang', 'Sepoi Sepoi', 'Sedang', 'Kencang'],
+    'Jenis_Hari': ['Kerja', 'Libur'],
+}
+
+# Tipe integer kecil untuk kolom numerik diskrit
+TIPE_INTEGER = {
+    'index': 'int32',
+    'Tahun': 'int16',
+    'Jam': 'int8',
+    'Non_member': 'int32',
+    'Member': 'int32',
+    'Total': 'int32',
+}
+
+# Folder cache kolumnar, dibuat di samping file CSV sumber
+FOLDER_CACHE = '.cache'
+
+# Folder snapshot Arrow IPC bersama (di dalam FOLDER_CACHE) dan jumlah versi lama yang disimpan
+FOLDER_SNAPSHOT = 'snapshot'
+SNAPSHOT_DISIMPAN = 2
+
+# Snapshot delta (lihat publish_delta): file keterangan di folder versi dan panjang rantai delta
+# maksimum sebelum versi berikutnya ditulis utuh
+DELTA = 'delta.json'
+SEGMEN_MAKS = 16
+
+# Versi format cache, naikkan jika skema tipe data di atas berubah
+VERSI_FORMAT = '2'
+
+# Hari yang dihitung sebagai akhir pekan
+AKHIR_PEKAN = ['Sabtu', 'Minggu']
+
+
+# 1. Menerapkan tipe data (categorical, integer kecil, timestamp)
+def apply_dtypes(df):
+    df = df.copy()
+    if 'Tanggal' in df.columns:
+        df['Tanggal'] = pd.to_datetime(df['Tanggal'])
+    for kolom, urutan in URUTAN_KATEGORI.items():
+        if kolom in df.columns:
+            df[kolom] = pd.Categorical(df[kolom], categories=urutan, ordered=True)
+    for kolom, tipe in TIPE_INTEGER.items():
+        if kolom in df.columns:
+            df[kolom] = df[kolom].astype(tipe)
+    return df
+
+
+# 2. Flag jenis hari yang dihitung sekali saat data dimuat, agar view tidak perlu
+# mengklasifikasikan hari per baris setiap rerun
+def add_day_flags(df):
+    df = df.copy()
+    df['Akhir_Pekan'] = df['Hari'].isin(AKHIR_PEKAN).to_numpy()
+    df['Hari_Libur'] = (df['Libur'] == 'Ya').to_numpy()
+    df['Jenis_Hari'] = pd.Categorical.from_codes(df['Akhir_Pekan'].astype('int8'), categories=URUTAN_KATEGORI['Jenis_Hari'], ordered=True)
+    return df
+
+
+def prepare_frame(df):
+    return add_day_flags(apply_dtypes(df))
+
+
+# 3. Sidik jari file sumber
+def source_signature(csv_path):
+    # Murah (hanya stat), dipakai sebagai kunci cache dan pengecekan cepat
+    stat = os.stat(csv_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _hash_file(path):
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            sha.update(blok)
+    return sha.hexdigest()
+
+
+def cache_path(csv_path):
+    folder, nama = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(folder, FOLDER_CACHE, os.path.splitext(nama)[0] + '.parquet')
+
+
+def _read_meta(path):
+    meta = pq.read_schema(path).metadata or {}
+    return {k.decode(): v.decode() for k, v in meta.items() if k.startswith(b'sumber_')}
+
+
+def _is_fresh(csv_path, parquet_path):
+    if not os.path.exists(parquet_path):
+        return False
+    meta = _read_meta(parquet_path)
+    if meta.get('sumber_format') != VERSI_FORMAT:
+        return False
+
+    # Cek cepat: mtime dan ukuran sama berarti file tidak berubah
+    mtime_ns, size = source_signature(csv_path)
+    if meta.get('sumber_mtime_ns') == str(mtime_ns) and meta.get('sumber_size') == str(size):
+        return True
+
+    # mtime berubah (mis. file di-touch/di-copy ulang), bandingkan isi
+    return meta.get('sumber_sha256') == _hash_file(csv_path)
+
+
+# 4. Membangun cache Parquet dari CSV
+def build_cache(csv_path):
+    df = prepare_frame(pd.read_csv(csv_path))
+
+    mtime_ns, size = source_signature(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    table = table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        b'sumber_format': VERSI_FORMAT.encode(),
+        b'sumber_mtime_ns': str(mtime_ns).encode(),
+        b'sumber_size': str(size).encode(),
+        b'sumber_sha256': _hash_file(csv_path).encode(),
+    })
+
+    # Tulis ke file sementara lalu rename, agar proses lain tidak membaca file setengah jadi
+    parquet_path = cache_path(csv_path)
+    os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+    tmp_path = f"{parquet_path}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, parquet_path)
+    return df
+
+
+# 5. Memuat data (dari cache jika masih valid)
+def load_frame(csv_path):
+    parquet_path = cache_path(csv_path)
+    if _is_fresh(csv_path, parquet_path):
+        return pq.read_table(parquet_path).to_pandas()
+    return build_cache(csv_path)
+
+
+# 6. Snapshot bersama: frame disimpan sebagai file Arrow IPC tanpa kompresi lalu dibaca dengan
+# memory-map. Semua sesi dan proses worker yang membuka snapshot yang sama berbagi halaman
+# file di page cache OS, tanpa menyalin atau men-deserialisasi data. Frame hasil bacaan read-only.
+# Setiap versi punya folder sendiri, CURRENT.json menunjuk versi aktif dan diganti secara atomik.
+# Versi hasil penambahan data bisa berupa delta: hanya baris rentang tanggal yang tersentuh, di atas
+# versi induknya. open_snapshot menggabungkan rantai delta (bagian gabungan tidak lagi memory-map)
+def snapshot_folder(csv_path):
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), FOLDER_CACHE, FOLDER_SNAPSHOT)
+
+
+def snapshot_token(versi):
+    return hashlib.sha1(repr(versi).encode()).hexdigest()[:16]
+
+
+def _write_ipc(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with pa.OSFile(path, 'wb') as f:
+        with ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_ipc(path):
+    # split_blocks: setiap kolom tetap menunjuk buffer memory-map, tidak digabung (dicopy) per tipe
+    return ipc.open_file(pa.memory_map(path)).read_all().to_pandas(split_blocks=True)
+
+
+def _write_version(folder, token, frames, delta=None):
+    tujuan = os.path.join(folder, token)
+    os.makedirs(folder, exist_ok=True)
+
+    # Versi yang sama bisa sudah ditulis proses lain, isinya identik sehingga dipakai ulang
+    if not os.path.isdir(tujuan):
+        tmp = f"{tujuan}.{os.getpid()}.tmp"
+        os.makedirs(tmp, exist_ok=True)
+        for nama, df in frames.items():
+            _write_ipc(df, os.path.join(tmp, f"{nama}.arrow"))
+        if delta is not None:
+            with open(os.path.join(tmp, DELTA), 'w') as f:
+                json.dump(delta, f)
+        try:
+            os.replace(tmp, tujuan)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _set_current(folder, token, versi, frames):
+    penunjuk = os.path.join(folder, 'CURRENT.json')
+    tmp = f"{penunjuk}.{os.getpid()}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'token': token, 'versi': repr(versi), 'frames': list(frames)}, f)
+    os.replace(tmp, penunjuk)
+
+    _prune_snapshots(folder, token)
+
+
+def publish_snapshot(folder, versi, frames):
+    token = snapshot_token(versi)
+    _write_version(folder, token, frames)
+    _set_current(folder, token, versi, frames)
+    return token
+
+
+# Delta: frames hanya berisi semua baris dengan Tanggal di [start_date, end_date] setelah penambahan,
+# yang menggantikan baris rentang itu di versi induk. Biaya tulis sebanding dengan rentang yang tersentuh
+def publish_delta(folder, versi, induk, frames, start_date, end_date):
+    token = snapshot_token(versi)
+    _write_version(folder, token, frames, {
+        'induk': induk,
+        'start_date': pd.Timestamp(start_date).isoformat(),
+        'end_date': pd.Timestamp(end_date).isoformat(),
+        'kedalaman': delta_depth(folder, induk) + 1,
+    })
+    _set_current(folder, token, versi, frames)
+    return token
+
+
+def _read_delta(folder, token):
+    path = os.path.join(folder, token, DELTA)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# Panjang rantai delta sampai snapshot utuh (0: versi ditulis utuh)
+def delta_depth(folder, token):
+    delta = _read_delta(folder, token)
+    return 0 if delta is None else delta['kedalaman']
+
+
+def _prune_snapshots(folder, token_aktif):
+    # File yang masih di-memory-map pembaca lain tetap valid setelah dihapus (POSIX),
+    # di Windows penghapusan gagal dan dicoba lagi pada publikasi berikutnya
+    lama = [nama for nama in os.listdir(folder)
+            if nama != token_aktif and os.path.isdir(os.path.join(folder, nama)) and not nama.endswith('.tmp')]
+    lama.sort(key=lambda nama: os.path.getmtime(os.path.join(folder, nama)), reverse=True)
+
+    # Induk versi yang disimpan (rantai delta sampai snapshot utuh) ikut disimpan
+    simpan = {token_aktif, *lama[:SNAPSHOT_DISIMPAN]}
+    for token in list(simpan):
+        delta = _read_delta(folder, token)
+        while delta is not None:
+            simpan.add(delta['induk'])
+            delta = _read_delta(folder, delta['induk'])
+
+    for nama in lama:
+        if nama not in simpan:
+            shutil.rmtree(os.path.join(folder, nama), ignore_errors=True)
+
+
+def current_snapshot(folder):
+    penunjuk = os.path.join(folder, 'CURRENT.json')
+    if not os.path.exists(penunjuk):
+        return None
+    with open(penunjuk) as f:
+        return json.load(f)
+
+
+def _read_frames(folder, token):
+    lokasi = os.path.join(folder, token)
+    return {os.path.splitext(nama)[0]: _read_ipc(os.path.join(lokasi, nama))
+            for nama in sorted(os.listdir(lokasi)) if nama.endswith('.arrow')}
+
+
+# terbuka: (token, frames) versi yang sudah dibuka pemanggil. Jika versi itu ada di rantai delta,
+# hanya delta di atasnya yang dibaca dan digabung (mis. versi baru setelah satu penambahan)
+def open_snapshot(folder, token=None, terbuka=None):
+    if token is None:
+        aktif = current_snapshot(folder)
+        if aktif is None:
+            raise FileNotFoundError(f"Belum ada snapshot di {folder}")
+        token = aktif['token']
+
+    rantai = []
+    while terbuka is None or token != terbuka[0]:
+        delta = _read_delta(folder, token)
+        if delta is None:
+            break
+        rantai.append((token, delta))
+        token = delta['induk']
+    frames = terbuka[1] if terbuka is not None and token == terbuka[0] else _read_frames(folder, token)
+    if not rantai:
+        return frames
+
+    # Delta (kecil) digabung lebih dulu dari yang terlama, lalu baris semua rentang yang diganti
+    # dibuang dari frame induk sekali saja, sehingga biaya gabungan tidak dikali panjang rantai
+    tambahan, rentang = {}, []
+    for token_delta, delta in reversed(rantai):
+        start_date, end_date = pd.Timestamp(delta['start_date']), pd.Timestamp(delta['end_date'])
+        for nama, df in _read_frames(folder, token_delta).items():
+            tambahan[nama] = df if nama not in tambahan else \
+                date_index.replace_range(tambahan[nama], df, start_date, end_date)
+        rentang.append((start_date, end_date))
+
+    if len(rentang) == 1:
+        (start_date, end_date), = rentang
+        return {nama: date_index.replace_range(df, tambahan[nama], start_date, end_date) for nama, df in frames.items()}
+
+    hasil = {}
+    for nama, df in frames.items():
+        tanggal = df['Tanggal']
+        diganti = np.zeros(len(df), dtype=bool)
+        for start_date, end_date in rentang:
+            diganti[tanggal.searchsorted(start_date, side='left'):tanggal.searchsorted(end_date, side='right')] = True
+        hasil[nama] = date_index.ensure_sorted(pd.concat([df[~diganti], tambahan[nama]], ignore_index=True))
+    return hasil
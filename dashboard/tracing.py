@@ -0,0 +1,163 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Span waktu untuk setiap tahap rerun dashboard (memuat data, filter, agregasi, figur, serialisasi).
+# Setiap sesi Streamlit menjalankan skripnya di thread sendiri, sehingga trace yang aktif disimpan
+# per thread dan span bisa dibuka dari modul mana pun tanpa meneruskan objek trace.
+# Tanpa trace aktif (mis. di benchmark) span tidak mencatat apa pun
+
+# File JSON lines tujuan ekspor otomatis setiap rerun (opsional), untuk profiling sesi produksi
+ENV_FILE_TRACE = 'DASHBOARD_TRACE_FILE'
+
+_lokal = threading.local()
+
+
+# 1. Memori proses saat ini (RSS) dalam byte, None jika tidak tersedia (hanya Linux)
+def _rss():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def count_rows(nilai):
+    if isinstance(nilai, (pd.DataFrame, pd.Series)):
+        return len(nilai)
+    if isinstance(nilai, (tuple, list)):
+        jumlah = [count_rows(item) for item in nilai]
+        return None if None in jumlah else sum(jumlah)
+    return None
+
+
+# 2. Trace satu rerun: daftar span dengan waktu relatif terhadap awal rerun
+class Trace:
+    def __init__(self, label):
+        self.label = label
+        self.mulai = time.time()
+        self._t0 = time.perf_counter()
+        self.durasi_ms = None
+        self.thread = threading.get_ident()
+        self.spans = []
+        self._kedalaman = 0
+
+    def finish(self):
+        self.durasi_ms = (time.perf_counter() - self._t0) * 1000
+        return self
+
+    def to_dict(self):
+        return {
+            'label': self.label,
+            'mulai': self.mulai,
+            'durasi_ms': round(self.durasi_ms or 0.0, 3),
+            'spans': self.spans,
+        }
+
+
+def start_rerun(label):
+    _lokal.trace = Trace(label)
+    return _lokal.trace
+
+
+def finish_rerun():
+    trace = getattr(_lokal, 'trace', None)
+    _lokal.trace = None
+    if trace is None:
+        return None
+    trace.finish()
+
+    file_trace = os.environ.get(ENV_FILE_TRACE)
+    if file_trace:
+        write_jsonl(file_trace, [trace], mode='a')
+    return trace
+
+
+# 3. Span. Dipakai sebagai `with span('agregasi') as info:`, jumlah baris dan atribut lain
+# bisa diisi lewat info (mis. info['baris'] = len(hasil))
+@contextmanager
+def span(nama, **atribut):
+    trace = getattr(_lokal, 'trace', None)
+    if trace is None:
+        yield atribut
+        return
+
+    kedalaman = trace._kedalaman
+    trace._kedalaman += 1
+    rss_awal = _rss()
+    t_awal = time.perf_counter()
+    try:
+        yield atribut
+    finally:
+        t_akhir = time.perf_counter()
+        rss_akhir = _rss()
+        trace._kedalaman = kedalaman
+        trace.spans.append({
+            'nama': nama,
+            'kedalaman': kedalaman,
+            'mulai_ms': round((t_awal - trace._t0) * 1000, 3),
+            'durasi_ms': round((t_akhir - t_awal) * 1000, 3),
+            'baris': atribut.pop('baris', None),
+            'memori_kb': None if rss_awal is None or rss_akhir is None else (rss_akhir - rss_awal) // 1024,
+            **atribut,
+        })
+
+
+# Membungkus setiap fungsi modul (mis. plotly.express) sehingga setiap panggilannya menjadi span
+class InstrumentedModule:
+    def __init__(self, modul, nama):
+        self._modul = modul
+        self._nama = nama
+
+    def __getattr__(self, atribut):
+        nilai = getattr(self._modul, atribut)
+        if not callable(nilai):
+            return nilai
+
+        def dibungkus(*args, **kwargs):
+            with span(f"{self._nama}: {atribut}"):
+                return nilai(*args, **kwargs)
+        return dibungkus
+
+
+# 4. Ekspor
+def spans_frame(traces):
+    baris = []
+    for nomor, trace in enumerate(traces):
+        for item in trace.spans:
+            baris.append({'rerun': nomor, 'label': trace.label, **item})
+    return pd.DataFrame(baris)
+
+
+def to_jsonl(traces):
+    return ''.join(json.dumps(trace.to_dict(), default=str) + '\n' for trace in traces)
+
+
+def write_jsonl(path, traces, mode='w'):
+    with open(path, mode) as f:
+        f.write(to_jsonl(traces))
+
+
+# Format Chrome trace (dibuka di chrome://tracing atau ui.perfetto.dev). Setiap span menjadi
+# event lengkap ('X') dengan waktu dalam mikrodetik
+def to_chrome_trace(traces):
+    events = []
+    for trace in traces:
+        awal_us = trace.mulai * 1e6
+        events.append({'name': trace.label, 'ph': 'X', 'ts': awal_us, 'dur': (trace.durasi_ms or 0.0) * 1000,
+                       'pid': os.getpid(), 'tid': trace.thread, 'cat': 'rerun'})
+        for item in trace.spans:
+            args = {k: v for k, v in item.items() if k not in ('nama', 'kedalaman', 'mulai_ms', 'durasi_ms')}
+            events.append({'name': item['nama'], 'ph': 'X', 'ts': awal_us + item['mulai_ms'] * 1000,
+                           'dur': item['durasi_ms'] * 1000, 'pid': os.getpid(), 'tid': trace.thread,
+                           'cat': 'span', 'args': args})
+    return json.dumps({'traceEvents': events}, default=str)
+
+
+def write_chrome_trace(path, traces):
+    with open(path, 'w') as f:
+        f.write(to_chrome_trace(traces))
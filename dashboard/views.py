@@ -0,0 +1,74 @@
+import streamlit as st
+
+import tracing
+
+# 1. Registry view dashboard: judul tab -> fungsi render (didaftarkan dengan decorator register).
+# Fungsi view memakai global skrip rerun yang mendefinisikannya (snapshot data sesi itu), sehingga
+# registry dibuat baru di setiap rerun (dashboard.py) dan tidak pernah dipakai bersama sesi lain
+class ViewRegistry:
+    def __init__(self):
+        self._views = {}
+
+    def register(self, judul):
+        def decorator(fungsi):
+            self._views[judul] = fungsi
+            return fungsi
+        return decorator
+
+    def titles(self):
+        return list(self._views)
+
+    def render(self, judul):
+        with tracing.span(f"view: {judul}"):
+            self._views[judul]()
+
+
+# Cache agregasi bersama lintas sesi (agg_cache.AggregationCache), diisi oleh dashboard.py
+_shared_cache = None
+
+
+def use_shared_cache(cache):
+    global _shared_cache
+    _shared_cache = cache
+
+
+# 2. Menyimpan hasil terakhir setiap view, dikunci dengan state filter view tersebut.
+# Jika filter view tidak berubah sejak rerun sebelumnya, hasil lama dipakai ulang.
+# Jika tidak, hasil dicari di cache bersama dengan kunci (view, state filter) sebelum dihitung ulang
+def remember(judul, kunci_filter, hitung):
+    with tracing.span('agregasi') as info:
+        hasil_view = st.session_state.setdefault('_hasil_view', {})
+        simpanan = hasil_view.get(judul)
+        if simpanan is not None and simpanan[0] == kunci_filter:
+            info.update(sumber='sesi', baris=tracing.count_rows(simpanan[1]))
+            return simpanan[1]
+
+        dihitung = []
+
+        def hitung_dicatat():
+            dihitung.append(True)
+            return hitung()
+
+        if _shared_cache is not None:
+            hasil = _shared_cache.get_or_compute((judul, kunci_filter), hitung_dicatat)
+        else:
+            hasil = hitung_dicatat()
+        hasil_view[judul] = (kunci_filter, hasil)
+        info.update(sumber='hitung' if dihitung else 'cache bersama', baris=tracing.count_rows(hasil))
+        return hasil
+
+
+# 3. Default widget yang tetap diingat walaupun view-nya tidak dirender.
+# Streamlit menghapus state widget yang tidak tampil pada sebuah rerun, sehingga nilai
+# terakhirnya disimpan di key biasa. Default hanya diganti saat widget dibuat ulang,
+# karena default ikut menentukan ID widget yang sedang tampil
+def widget_default(key, default):
+    defaults = st.session_state.setdefault('_default_widget', {})
+    if key not in st.session_state or key not in defaults:
+        defaults[key] = st.session_state.setdefault('_nilai_widget', {}).get(key, default)
+    return defaults[key]
+
+
+def remember_widget(key, nilai):
+    st.session_state.setdefault('_nilai_widget', {})[key] = nilai
+    return nilai